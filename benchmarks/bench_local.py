@@ -0,0 +1,22 @@
+import time
+
+from conftest import make_scripts
+from pyjob.local import CPU_COUNT, LocalTask
+
+NSCRIPTS = 10000
+
+
+def bench_local_throughput(benchmark, tmp_path):
+    scripts = [s.path for s in make_scripts(tmp_path, NSCRIPTS)]
+    durations = []
+
+    def run():
+        start = time.perf_counter()
+        with LocalTask(scripts, processes=CPU_COUNT) as task:
+            task.run()
+            task.wait(interval=0.1)
+        durations.append(time.perf_counter() - start)
+
+    benchmark.pedantic(run, rounds=1, iterations=1)
+    # Measured here, since benchmark.stats is None with --benchmark-disable
+    benchmark.extra_info["scripts_per_second"] = NSCRIPTS / min(durations)
@@ -0,0 +1,23 @@
+import pytest
+
+
+@pytest.mark.parametrize("ntasks", [10, 100])
+def bench_poll_tasks(benchmark, cluster, scripts, ntasks):
+    tasks = [cluster(scripts[:1]) for _ in range(ntasks)]
+    for task in tasks:
+        task.pid = 4242
+        task.lock()
+
+    def poll():
+        return [task.info for task in tasks]
+
+    assert all(benchmark.pedantic(poll, rounds=3))
+
+
+@pytest.mark.parametrize("njobs", [1, 10000])
+def bench_poll_array(benchmark, cluster, scripts, monkeypatch, njobs):
+    monkeypatch.setenv("PYJOB_FAKE_NJOBS", str(njobs))
+    task = cluster(scripts)
+    task.pid = 4242
+    task.lock()
+    assert benchmark(lambda: task.info)
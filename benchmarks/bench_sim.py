@@ -0,0 +1,23 @@
+import pytest
+from pyjob.sim import SimulatedScheduler, SimulatedTask
+
+
+@pytest.mark.parametrize("ntasks", [10, 100])
+def bench_sim_pipeline(benchmark, scripts, tmp_path, ntasks):
+    def run():
+        scheduler = SimulatedScheduler()
+        tasks = [
+            SimulatedTask(
+                scripts[i * 10 : (i + 1) * 10],
+                directory=str(tmp_path),
+                max_array_size=2,
+                scheduler=scheduler,
+            )
+            for i in range(ntasks)
+        ]
+        for task in tasks:
+            task.run()
+        for task in tasks:
+            task.wait(interval=0.01)
+
+    benchmark.pedantic(run, rounds=3)
@@ -0,0 +1,27 @@
+import os
+
+from conftest import make_scripts
+from pyjob.script import ScriptCollector
+
+
+def bench_create_runscript(benchmark, cluster, scripts):
+    task = cluster(scripts)
+    benchmark(task._create_runscript)
+
+
+def bench_submit(benchmark, cluster, scripts):
+    def submit():
+        task = cluster(scripts[:10])
+        task.run()
+        return task
+
+    assert benchmark(submit).pid is not None
+
+
+def bench_dump(benchmark, tmp_path):
+    def setup():
+        directory = tmp_path / str(len(os.listdir(str(tmp_path))))
+        directory.mkdir()
+        return (ScriptCollector(make_scripts(directory, 1000, write=False)),), {}
+
+    benchmark.pedantic(ScriptCollector.dump, setup=setup, rounds=10)
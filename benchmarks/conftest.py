@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pytest
+from pyjob.factory import get_platform
+from pyjob.script import Script
+
+FAKEBIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fakebin")
+
+CLUSTER_PLATFORMS = ("lsf", "pbs", "sge", "slurm")
+
+
+def make_scripts(directory, n, write=True):
+    """Create `n` no-op shell scripts in `directory`"""
+    scripts = []
+    for i in range(n):
+        script = Script(directory=str(directory), prefix="bench_", stem=str(i))
+        script.append("exit 0")
+        if write:
+            script.write()
+        scripts.append(script)
+    return scripts
+
+
+@pytest.fixture(scope="session")
+def scripts(tmp_path_factory):
+    """1000 no-op scripts on disk"""
+    return [s.path for s in make_scripts(tmp_path_factory.mktemp("scripts"), 1000)]
+
+
+@pytest.fixture(params=CLUSTER_PLATFORMS)
+def cluster(request, monkeypatch, tmp_path):
+    """A cluster platform backed by the fake scheduler executables"""
+    platform = request.param
+    monkeypatch.setenv(
+        "PATH", os.path.join(FAKEBIN, platform) + os.pathsep + os.environ["PATH"]
+    )
+    monkeypatch.chdir(tmp_path)
+    cls = get_platform(platform)
+    cls._structured_output = None
+    tasks = []
+
+    def factory(*args, **kwargs):
+        task = cls(*args, directory=str(tmp_path), **kwargs)
+        tasks.append(task)
+        return task
+
+    yield factory
+    # Stop instances from waiting for the fake jobs on deletion
+    for task in tasks:
+        task.pid = None
+
+
+def pytest_configure(config):
+    if sys.platform.startswith("win"):
+        pytest.exit("The benchmarks require a POSIX system")
@@ -1,9 +1,31 @@
 from pyjob.cexec import cexec
 from pyjob.config import PyJobConfig
-from pyjob.factory import TaskFactory
-from pyjob.script import Script
-from pyjob.stopwatch import StopWatch
 from pyjob.version import __version__
 
-read_script = Script.read
+# The configuration file is only read on first access of a value
 config = PyJobConfig.from_default()
+
+# Attributes whose modules are imported on first access (PEP 562)
+_LAZY_ATTRIBUTES = {
+    "Script": ("pyjob.script", "Script"),
+    "StopWatch": ("pyjob.stopwatch", "StopWatch"),
+    "TaskFactory": ("pyjob.factory", "TaskFactory"),
+    "read_script": ("pyjob.script", "Script.read"),
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    module, attr = _LAZY_ATTRIBUTES[name]
+    value = importlib.import_module(module)
+    for part in attr.split("."):
+        value = getattr(value, part)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
@@ -5,7 +5,8 @@ import os
 import sys
 
 from pyjob import TaskFactory, __version__, config
-from pyjob.factory import TASK_PLATFORMS
+from pyjob.config import get_settings
+from pyjob.factory import available_platforms
 from pyjob.misc import typecast
 
 
@@ -21,8 +22,8 @@ def add_exec_subparser(sp):
     p.add_argument(
         "-p",
         "--platform",
-        choices=TASK_PLATFORMS.keys(),
-        default=config.get("platform", "local"),
+        choices=available_platforms(),
+        default=get_settings().get("platform", "local"),
         help="the execution platform",
     )
     p.add_argument(
@@ -30,7 +31,7 @@ def add_exec_subparser(sp):
         "--threads",
         type=int,
         dest="processes",
-        default=config.get("processes", 1),
+        default=get_settings().get("processes", 1),
         help="number of threads",
     )
     p.add_argument(
@@ -92,9 +93,10 @@ def main():
             task.run()
 
     elif args.which == Subcommand.CONF:
-        for pair in args.arguments:
-            k, v = pair.split(":")
-            config.setdefault(k, value=typecast(v))
+        with config.batch():
+            for pair in args.arguments:
+                k, v = pair.split(":")
+                config.setdefault(k, value=typecast(v))
     else:
         p.print_help()
 
@@ -3,9 +3,26 @@ import os
 import signal
 import subprocess
 import sys
+import time
 
-from pyjob.exception import PyJobExecutableNotFoundError, PyJobExecutionError
+from pyjob import metrics, tracing
+from pyjob.exception import (
+    PyJobExecutableNotFoundError,
+    PyJobExecutionError,
+    PyJobTimeoutError,
+)
 from pyjob.misc import decode
+from pyjob.stopwatch import section
+
+HAS_POSIX_SPAWN = hasattr(os, "posix_spawn")
+HAS_WAIT4 = hasattr(os, "wait4")
+
+#: Seconds between ``SIGTERM`` and ``SIGKILL`` when terminating a timed out process
+KILL_GRACE_PERIOD = 5.0
+
+# Bounds of the exponential back-off while polling a child with a timeout
+WAIT_MIN_DELAY = 0.001
+WAIT_MAX_DELAY = 0.05
 
 logger = logging.getLogger(__name__)
 
@@ -55,7 +72,149 @@ def which(executable):
                 return exe_file
 
 
-def cexec(cmd, permit_nonzero=False, **kwargs):
+def spawn(executable, log, timeout=None):
+    """Execute an executable with minimal per-call overhead
+
+    See :func:`~pyjob.cexec.execute` for details.
+
+    Parameters
+    ----------
+    executable : str
+       The path to an executable
+    log : str
+       The file for the standard output and error
+    timeout : float, optional
+       The wall-clock time in seconds after which the process is terminated
+
+    Returns
+    -------
+    int
+       The return code, negative if the process was terminated by a signal
+
+    """
+    return execute(executable, log, timeout=timeout)[0]
+
+
+def execute(executable, log, timeout=None, on_spawn=None, cwd=None):
+    """Execute an executable with minimal per-call overhead and report its resource usage
+
+    Unlike :func:`~pyjob.cexec.cexec`, the executable is not looked up in ``PATH``
+    and its output is written to `log` without passing through Python. The process
+    is created with :func:`os.posix_spawn` where available, and leads a process
+    group of its own. After `timeout`, the whole group is sent ``SIGTERM``, followed
+    by ``SIGKILL`` if it is still running :data:`KILL_GRACE_PERIOD` seconds later.
+
+    Parameters
+    ----------
+    executable : str
+       The path to an executable
+    log : str
+       The file for the standard output and error
+    timeout : float, optional
+       The wall-clock time in seconds after which the process is terminated
+    on_spawn : callable, optional
+       Called with the process identifier as soon as the process has started
+    cwd : str, optional
+       The working directory of the process, which requires :obj:`subprocess.Popen`
+       instead of :func:`os.posix_spawn` [default: current working directory]
+
+    Returns
+    -------
+    int
+       The return code, negative if the process was terminated by a signal
+    :obj:`resource.struct_rusage`
+       The resource usage of the process, ``None`` where unavailable
+    bool
+       Whether the process was terminated after `timeout`
+
+    """
+    fd = os.open(log, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        if HAS_POSIX_SPAWN and cwd is None:
+            file_actions = [(os.POSIX_SPAWN_DUP2, fd, 1), (os.POSIX_SPAWN_DUP2, fd, 2)]
+            pid = os.posix_spawn(
+                executable,
+                [executable],
+                os.environ,
+                file_actions=file_actions,
+                setpgroup=0,
+            )
+            if on_spawn is not None:
+                on_spawn(pid)
+        else:
+            proc = subprocess.Popen(
+                [executable],
+                cwd=cwd,
+                stdout=fd,
+                stderr=subprocess.STDOUT,
+                start_new_session=HAS_WAIT4,
+            )
+            if on_spawn is not None:
+                on_spawn(proc.pid)
+            if not HAS_WAIT4:
+                try:
+                    return proc.wait(timeout=timeout), None, False
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                    return proc.wait(), None, True
+            # Reaped below, so that the rusage of the child can be collected
+            pid, proc.returncode = proc.pid, 0
+    finally:
+        os.close(fd)
+    timed_out = False
+    reaped = _wait4(pid, timeout)
+    if reaped is None:
+        timed_out = True
+        logger.debug("Terminating '%s' after %s seconds", executable, timeout)
+        kill_process_group(pid, signal.SIGTERM)
+        reaped = _wait4(pid, KILL_GRACE_PERIOD)
+        if reaped is None:
+            kill_process_group(pid, signal.SIGKILL)
+            reaped = _wait4(pid, None)
+        # Descendants that outlived the group leader
+        kill_process_group(pid, signal.SIGKILL)
+    status, rusage = reaped
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status), rusage, timed_out
+    return os.WEXITSTATUS(status), rusage, timed_out
+
+
+def _wait4(pid, timeout):
+    """Reap a child process, returning ``None`` if it is still running after `timeout`"""
+    if timeout is None:
+        return os.wait4(pid, 0)[1:]
+    deadline = time.monotonic() + timeout
+    delay = WAIT_MIN_DELAY
+    while True:
+        wpid, status, rusage = os.wait4(pid, os.WNOHANG)
+        if wpid:
+            return status, rusage
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, WAIT_MAX_DELAY)
+
+
+def kill_process_group(pgid, sig=None):
+    """Send a signal to a process group, ignoring groups that no longer exist
+
+    Parameters
+    ----------
+    pgid : int
+       The process group identifier, i.e. the process identifier of its leader
+    sig : int, optional
+       The signal to send [default: ``SIGKILL``]
+
+    """
+    try:
+        os.killpg(pgid, signal.SIGKILL if sig is None else sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+@section("cexec")
+def cexec(cmd, permit_nonzero=False, timeout=None, **kwargs):
     """Function to execute a command
 
     Parameters
@@ -64,6 +223,9 @@ def cexec(cmd, permit_nonzero=False, **kwargs):
        The command to call
     permit_nonzero : bool, optional
        Allow non-zero return codes [default: False]
+    timeout : float, optional
+       The wall-clock time in seconds after which the command's process group is
+       terminated, see :func:`~pyjob.cexec.execute`
     **kwargs : dict, option
        Any keyword arguments accepted by :obj:`~subprocess.Popen`
 
@@ -78,8 +240,35 @@ def cexec(cmd, permit_nonzero=False, **kwargs):
        Cannot find executable
     :exc:`PyJobExecutionError`
        Execution exited with non-zero return code
+    :exc:`PyJobTimeoutError`
+       Execution exceeded `timeout`
 
     """
+    if not (metrics.ENABLED or tracing.HOOKS):
+        return _cexec(cmd, permit_nonzero=permit_nonzero, timeout=timeout, **kwargs)
+    trace = tracing.CommandTrace(cmd)
+    tracing.before(trace)
+    try:
+        stdout = _cexec(
+            cmd, permit_nonzero=permit_nonzero, timeout=timeout, trace=trace, **kwargs
+        )
+        trace.output_size = len(stdout) if stdout else 0
+        return stdout
+    except Exception as e:
+        trace.error = e
+        raise
+    finally:
+        trace.finish()
+        if metrics.ENABLED:
+            # Scripts are labelled collectively to bound the number of series
+            metrics.CEXEC_DURATION.observe(trace.duration, command=trace.name)
+            if isinstance(trace.error, PyJobExecutionError):
+                metrics.CEXEC_FAILURES.inc(command=trace.name)
+        tracing.after(trace)
+
+
+def _cexec(cmd, permit_nonzero=False, timeout=None, trace=None, **kwargs):
+    """Execute a command, see :func:`~pyjob.cexec.cexec`"""
     executable = which(cmd[0])
     if executable is None:
         raise PyJobExecutableNotFoundError(f"Cannot find executable: {cmd[0]}")
@@ -95,6 +284,9 @@ def cexec(cmd, permit_nonzero=False, **kwargs):
     kwargs.setdefault("stdout", subprocess.PIPE)
     kwargs.setdefault("stderr", subprocess.STDOUT)
 
+    if timeout is not None and HAS_WAIT4:
+        kwargs.setdefault("start_new_session", True)
+
     stdinstr = kwargs.get("stdin", None)
     if stdinstr and isinstance(stdinstr, str):
         kwargs["stdin"] = subprocess.PIPE
@@ -103,13 +295,22 @@ def cexec(cmd, permit_nonzero=False, **kwargs):
         p = subprocess.Popen(cmd, **kwargs)
         if stdinstr:
             stdinstr = stdinstr.encode()
-        stdout, stderr = p.communicate(input=stdinstr)
+        stdout, stderr = p.communicate(input=stdinstr, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        _terminate(p, kwargs.get("start_new_session", False))
+        if trace is not None:
+            trace.returncode = p.returncode
+        raise PyJobTimeoutError(
+            f"Execution of '{' '.join(cmd)}' exceeded its timeout of {timeout} seconds"
+        )
     except (KeyboardInterrupt, SystemExit):
         os.kill(p.pid, signal.SIGTERM)
         sys.exit(signal.SIGTERM)
     else:
         if stdout:
             stdout = decode(stdout).strip()
+        if trace is not None:
+            trace.returncode = p.returncode
         if p.returncode == 0:
             return stdout
         elif permit_nonzero:
@@ -121,3 +322,21 @@ def cexec(cmd, permit_nonzero=False, **kwargs):
             raise PyJobExecutionError(
                 f"Execution of '{' '.join(cmd)}' exited with non-zero return code ({p.returncode})"
             )
+
+
+def _terminate(p, process_group):
+    """Terminate a timed out :obj:`~subprocess.Popen`, escalating to ``SIGKILL``"""
+    if process_group:
+        kill_process_group(p.pid, signal.SIGTERM)
+    else:
+        p.terminate()
+    try:
+        p.communicate(timeout=KILL_GRACE_PERIOD)
+    except subprocess.TimeoutExpired:
+        if process_group:
+            kill_process_group(p.pid)
+        else:
+            p.kill()
+        p.communicate()
+    if process_group:
+        kill_process_group(p.pid)
@@ -1,15 +1,73 @@
+import contextlib
+import json
 import logging
 import os
 import sys
+import tempfile
 from collections import UserDict
+from collections.abc import Mapping
 from functools import wraps
 
-import yaml
 from pyjob.exception import DictLockedError
 
 logger = logging.getLogger(__name__)
 
 
+#: Suffix of the JSON cache written alongside a YAML configuration file
+CACHE_SUFFIX = ".cache.json"
+#: System-wide configuration file, the lowest-priority layer
+SYSTEM_CONFIG_FILE = "/etc/pyjob/pyjob.yml"
+#: Per-project configuration file, looked up in the current working directory
+PROJECT_CONFIG_FILE = "pyjob.yml"
+#: Prefix of environment variables overriding configuration values
+ENVIRONMENT_PREFIX = "PYJOB_"
+
+_settings = None
+
+
+def file_signature(fname):
+    """Signature to detect modifications of a file
+
+    Parameters
+    ----------
+    fname : str
+       The path to the file
+
+    Returns
+    -------
+    list
+       The modification time (in ns) and size of the file, or ``None`` if it is missing
+
+    """
+    try:
+        st = os.stat(fname)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def atomic_write(fname, data):
+    """Write a file atomically by renaming a temporary file in the same directory
+
+    Parameters
+    ----------
+    fname : str
+       The path to the file
+    data : str
+       The content to write
+
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(fname)))
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(data)
+        os.replace(tmp, fname)
+    except BaseException:
+        if os.path.isfile(tmp):
+            os.remove(tmp)
+        raise
+
+
 class ImmutableDictMixin(object):
     _locked = False
 
@@ -33,18 +91,29 @@ class ImmutableDictMixin(object):
 class PyJobConfig(UserDict, ImmutableDictMixin):
 
     _directory = os.path.expanduser("~/.pyjob")
-    if not os.path.isdir(_directory):
-        try:
-            os.makedirs(_directory)
-        except OSError as e:
-            if e.errno == errno.EEXIST and os.path.isdir(_directory):
-                pass
-            else:
-                raise RuntimeError("Cannot create configuration directory")
-
     file = os.path.join(_directory, "pyjob.yml")
-    if not os.path.isfile(file):
-        open(file, "w").close()
+
+    # Populated by UserDict.__init__, left unset by from_default() until first access
+    _data = None
+    # Signature of the file when it was last read or written, None if not file-backed
+    _signature = None
+    _batch_depth = 0
+    _dirty = False
+
+    @property
+    def data(self):
+        """The configuration values, (re-)read from :attr:`file` if it was modified"""
+        if self._data is None or (
+            self._signature is not None and file_signature(self.file) != self._signature
+        ):
+            self._data, self._signature = PyJobConfig.read_cached(
+                self.ensure_file(self.file)
+            )
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
 
     @ImmutableDictMixin.assert_lock
     def __setitem__(self, key, value):
@@ -52,17 +121,121 @@ class PyJobConfig(UserDict, ImmutableDictMixin):
 
     @ImmutableDictMixin.assert_lock
     def setdefault(self, key, value=None):
-        super().setdefault(key, value=value)
+        value = super().setdefault(key, value)
         self.write()
+        return value
 
     @ImmutableDictMixin.assert_lock
     def update(self, *args, **kwargs):
         super().update(*args, **kwargs)
 
+    @staticmethod
+    def ensure_file(fname):
+        """Create an empty configuration file if it does not exist
+
+        Parameters
+        ----------
+        fname : str
+           The path to the configuration file
+
+        Returns
+        -------
+        str
+           The path to the configuration file
+
+        Raises
+        ------
+        :exc:`RuntimeError`
+           Cannot create configuration directory
+
+        """
+        if not os.path.isfile(fname):
+            try:
+                os.makedirs(os.path.dirname(fname), exist_ok=True)
+            except OSError:
+                raise RuntimeError("Cannot create configuration directory")
+            open(fname, "a").close()
+        return fname
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Defer all writes to a single one at the end of the block
+
+        Examples
+        --------
+
+        >>> from pyjob import config
+        >>> with config.batch():
+        ...     config.setdefault('platform', 'slurm')
+        ...     config.setdefault('processes', 4)
+
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+        if self._batch_depth == 0 and self._dirty:
+            self.write()
+
     def write(self):
-        data = yaml.dump(dict(self), default_flow_style=False)
-        with open(self.file, "w") as f:
-            f.write(data)
+        """Write the configuration atomically to :attr:`file`
+
+        A JSON cache of the values is written alongside, which
+        :meth:`~pyjob.config.PyJobConfig.read_cached` prefers over parsing YAML.
+
+        """
+        if self._batch_depth > 0:
+            self._dirty = True
+            return
+        import yaml
+
+        global _settings
+
+        data = dict(self)
+        atomic_write(self.file, yaml.dump(data, default_flow_style=False))
+        self._dirty = False
+        _settings = None
+        signature = file_signature(self.file)
+        if self._signature is not None:
+            self._signature = signature
+        PyJobConfig.write_cache(self.file, data, signature)
+
+    @staticmethod
+    def write_cache(yamlf, data, signature):
+        """Write the JSON cache for a YAML file, ignoring failures"""
+        try:
+            cache = json.dumps({"signature": signature, "data": data})
+            atomic_write(yamlf + CACHE_SUFFIX, cache)
+        except (OSError, TypeError, ValueError):
+            logger.debug("Cannot write configuration cache for %s", yamlf)
+
+    @staticmethod
+    def read_cached(yamlf):
+        """Read a YAML file through its JSON cache if that is up to date
+
+        Parameters
+        ----------
+        yamlf : str
+           The path to a PyJob YAML config file
+
+        Returns
+        -------
+        tuple
+           The configuration values and the signature of `yamlf`
+
+        """
+        signature = file_signature(yamlf)
+        try:
+            with open(yamlf + CACHE_SUFFIX, "r") as f:
+                cache = json.load(f)
+            if cache["signature"] == signature:
+                return cache["data"], signature
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        data = dict(PyJobConfig.read_yaml(yamlf))
+        PyJobConfig.write_cache(yamlf, data, signature)
+        return data, signature
 
     @staticmethod
     def read_yaml(yamlf):
@@ -84,6 +257,8 @@ class PyJobConfig(UserDict, ImmutableDictMixin):
            Cannot find YAML file
 
         """
+        import yaml
+
         if not os.path.isfile(yamlf):
             raise FileNotFoundError("Cannot find YAML file")
         with open(yamlf, "r") as f:
@@ -98,10 +273,154 @@ class PyJobConfig(UserDict, ImmutableDictMixin):
     def from_default(cls):
         """Construct the configuration from the default file
 
+        The file is created if necessary and read on first access of the
+        configuration values, not by this method.
+
         Returns
         -------
         :obj:`~pyjob.config.PyJobConfig`
            A :obj:`~pyjob.config.PyJobConfig` instance
 
         """
-        return PyJobConfig.read_yaml(cls.file)
+        config = cls.__new__(cls)
+        config._signature = []
+        return config
+
+
+class Settings(Mapping):
+    """Immutable snapshot of the layered PyJob configuration
+
+    Examples
+    --------
+
+    >>> from pyjob.config import get_settings
+    >>> settings = get_settings()
+    >>> settings.get('processes')
+    4
+    >>> settings.override(processes=8).get('processes')
+    8
+
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data=None):
+        """Instantiate a new :obj:`~pyjob.config.Settings`"""
+        object.__setattr__(self, "_data", dict(data or {}))
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}({self._data})"
+
+    def __setattr__(self, key, value):
+        raise DictLockedError("Settings are immutable")
+
+    def override(self, **kwargs):
+        """Create new :obj:`~pyjob.config.Settings` with values overridden
+
+        Parameters
+        ----------
+        **kwargs : dict
+           The values to override, ``None`` and other false values are ignored
+
+        Returns
+        -------
+        :obj:`~pyjob.config.Settings`
+           This instance if nothing changes, otherwise a new instance
+
+        """
+        overrides = {
+            k: v for k, v in kwargs.items() if v and self._data.get(k, None) != v
+        }
+        if not overrides:
+            return self
+        return Settings({**self._data, **overrides})
+
+
+def read_optional_yaml(yamlf):
+    """Read a YAML configuration file if it exists
+
+    Parameters
+    ----------
+    yamlf : str
+       The path to a PyJob YAML config file
+
+    Returns
+    -------
+    dict
+
+    """
+    if os.path.isfile(yamlf):
+        return dict(PyJobConfig.read_yaml(yamlf))
+    return {}
+
+
+def read_environment(environ=None):
+    """Read configuration values from ``PYJOB_*`` environment variables
+
+    Parameters
+    ----------
+    environ : dict, optional
+       The environment to read [default: :obj:`os.environ`]
+
+    Returns
+    -------
+    dict
+
+    """
+    from pyjob.misc import typecast
+
+    environ = os.environ if environ is None else environ
+    return {
+        k[len(ENVIRONMENT_PREFIX) :].lower(): typecast(v)
+        for k, v in environ.items()
+        if k.startswith(ENVIRONMENT_PREFIX) and len(k) > len(ENVIRONMENT_PREFIX)
+    }
+
+
+def get_settings(reload=False):
+    """Resolve the layered PyJob configuration once per process
+
+    The layers are, in increasing priority, the system configuration file
+    (:data:`SYSTEM_CONFIG_FILE`), the user configuration (:obj:`pyjob.config`), the
+    project configuration file (:data:`PROJECT_CONFIG_FILE`) and ``PYJOB_*``
+    environment variables. Keyword arguments are applied on top with
+    :meth:`~pyjob.config.Settings.override`.
+
+    Parameters
+    ----------
+    reload : bool, optional
+       Resolve the layers again
+
+    Returns
+    -------
+    :obj:`~pyjob.config.Settings`
+
+    Note
+    ----
+    The snapshot is refreshed automatically whenever the user configuration is
+    written with :meth:`~pyjob.config.PyJobConfig.write`.
+
+    """
+    global _settings
+    if _settings is None or reload:
+        import pyjob
+
+        resolved = {}
+        for layer in (
+            read_optional_yaml(SYSTEM_CONFIG_FILE),
+            pyjob.config,
+            read_optional_yaml(PROJECT_CONFIG_FILE),
+            read_environment(),
+        ):
+            resolved.update(layer)
+        _settings = Settings(resolved)
+    return _settings
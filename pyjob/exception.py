@@ -20,3 +20,7 @@ class PyJobTaskLockedError(PyJobError):
 
 class PyJobUnknownTaskPlatform(PyJobError):
     pass
+
+
+class PyJobTimeoutError(PyJobExecutionError):
+    pass
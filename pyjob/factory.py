@@ -3,17 +3,114 @@ import logging
 
 from pyjob.exception import PyJobUnknownTaskPlatform
 
+#: Entry point group for third-party :obj:`~pyjob.task.Task` platforms
+ENTRY_POINT_GROUP = "pyjob.platforms"
+
 TASK_PLATFORMS = {
     "local": ("pyjob.local", "LocalTask"),
     "lsf": ("pyjob.lsf", "LoadSharingFacilityTask"),
     "pbs": ("pyjob.pbs", "PortableBatchSystemTask"),
     "slurm": ("pyjob.slurm", "SlurmTask"),
     "sge": ("pyjob.sge", "SunGridEngineTask"),
+    "sim": ("pyjob.sim", "SimulatedTask"),
     "torque": ("pyjob.torque", "TorqueTask"),
 }
 
 logger = logging.getLogger(__name__)
 
+_entry_points_loaded = False
+_platform_classes = {}
+
+
+def _load_entry_points():
+    """Add platforms advertised in the ``pyjob.platforms`` entry point group
+
+    Only the package metadata is read, the platform modules themselves are imported
+    on first use.
+
+    """
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # pragma: no cover
+        try:
+            from importlib_metadata import entry_points
+        except ImportError:
+            return
+    eps = entry_points()
+    if hasattr(eps, "select"):
+        eps = eps.select(group=ENTRY_POINT_GROUP)
+    else:  # pragma: no cover
+        eps = eps.get(ENTRY_POINT_GROUP, [])
+    for ep in eps:
+        module, _, class_ = ep.value.partition(":")
+        TASK_PLATFORMS.setdefault(ep.name.lower(), (module.strip(), class_.strip()))
+
+
+def register_platform(platform, module, class_):
+    """Register a :obj:`~pyjob.task.Task` platform
+
+    Parameters
+    ----------
+    platform : str
+       The name of the platform
+    module : str
+       The module containing the :obj:`~pyjob.task.Task` class
+    class_ : str
+       The name of the :obj:`~pyjob.task.Task` class
+
+    """
+    platform = platform.lower()
+    TASK_PLATFORMS[platform] = (module, class_)
+    _platform_classes.pop(platform, None)
+
+
+def available_platforms():
+    """The names of all known :obj:`~pyjob.task.Task` platforms
+
+    Returns
+    -------
+    list
+
+    """
+    _load_entry_points()
+    return list(TASK_PLATFORMS)
+
+
+def get_platform(platform):
+    """Get the :obj:`~pyjob.task.Task` class for a platform
+
+    Parameters
+    ----------
+    platform : str
+       The name of the platform
+
+    Returns
+    -------
+    type
+       The :obj:`~pyjob.task.Task` class
+
+    Raises
+    ------
+    :exc:`~pyjob.exception.PyJobUnknownTaskPlatform`
+       Unknown platform
+
+    """
+    platform = platform.lower()
+    if platform in _platform_classes:
+        return _platform_classes[platform]
+    if platform not in TASK_PLATFORMS:
+        _load_entry_points()
+    if platform not in TASK_PLATFORMS:
+        raise PyJobUnknownTaskPlatform(f"Unknown platform: {platform}")
+    logger.debug("Found requested platform in available task list")
+    module, class_ = TASK_PLATFORMS[platform]
+    _platform_classes[platform] = getattr(importlib.import_module(module), class_)
+    return _platform_classes[platform]
+
 
 def TaskFactory(platform, *args, **kwargs):
     """Accessibility function for any :obj:`~pyjob.task.Task`
@@ -39,11 +136,10 @@ def TaskFactory(platform, *args, **kwargs):
     :exc:`~pyjob.exception.PyJobUnknownTaskPlatform`
        Unknown platform
 
+    Note
+    ----
+    Third-party platforms are made available through the ``pyjob.platforms`` entry
+    point group, e.g. ``condor = mypackage.condor:CondorTask``.
+
     """
-    platform = platform.lower()
-    if platform in TASK_PLATFORMS:
-        logger.debug("Found requested platform in available task list")
-        module, class_ = TASK_PLATFORMS[platform]
-        return getattr(importlib.import_module(module), class_)(*args, **kwargs)
-    else:
-        raise PyJobUnknownTaskPlatform(f"Unknown platform: {platform}")
+    return get_platform(platform)(*args, **kwargs)
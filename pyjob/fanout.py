@@ -0,0 +1,151 @@
+import argparse
+import json
+import logging
+import os
+import subprocess
+
+from pyjob.config import atomic_write
+
+# Shell return codes of scripts that cannot be executed or cannot be found
+NOT_EXECUTABLE, NOT_FOUND = 126, 127
+
+logger = logging.getLogger(__name__)
+
+
+def bundle_path(directory, index):
+    """Path to the file listing the scripts of a bundle"""
+    return os.path.join(directory, f"bundle_{index}")
+
+
+def results_path(directory, index):
+    """Path to the file holding the return codes of a bundle"""
+    return os.path.join(directory, f"results_{index}.json")
+
+
+def write_bundles(directory, scripts, bundle_size):
+    """Split scripts into bundles for node-local execution
+
+    Parameters
+    ----------
+    directory : str
+       The directory for the bundle files, needs to be on a shared file system
+    scripts : list, tuple
+       The script paths
+    bundle_size : int
+       The maximum number of scripts per bundle
+
+    Returns
+    -------
+    int
+       The number of bundles, numbered from 1
+
+    """
+    os.makedirs(directory, exist_ok=True)
+    nbundles = 0
+    for i in range(0, len(scripts), bundle_size):
+        nbundles += 1
+        with open(bundle_path(directory, nbundles), "w") as f:
+            f.write("\n".join(scripts[i : i + bundle_size]))
+    return nbundles
+
+
+def run_script(script):
+    """Execute a single script with its output written to the script's log
+
+    Parameters
+    ----------
+    script : str
+       The script path
+
+    Returns
+    -------
+    tuple
+       The script path and its return code
+
+    """
+    log = os.path.splitext(script)[0] + ".log"
+    with open(log, "w") as f:
+        try:
+            returncode = subprocess.call([script], stdout=f, stderr=subprocess.STDOUT)
+        except OSError as e:
+            # Reported like any other failure, so that the bundle results are written
+            logger.error("Cannot execute %s: %s", script, e)
+            f.write(f"{e}\n")
+            returncode = NOT_EXECUTABLE if os.path.exists(script) else NOT_FOUND
+    return script, returncode
+
+
+def run_bundle(directory, index, processes):
+    """Execute a bundle of scripts across the cores of the current allocation
+
+    Parameters
+    ----------
+    directory : str
+       The directory containing the bundle files
+    index : int
+       The bundle number
+    processes : int
+       The number of concurrent scripts
+
+    Returns
+    -------
+    dict
+       The return code of each script
+
+    """
+    from pyjob.pool import Pool
+
+    with open(bundle_path(directory, index), "r") as f:
+        scripts = f.read().splitlines()
+    with Pool(processes=min(processes, len(scripts)) or 1) as pool:
+        returncodes = dict(pool.map(run_script, scripts, chunksize=1))
+    atomic_write(results_path(directory, index), json.dumps(returncodes))
+    logger.debug("Executed bundle %d with %d scripts", index, len(scripts))
+    return returncodes
+
+
+def read_results(directory):
+    """Collect the return codes of all completed bundles
+
+    Parameters
+    ----------
+    directory : str
+       The directory containing the bundle files
+
+    Returns
+    -------
+    dict
+       The return code of each script
+
+    """
+    returncodes = {}
+    if not os.path.isdir(directory):
+        return returncodes
+    for fname in os.listdir(directory):
+        if fname.startswith("results_"):
+            with open(os.path.join(directory, fname), "r") as f:
+                returncodes.update(json.load(f))
+    return returncodes
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(
+        prog="pyjob.fanout", description="pyjob node-local executor"
+    )
+    p.add_argument("directory", help="the bundle directory")
+    p.add_argument("index", type=int, help="the bundle number")
+    p.add_argument(
+        "-t",
+        "--threads",
+        type=int,
+        dest="processes",
+        default=1,
+        help="number of threads",
+    )
+    args = p.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    run_bundle(args.directory, args.index, args.processes)
+
+
+if __name__ == "__main__":
+    main()
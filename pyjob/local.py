@@ -1,31 +1,251 @@
+import array
+import collections
+import ctypes
+import itertools
 import logging
 import multiprocessing
+import multiprocessing.connection
 import os
+import pickle
+import queue
+import signal
 import sys
+import threading
 import time
 import uuid
 
-from pyjob.cexec import cexec
+from pyjob import metrics
+from pyjob.cexec import (
+    KILL_GRACE_PERIOD,
+    WAIT_MAX_DELAY,
+    execute,
+    is_exe,
+    kill_process_group,
+)
+from pyjob.exception import (
+    PyJobError,
+    PyJobExecutableNotFoundError,
+    PyJobExecutionError,
+    PyJobTimeoutError,
+)
+from pyjob.pool import get_context
+from pyjob.script import Script
 from pyjob.task import Task
 
 CPU_COUNT = multiprocessing.cpu_count()
 
+# Indices of the per-task script counters shared with LocalProcess workers
+RUNNING, DONE, FAILED = range(3)
+
+# Seconds between checks for dead workers while waiting for results
+COLLECT_INTERVAL = 0.1
+
+# Default number of times a job is requeued after its worker died
+RETRIES = 1
+
+# Seconds to wait for a killed worker to exit
+KILL_JOIN_TIMEOUT = 1.0
+
+# Kinds of LocalTask workers, the first being the default
+EXECUTORS = ("process", "thread")
+
 logger = logging.getLogger(__name__)
 
 
+class SharedJobArray(object):
+    """Packed array of job payloads in shared memory, claimed in order by workers
+
+    Scripts are stored as their encoded paths and callables in their pickled form,
+    each behind a one byte type tag, so that workers can claim and read jobs without
+    any pickling or pipe traffic.
+
+    """
+
+    SCRIPT, CALL = b"s", b"c"
+
+    def __init__(self, scripts, calls, context=multiprocessing):
+        """Instantiate a new :obj:`~pyjob.local.SharedJobArray`
+
+        Parameters
+        ----------
+        scripts : list
+           The script paths
+        calls : list
+           The pickled callables
+        context : :obj:`multiprocessing.context.BaseContext`, optional
+           The context to allocate the shared memory in
+
+        """
+        payloads = [self.SCRIPT + os.fsencode(script) for script in scripts]
+        payloads += [self.CALL + call for call in calls]
+        offsets = array.array("q", [0])
+        offsets.extend(itertools.accumulate(map(len, payloads)))
+        data = b"".join(payloads)
+        self._data = context.RawArray("c", max(len(data), 1))
+        ctypes.memmove(self._data, data, len(data))
+        self._offsets = context.RawArray("q", len(offsets))
+        ctypes.memmove(
+            self._offsets, offsets.buffer_info()[0], len(offsets) * offsets.itemsize
+        )
+        self._next = context.Value("q", 0)
+        self._size = len(payloads)
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        """The script path or pickled callable of job `index`"""
+        data = self._data[self._offsets[index] : self._offsets[index + 1]]
+        if data[:1] == self.SCRIPT:
+            return os.fsdecode(data[1:])
+        return data[1:]
+
+    def claim(self):
+        """The index of the next unclaimed job, ``None`` if none is left"""
+        with self._next.get_lock():
+            index = self._next.value
+            if index >= self._size:
+                return None
+            self._next.value = index + 1
+        return index
+
+    def discard(self):
+        """Mark all remaining jobs as claimed"""
+        with self._next.get_lock():
+            self._next.value = self._size
+
+
+class JobResult(object):
+    """Outcome of a single job of a :obj:`~pyjob.local.LocalTask`"""
+
+    def __init__(
+        self,
+        index,
+        value=None,
+        error=None,
+        start=None,
+        end=None,
+        returncode=None,
+        rusage=None,
+        timed_out=False,
+    ):
+        """Instantiate a new :obj:`~pyjob.local.JobResult`
+
+        Parameters
+        ----------
+        index : int
+           The position of the job in the :obj:`~pyjob.local.LocalTask`
+        value : obj, optional
+           The return value of a callable
+        error : :exc:`Exception`, optional
+           The exception raised by a callable, or the reason a script failed
+        start : float, optional
+           The :func:`time.time` at the start of the job
+        end : float, optional
+           The :func:`time.time` at the end of the job
+        returncode : int, optional
+           The return code of a script, negative if terminated by a signal
+        rusage : :obj:`resource.struct_rusage`, optional
+           The resource usage of a script
+        timed_out : bool, optional
+           Whether the job was terminated, or not started, because of a timeout
+
+        """
+        self.index = index
+        self.job = None
+        self.value = value
+        self.error = error
+        self.start = start
+        self.end = end
+        self.returncode = returncode
+        self.rusage = rusage
+        self.timed_out = timed_out
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__qualname__}(job={self.job} "
+            f"success={self.success} duration={self.duration})"
+        )
+
+    @property
+    def duration(self):
+        """The wall-clock run time in seconds"""
+        if self.start is None or self.end is None:
+            return None
+        return self.end - self.start
+
+    @property
+    def success(self):
+        """Whether the job completed without error"""
+        return self.error is None
+
+
 class LocalTask(Task):
-    """Locally executable :obj:`~pyjob.task.Task`"""
+    """Locally executable :obj:`~pyjob.task.Task`
+
+    Besides scripts, jobs can be picklable callables without arguments, e.g.
+    :func:`functools.partial` objects. These run directly in the worker processes.
+    The return code and resource usage of every script, and the return value of
+    every callable, are available from :attr:`results`. A failing job does not
+    stop its worker, and workers that die are replaced, with the job they were
+    executing requeued up to ``retries`` times.
+
+    Workers are started with the ``start_method`` of :mod:`multiprocessing`, see
+    :func:`~pyjob.pool.get_context`. With ``forkserver``, workers do not inherit the
+    memory of the calling program. With ``executor="thread"``, workers are threads
+    of the calling program instead, which costs far less memory per worker when
+    jobs are scripts. Callables then run under the global interpreter lock and
+    cannot be interrupted by :meth:`kill`.
+
+    Each script can be limited to ``timeout`` seconds, and the whole task to
+    ``runtime`` minutes. Scripts exceeding either have their process group
+    terminated, and jobs not yet started once the runtime is exceeded are skipped.
+
+    Examples
+    --------
+
+    >>> from functools import partial
+    >>> from pyjob.local import LocalTask
+    >>> with LocalTask([partial(pow, 2, i) for i in range(4)], processes=2) as task:
+    ...     task.run()
+    >>> [result.value for result in task.results]
+    [1, 2, 4, 8]
+
+    """
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, script, *args, **kwargs):
         """Instantiate a new :obj:`~pyjob.local.LocalTask`"""
-        super().__init__(*args, **kwargs)
+        self.calls = []
+        if callable(script):
+            self.calls, script = [script], None
+        elif isinstance(script, (list, tuple)) and not isinstance(script, Script):
+            self.calls = [job for job in script if callable(job)]
+            if self.calls:
+                script = [job for job in script if not callable(job)]
+        super().__init__(script, *args, **kwargs)
 
-        self.queue = multiprocessing.Queue()
-        self.kill_switch = multiprocessing.Event()
         self.processes = []
         self.chdir = kwargs.get("chdir", False)
         self.permit_nonzero = kwargs.get("permit_nonzero", False)
+        self.retries = kwargs.get("retries", RETRIES)
+        self.timeout = kwargs.get("timeout")
+        self.runtime = self.settings.get("runtime")
         self._killed = False
+        self._results = {}
+        self._supervisor = None
+
+        self.executor = self.settings.get("executor") or EXECUTORS[0]
+        if self.executor not in EXECUTORS:
+            raise PyJobError(f"Unsupported executor: {self.executor}")
+        self.start_method = self.settings.get("start_method")
+        self.context = get_context(self.start_method)
+        if self.executor == "thread":
+            self.queue = queue.Queue()
+            self.kill_switch = threading.Event()
+        else:
+            self.queue = self.context.Queue()
+            self.kill_switch = self.context.Event()
+        self.counters = self.context.Array("l", 3)
 
     @property
     def nprocesses(self):
@@ -42,98 +262,658 @@ class LocalTask(Task):
     @property
     def info(self):
         """:obj:`~pyjob.local.LocalTask` information"""
-        if any(proc.is_alive() for proc in self.processes):
+        if self._supervisor is not None and self._supervisor.is_alive():
             return {"job_number": self.pid, "status": "Running"}
         return {}
 
+    @property
+    def njobs(self):
+        """The number of scripts and callables executed by this task"""
+        return len(self.script_collector) + len(self.calls)
+
+    @property
+    def results(self):
+        """The :obj:`~pyjob.local.JobResult` of every finished job in job order"""
+        if self._supervisor is not None and self.completed:
+            self._supervisor.join()
+        return [self._results[index] for index in sorted(self._results)]
+
+    def _progress_counts(self):
+        """Count pending, running, done and failed scripts from worker updates"""
+        with self.counters.get_lock():
+            running, done, failed = self.counters[:]
+        pending = self.njobs - running - done - failed
+        if self.completed:
+            # Scripts skipped after a kill or a failed worker
+            return {"done": done, "failed": failed + pending}
+        return {"pending": pending, "running": running, "done": done, "failed": failed}
+
     def close(self):
         """Close this :obj:`~pyjob.local.LocalTask` after completion"""
         if self._killed:
             return
+        if self._supervisor is not None:
+            self._supervisor.join()
         for proc in self.processes:
             proc.join()
         self.kill()
 
     def kill(self):
-        """Immediately terminate the :obj:`~pyjob.local.LocalTask`"""
+        """Immediately terminate the :obj:`~pyjob.local.LocalTask`
+
+        Running scripts have their process groups terminated and queued jobs are
+        discarded, so that this returns within about :data:`~pyjob.cexec.KILL_GRACE_PERIOD`
+        seconds regardless of the number and duration of jobs.
+
+        """
         if self._killed:
             return
-        if not self.kill_switch.is_set():
+        if self._supervisor is not None:
+            # The supervisor terminates the workers and their children
             self.kill_switch.set()
-        # This is a requirement to avoid access to memory-inaccessible processes
-        # The queue gets flushed by triggering the kill_switch
-        for proc in self.processes:
-            proc.join()
-        for proc in self.processes:
-            proc.terminate()
-        logger.debug("Terminated task: %d", self.pid)
+            self._supervisor.join()
+        logger.debug("Terminated task: %s", self.pid)
         self._killed = True
 
     def _run(self):
         """Method to initialise :obj:`~pyjob.local.LocalTask` execution"""
         if self._killed:
             return
-        for _ in range(self.nprocesses):
-            proc = LocalProcess(
+        # Validated once here, so that workers can launch scripts without any lookup
+        invalid = [script for script in self.script if not is_exe(script)]
+        if invalid:
+            raise PyJobExecutableNotFoundError(
+                f"Cannot find executable script(s): {', '.join(invalid)}"
+            )
+        # Pickled before any worker starts so that unpicklable callables fail here
+        calls = []
+        for call in self.calls:
+            try:
+                calls.append(pickle.dumps(call))
+            except (pickle.PicklingError, AttributeError, TypeError) as e:
+                raise PyJobError(f"Cannot pickle job {call!r}: {e}") from e
+        durations = (
+            metrics.LOCAL_SCRIPT_DURATION.allocate() if metrics.ENABLED else None
+        )
+        current = self.context.Array("q", [-1] * self.nprocesses)
+        children = self.context.Array("q", self.nprocesses)
+        deadline = time.time() + self.runtime * 60 if self.runtime else None
+        jobs = SharedJobArray(self.script, calls, context=self.context)
+        if self.executor == "thread":
+            worker, supervisor = LocalThread, LocalThreadSupervisor
+            options = {"result_queue": queue.SimpleQueue()}
+        else:
+            worker, supervisor = LocalProcess, LocalSupervisor
+            options = {"start_method": self.start_method}
+        for slot in range(self.nprocesses):
+            proc = worker(
                 self.queue,
                 self.kill_switch,
+                jobs,
+                counters=self.counters,
+                durations=durations,
                 directory=self.directory,
                 chdir=self.chdir,
                 permit_nonzero=self.permit_nonzero,
+                slot=slot,
+                current=current,
+                children=children,
+                timeout=self.timeout,
+                deadline=deadline,
+                **options,
             )
-            proc.start()
             self.processes.append(proc)
-        for script in self.script:
-            self.queue.put(script)
+        self._supervisor = supervisor(
+            self.processes,
+            self.script + self.calls,
+            self._results,
+            permit_nonzero=self.permit_nonzero,
+            retries=self.retries,
+        )
+        self._supervisor.start()
+        self.pid = uuid.uuid1().int
+        time.sleep(0.1)
+
+
+class LocalSupervisor(threading.Thread):
+    """Supervisor of the :obj:`~pyjob.local.LocalProcess` workers of a :obj:`~pyjob.local.LocalTask`
+
+    The supervisor collects the job results, replaces workers that die and requeues
+    the job a dead worker was executing. Once the kill switch is set, it terminates
+    the workers and the process groups of their scripts. It holds no reference to
+    the task, so that the task can still be finalised while the supervisor is running.
+
+    """
+
+    def __init__(self, processes, jobs, results, permit_nonzero=False, retries=RETRIES):
+        """Instantiate a :obj:`~pyjob.local.LocalSupervisor`
+
+        Parameters
+        ----------
+        processes : list
+           The :obj:`~pyjob.local.LocalProcess` workers to start, replaced in place
+        jobs : list
+           The scripts and callables of the task
+        results : dict
+           The :obj:`~pyjob.local.JobResult` per job index, filled in place
+        permit_nonzero : bool, optional
+           Count failed jobs as done
+        retries : int, optional
+           The number of times a job is requeued after its worker died
+
+        Warning
+        -------
+        This object should only be instantiated by :obj:`~pyjob.local.LocalTask`!
+
+        """
+        super().__init__(name="pyjob-local-supervisor", daemon=True)
+        self.processes = processes
+        self.jobs = jobs
+        self.results = results
+        self.permit_nonzero = permit_nonzero
+        self.retries = retries
+        self.attempts = collections.Counter()
+        worker = processes[0]
+        self.queue = worker.queue
+        self.kill_switch = worker.kill_switch
+        self.counters = worker.counters
+        self.current = worker.current
+        self.children = worker.children
+
+    def run(self):
+        """Method representing the :obj:`~pyjob.local.LocalSupervisor` activity"""
+        self.connections = [None] * len(self.processes)
+        for slot in range(len(self.processes)):
+            self._start(slot)
+        stopping = False
+        while True:
+            self._receive(timeout=COLLECT_INTERVAL)
+            if self.kill_switch.is_set():
+                self._terminate()
+                break
+            if stopping:
+                if not any(proc.is_alive() for proc in self.processes):
+                    break
+            else:
+                self._replace_dead_workers()
+                if len(self.results) == len(self.jobs):
+                    # Requeued jobs may still be added up to this point
+                    self._stop_workers()
+                    stopping = True
+        self._receive()
+
+    def _stop_workers(self):
+        """Let every worker finish once all jobs are claimed"""
         for _ in self.processes:
             self.queue.put(None)
         self.queue.close()
-        self.pid = uuid.uuid1().int
-        time.sleep(0.1)
 
+    def _terminate(self):
+        """Terminate all scripts and workers, discarding the queued jobs"""
+        deadline = time.monotonic() + KILL_GRACE_PERIOD
+        self.processes[0].jobs.discard()
+        for pid in self.children:
+            if pid:
+                kill_process_group(pid, signal.SIGTERM)
+        # Workers reap their scripts and skip any further jobs meanwhile
+        while any(self.children) and time.monotonic() < deadline:
+            self._receive(timeout=WAIT_MAX_DELAY)
+        for pid in self.children:
+            if pid:
+                kill_process_group(pid)
+        for proc in self.processes:
+            if proc.is_alive():
+                proc.kill()
+        for proc in self.processes:
+            proc.join(KILL_JOIN_TIMEOUT)
+        # Results sent after the children were cleared, before the counters are reset
+        self._receive()
+        # Sentinels and requeued jobs are abandoned, not flushed to the dead workers
+        self.queue.cancel_join_thread()
+        self.queue.close()
+        with self.counters.get_lock():
+            self.counters[RUNNING] = 0
 
-class LocalProcess(multiprocessing.Process):
-    """Extension to :obj:`multiprocessing.Process` for :obj:`~pyjob.local.LocalTask`"""
+    def _start(self, slot):
+        """Start the worker in `slot` with a result pipe of its own"""
+        reader, writer = self.processes[slot].context.Pipe(duplex=False)
+        self.processes[slot].result_connection = writer
+        self.processes[slot].start()
+        # Only the worker may hold the writing end, so that its death closes the pipe
+        writer.close()
+        self.connections[slot] = reader
+
+    def _receive(self, timeout=0):
+        """Store all available results, waiting up to `timeout` for any worker activity"""
+        waitables = [conn for conn in self.connections if conn is not None]
+        waitables += [proc.sentinel for proc in self.processes]
+        for ready in multiprocessing.connection.wait(waitables, timeout):
+            if ready not in self.connections:
+                continue
+            try:
+                while ready.poll():
+                    self._store(pickle.loads(ready.recv_bytes()))
+            except (EOFError, OSError):
+                # The worker has exited, see _replace_dead_workers
+                self.connections[self.connections.index(ready)] = None
+                ready.close()
+
+    def _store(self, result):
+        """Store a :obj:`~pyjob.local.JobResult` and count its outcome"""
+        result.job = self.jobs[result.index]
+        self.results[result.index] = result
+        category = DONE if result.success or self.permit_nonzero else FAILED
+        with self.counters.get_lock():
+            self.counters[RUNNING] -= 1
+            self.counters[category] += 1
+
+    def _replace_dead_workers(self):
+        """Start a new worker for every dead one and requeue its job"""
+        for slot, proc in enumerate(self.processes):
+            if proc.exitcode is None:
+                continue
+            # Any result the worker managed to send before it died
+            self._receive()
+            if self.connections[slot] is not None:
+                self.connections[slot].close()
+            logger.warning(
+                "Worker %d died with exit code %d, starting a new one",
+                proc.pid,
+                proc.exitcode,
+            )
+            with self.counters.get_lock():
+                index = self.current[slot]
+                self.current[slot] = -1
+                if index >= 0 and index not in self.results:
+                    self.counters[RUNNING] -= 1
+                else:
+                    index = -1
+            if index >= 0:
+                self._retry(index, f"exit code {proc.exitcode}")
+            self.processes[slot] = proc.clone()
+            self._start(slot)
+
+    def _retry(self, index, reason):
+        """Requeue a job lost in a dead worker, or fail it once out of retries"""
+        self.attempts[index] += 1
+        if self.attempts[index] <= self.retries:
+            self.queue.put(index)
+            return
+        error = PyJobExecutionError(f"Worker died with {reason} executing job {index}")
+        with self.counters.get_lock():
+            self.counters[RUNNING] += 1
+        self._store(JobResult(index, error=error))
+
+
+class LocalThreadSupervisor(LocalSupervisor):
+    """Supervisor of the :obj:`~pyjob.local.LocalThread` workers of a :obj:`~pyjob.local.LocalTask`
+
+    Threads report their results on a queue shared in memory and do not die from
+    failing jobs, so a thread only stops unexpectedly on an internal error. It is
+    then replaced and its job requeued like that of a dead process.
+
+    """
+
+    def _stop_workers(self):
+        """Let every worker finish once all jobs are claimed"""
+        for _ in self.processes:
+            self.queue.put(None)
+
+    def _terminate(self):
+        """Terminate all scripts, discarding the queued jobs"""
+        deadline = time.monotonic() + KILL_GRACE_PERIOD
+        self.processes[0].jobs.discard()
+        for pid in self.children:
+            if pid:
+                kill_process_group(pid, signal.SIGTERM)
+        while any(self.children) and time.monotonic() < deadline:
+            self._receive(timeout=WAIT_MAX_DELAY)
+        for pid in self.children:
+            if pid:
+                kill_process_group(pid)
+        # Threads cannot be killed, only released from waiting for requeued jobs
+        self._stop_workers()
+        for proc in self.processes:
+            proc.join(KILL_JOIN_TIMEOUT)
+        self._receive()
+        with self.counters.get_lock():
+            self.counters[RUNNING] = 0
+
+    def _start(self, slot):
+        """Start the worker in `slot`"""
+        self.processes[slot].start()
+
+    def _receive(self, timeout=0):
+        """Store all available results, waiting up to `timeout` for the first one"""
+        result_queue = self.processes[0].result_queue
+        try:
+            self._store(result_queue.get(block=timeout > 0, timeout=timeout or None))
+        except queue.Empty:
+            return
+        while not result_queue.empty():
+            self._store(result_queue.get_nowait())
+
+    def _replace_dead_workers(self):
+        """Start a new worker for every stopped one and requeue its job"""
+        for slot, proc in enumerate(self.processes):
+            if proc.is_alive():
+                continue
+            self._receive()
+            logger.warning("Worker thread %s stopped, starting a new one", proc.name)
+            with self.counters.get_lock():
+                index = self.current[slot]
+                self.current[slot] = -1
+                if index >= 0 and index not in self.results:
+                    self.counters[RUNNING] -= 1
+                else:
+                    index = -1
+            if index >= 0:
+                self._retry(index, "an exception")
+            self.processes[slot] = proc.clone()
+            self._start(slot)
+
+
+class LocalWorker(object):
+    """Job execution shared by :obj:`~pyjob.local.LocalProcess` and :obj:`~pyjob.local.LocalThread`"""
 
     def __init__(
-        self, queue, kill_switch, directory=None, permit_nonzero=False, chdir=False
+        self,
+        queue,
+        kill_switch,
+        jobs,
+        directory=None,
+        permit_nonzero=False,
+        chdir=False,
+        counters=None,
+        durations=None,
+        slot=0,
+        current=None,
+        children=None,
+        timeout=None,
+        deadline=None,
     ):
-        """Instantiate a :obj:`~pyjob.local.LocalProcess`
+        """Instantiate a :obj:`~pyjob.local.LocalWorker`
 
         Parameters
         ----------
-        queue : :obj:`~multiprocessing.Queue`
-           An instance of a :obj:`~multiprocessing.Queue`
+        queue : :obj:`~multiprocessing.Queue`, :obj:`queue.Queue`
+           The queue of requeued job indices, served once all jobs are claimed
         kill_switch : obj
            An instance of a :obj:`~multiprocessing.Event`
+        jobs : :obj:`~pyjob.local.SharedJobArray`
+           The jobs to claim
         directory : str, optional
            The directory to execute the jobs in
         permit_nonzero : bool, optional
            Allow non-zero return codes
-
-        Warning
-        -------
-        This object should only be instantiated by :obj:`~pyjob.local.LocalTask`!
+        chdir : bool, optional
+           Execute the jobs in their script directory
+        counters : :obj:`~multiprocessing.Array`, optional
+           Shared counters of running, done and failed jobs
+        durations : :obj:`~pyjob.metrics.SharedHistogram`, optional
+           Shared histogram to record the job run times in
+        slot : int, optional
+           The position of this worker in `current`
+        current : :obj:`~multiprocessing.Array`, optional
+           Shared indices of the job in execution per worker, -1 when idle
+        children : :obj:`~multiprocessing.Array`, optional
+           Shared process identifiers of the script in execution per worker
+        timeout : float, optional
+           The wall-clock time limit in seconds of each script
+        deadline : float, optional
+           The :func:`time.time` after which no job may run
 
         """
-        super(LocalProcess, self).__init__()
         self.queue = queue
         self.kill_switch = kill_switch
+        self.jobs = jobs
         self.directory = directory
         self.permit_nonzero = permit_nonzero
         self.chdir = chdir
+        self.counters = counters
+        self.durations = durations
+        self.slot = slot
+        self.current = current
+        self.children = children
+        self.timeout = timeout
+        self.deadline = deadline
+
+    def _settings(self):
+        """The keyword arguments to instantiate an equivalent worker"""
+        return dict(
+            directory=self.directory,
+            permit_nonzero=self.permit_nonzero,
+            chdir=self.chdir,
+            counters=self.counters,
+            durations=self.durations,
+            slot=self.slot,
+            current=self.current,
+            children=self.children,
+            timeout=self.timeout,
+            deadline=self.deadline,
+        )
+
+    def _next(self):
+        """The index of the next job, ``None`` once the task has finished"""
+        index = self.jobs.claim()
+        if index is None:
+            # Jobs lost in dead workers are requeued until the supervisor stops us
+            index = self.queue.get()
+        return index
+
+    def _claim(self, index):
+        """Mark job `index` as running in this worker"""
+        if self.counters is None:
+            return
+        with self.counters.get_lock():
+            if self.current is not None:
+                self.current[self.slot] = index
+            self.counters[RUNNING] += 1
+
+    def _release(self):
+        """Mark this worker as idle"""
+        if self.current is not None:
+            self.current[self.slot] = -1
 
     def run(self):
-        """Method representing the :obj:`~pyjob.local.LocalProcess` activity"""
-        for job in iter(self.queue.get, None):
+        """Method representing the worker activity"""
+        for index in iter(self._next, None):
             if self.kill_switch.is_set():
                 continue
-            if self.chdir:
-                directory = os.path.dirname(job)
+            job = self.jobs[index]
+            self._claim(index)
+            timeout = self._timeout()
+            if timeout is not None and timeout <= 0:
+                result = JobResult(index, timed_out=True)
+                result.error = PyJobTimeoutError("Task runtime exceeded before start")
+            elif isinstance(job, bytes):
+                result = self._call(index, job)
             else:
-                directory = self.directory
-            log = os.path.splitext(job)[0] + ".log"
-            with open(log, "w") as f:
-                cexec(
-                    [job], cwd=directory, stdout=f, permit_nonzero=self.permit_nonzero
+                result = self._execute(index, job, timeout)
+            if self.durations is not None and result.duration is not None:
+                self.durations.observe(result.duration)
+            self._report(result)
+            self._release()
+
+    def _spawned(self, pid):
+        """Publish the process identifier of the script in execution"""
+        if self.children is not None:
+            self.children[self.slot] = pid
+
+    def _timeout(self):
+        """The time limit in seconds of the next job, ``None`` if unlimited"""
+        if self.deadline is None:
+            return self.timeout
+        remaining = self.deadline - time.time()
+        if self.timeout is None:
+            return remaining
+        return min(self.timeout, remaining)
+
+    def _execute(self, index, job, timeout=None):
+        """Run a script and return its :obj:`~pyjob.local.JobResult`"""
+        if self.chdir:
+            directory = os.path.dirname(job)
+        else:
+            directory = self.directory
+        cwd = self._working_directory(directory)
+        log = os.path.splitext(job)[0] + ".log"
+        result = JobResult(index, start=time.time())
+        try:
+            result.returncode, result.rusage, result.timed_out = execute(
+                job, log, timeout=timeout, on_spawn=self._spawned, cwd=cwd
+            )
+        except OSError as e:
+            result.error = e
+        else:
+            if result.timed_out:
+                result.error = PyJobTimeoutError(
+                    f"Execution of '{job}' exceeded its timeout of {timeout:.1f} seconds"
                 )
+            elif result.returncode != 0:
+                result.error = PyJobExecutionError(
+                    f"Execution of '{job}' exited with non-zero return code "
+                    f"({result.returncode})"
+                )
+        finally:
+            self._spawned(0)
+        result.end = time.time()
+        return result
+
+    def _call(self, index, data):
+        """Run a pickled callable and return its :obj:`~pyjob.local.JobResult`"""
+        result = JobResult(index, start=time.time())
+        try:
+            result.value = pickle.loads(data)()
+        except Exception as e:
+            result.error = e
+        result.end = time.time()
+        return result
+
+    def _working_directory(self, directory):
+        """Prepare `directory` for a script, returning the ``cwd`` for :func:`~pyjob.cexec.execute`"""
+        raise NotImplementedError
+
+    def _report(self, result):
+        """Send a :obj:`~pyjob.local.JobResult` to the :obj:`~pyjob.local.LocalSupervisor`"""
+        raise NotImplementedError
+
+
+class LocalProcess(LocalWorker, multiprocessing.Process):
+    """Extension to :obj:`multiprocessing.Process` for :obj:`~pyjob.local.LocalTask`"""
+
+    def __init__(self, *args, result_connection=None, start_method=None, **kwargs):
+        """Instantiate a :obj:`~pyjob.local.LocalProcess`
+
+        Parameters
+        ----------
+        *args : list
+           Positional arguments of :obj:`~pyjob.local.LocalWorker`
+        result_connection : :obj:`~multiprocessing.connection.Connection`, optional
+           The connection to report the :obj:`~pyjob.local.JobResult` of jobs on
+        start_method : str, optional
+           The :mod:`multiprocessing` start method of this worker
+        **kwargs : dict
+           Keyword arguments of :obj:`~pyjob.local.LocalWorker`
+
+        Warning
+        -------
+        This object should only be instantiated by :obj:`~pyjob.local.LocalTask`!
+
+        """
+        multiprocessing.Process.__init__(self)
+        LocalWorker.__init__(self, *args, **kwargs)
+        self.result_connection = result_connection
+        self.start_method = start_method
+        self._cwd = None
+
+    def clone(self):
+        """A new :obj:`~pyjob.local.LocalProcess` replacing this one in its slot"""
+        return self.__class__(
+            self.queue,
+            self.kill_switch,
+            self.jobs,
+            start_method=self.start_method,
+            **self._settings(),
+        )
+
+    @property
+    def context(self):
+        """The :mod:`multiprocessing` context of this worker"""
+        return multiprocessing.get_context(self.start_method)
+
+    @staticmethod
+    def _Popen(process_obj):
+        """Start `process_obj` with its own rather than the default start method"""
+        return process_obj.context.Process._Popen(process_obj)
+
+    def _working_directory(self, directory):
+        """Change into `directory`, so that scripts can be launched with :func:`os.posix_spawn`"""
+        # The worker is a process of its own, so it can change directory freely
+        if directory and directory != self._cwd:
+            os.chdir(directory)
+            self._cwd = directory
+        return None
+
+    def _report(self, result):
+        """Send a :obj:`~pyjob.local.JobResult` to the :obj:`~pyjob.local.LocalTask`"""
+        if self.result_connection is None:
+            return
+        try:
+            data = pickle.dumps(result)
+        except Exception as e:
+            result.value = None
+            result.error = PyJobExecutionError(f"Cannot pickle job result: {e}")
+            data = pickle.dumps(result)
+        # Sent synchronously, so that no result is lost if this worker dies later
+        self.result_connection.send_bytes(data)
+
+
+class LocalThread(LocalWorker, threading.Thread):
+    """Extension to :obj:`threading.Thread` for :obj:`~pyjob.local.LocalTask`
+
+    Threads launch scripts as well as processes do, at a fraction of the memory,
+    but callables run under the :term:`global interpreter lock`.
+
+    """
+
+    def __init__(self, *args, result_queue=None, **kwargs):
+        """Instantiate a :obj:`~pyjob.local.LocalThread`
+
+        Parameters
+        ----------
+        *args : list
+           Positional arguments of :obj:`~pyjob.local.LocalWorker`
+        result_queue : :obj:`queue.SimpleQueue`, optional
+           The queue to report the :obj:`~pyjob.local.JobResult` of jobs on
+        **kwargs : dict
+           Keyword arguments of :obj:`~pyjob.local.LocalWorker`
+
+        Warning
+        -------
+        This object should only be instantiated by :obj:`~pyjob.local.LocalTask`!
+
+        """
+        threading.Thread.__init__(self, name="pyjob-local-worker", daemon=True)
+        LocalWorker.__init__(self, *args, **kwargs)
+        self.result_queue = result_queue
+
+    def clone(self):
+        """A new :obj:`~pyjob.local.LocalThread` replacing this one in its slot"""
+        return self.__class__(
+            self.queue,
+            self.kill_switch,
+            self.jobs,
+            result_queue=self.result_queue,
+            **self._settings(),
+        )
+
+    def _working_directory(self, directory):
+        """The working directory is shared by all threads, so it is set per script"""
+        if directory and directory != os.getcwd():
+            return directory
+        return None
+
+    def _report(self, result):
+        """Send a :obj:`~pyjob.local.JobResult` to the :obj:`~pyjob.local.LocalTask`"""
+        if self.result_queue is not None:
+            self.result_queue.put(result)
@@ -1,20 +1,67 @@
+import json
 import logging
-import time
+import re
 import uuid
+from collections import Counter
 
 from pyjob.cexec import cexec
 from pyjob.exception import PyJobError, PyJobExecutableNotFoundError
 from pyjob.script import Script
+from pyjob.stopwatch import section
 from pyjob.task import ClusterTask
 
 logger = logging.getLogger(__name__)
 
+LSF_FINISHED_STATES = frozenset(["DONE", "EXIT"])
+RE_BJOBS_STATUS = re.compile(r"Status <(\w+)>")
+
+
+def parse_bjobs_json(stdout):
+    """Parse the output of ``bjobs -json -o "jobid stat"``
+
+    Parameters
+    ----------
+    stdout : str
+       The standard output of ``bjobs -json``
+
+    Returns
+    -------
+    dict
+       The job information, empty if all jobs have finished
+
+    Raises
+    ------
+    :exc:`ValueError`
+       The output is not valid ``bjobs`` JSON
+
+    """
+    if not stdout:
+        raise ValueError("No bjobs output to parse")
+    try:
+        records = json.loads(stdout)["RECORDS"]
+    except (KeyError, TypeError) as e:
+        raise ValueError("Invalid bjobs JSON output") from e
+    # Unknown jobs are reported as records with an ERROR field only
+    states = Counter(record["STAT"] for record in records if "STAT" in record)
+    active = {k: v for k, v in states.items() if k not in LSF_FINISHED_STATES}
+    if not active:
+        return {}
+    return {"status": max(active, key=active.get), "states": dict(states)}
+
 
 class LoadSharingFacilityTask(ClusterTask):
     """LoadSharingFacility (LSF) executable :obj:`~pyjob.task.Task`"""
 
     JOB_ARRAY_INDEX = "$LSB_JOBINDEX"
     SCRIPT_DIRECTIVE = "#BSUB"
+    KILL_COMMAND = ["bkill", "-b"]
+    STATE_CATEGORIES = {
+        "PEND": "pending",
+        "PSUSP": "pending",
+        "RUN": "running",
+        "DONE": "done",
+        "EXIT": "failed",
+    }
 
     @property
     def info(self):
@@ -22,10 +69,23 @@ class LoadSharingFacilityTask(ClusterTask):
         if self.pid is None:
             return {}
         try:
+            data = self._query_structured_info(
+                ["bjobs", "-json", "-o", "jobid stat", str(self.pid)],
+                parse_bjobs_json,
+            )
+            if data:
+                data["job_number"] = self.pid
+            if data is not None:
+                return data
             stdout = cexec(["bjobs", "-l", str(self.pid)], permit_nonzero=True)
         except PyJobExecutableNotFoundError:
             return {}
-        if "Done successfully" in stdout:
+        statuses = set(RE_BJOBS_STATUS.findall(stdout))
+        if statuses:
+            finished = statuses <= LSF_FINISHED_STATES
+        else:
+            finished = "Done successfully" in stdout or "Exited" in stdout
+        if finished:
             return {}
         else:
             return {"job_number": self.pid, "status": "Running"}
@@ -48,7 +108,7 @@ class LoadSharingFacilityTask(ClusterTask):
         stdout = cexec(["bkill", str(self.pid)], permit_nonzero=True)
         if "is in progress" in stdout:
             stdout = cexec(["bkill", "-b", str(self.pid)], permit_nonzero=True)
-            time.sleep(10)
+            self.wait_for_termination(timeout=10)
         if any(
             text in stdout
             for text in [
@@ -74,6 +134,7 @@ class LoadSharingFacilityTask(ClusterTask):
             self.runscript.path,
         )
 
+    @section("LoadSharingFacilityTask._create_runscript")
     def _create_runscript(self):
         """Utility method to create runscript"""
         runscript = Script(
@@ -100,13 +161,24 @@ class LoadSharingFacilityTask(ClusterTask):
         if self.shell:
             cmd = f"-L {self.shell}"
             runscript.append(self.__class__.SCRIPT_DIRECTIVE + " " + cmd)
-        if self.nprocesses:
+        if self.nprocesses and self.fanout_mode:
+            # Bundles are executed by a single process across the cores of one node
+            cmd = f'-n {self.nprocesses} -R "span[hosts=1]"'
+            runscript.append(self.__class__.SCRIPT_DIRECTIVE + " " + cmd)
+        elif self.nprocesses:
             cmd = f'-R "span[ptile={self.nprocesses}]"'
             runscript.append(self.__class__.SCRIPT_DIRECTIVE + " " + cmd)
         if self.extra:
             cmd = " ".join(map(str, self.extra))
             runscript.append(self.__class__.SCRIPT_DIRECTIVE + " " + cmd)
-        if len(self.script) > 1:
+        if self.pilot_mode or self.fanout_mode:
+            logf = runscript.path.replace(".script", ".log")
+            nelements, lines = self.get_bundled_execution(runscript.path)
+            cmd = f"-J {self.name}[1-{nelements}]"
+            runscript.append(self.__class__.SCRIPT_DIRECTIVE + " " + cmd)
+            runscript.append(self.__class__.SCRIPT_DIRECTIVE + f" -o {logf}")
+            runscript.extend(lines)
+        elif len(self.script) > 1:
             logf = runscript.path.replace(".script", ".log")
             jobsf = runscript.path.replace(".script", ".jobs")
             with open(jobsf, "w") as f_out:
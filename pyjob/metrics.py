@@ -0,0 +1,390 @@
+"""Prometheus/OpenMetrics instrumentation of PyJob
+
+Metrics are disabled by default and the instrumented code paths only check
+:data:`ENABLED` in that case. Once enabled, the metrics can be scraped from an HTTP
+endpoint or written to a file for the textfile collector of the node exporter.
+
+Examples
+--------
+
+>>> from pyjob import metrics
+>>> metrics.enable()
+>>> metrics.start_http_server(9095)
+>>> metrics.write_textfile('/var/lib/node_exporter/pyjob.prom')
+
+"""
+
+import bisect
+import math
+import threading
+
+#: Global switch for all PyJob metrics
+ENABLED = False
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    300.0,
+    900.0,
+    3600.0,
+)
+
+
+def enable():
+    """Enable the collection of metrics"""
+    global ENABLED
+    ENABLED = True
+
+
+def disable():
+    """Disable the collection of metrics"""
+    global ENABLED
+    ENABLED = False
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (
+        (k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in labels
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+class Metric(object):
+    """Base class for labelled metrics"""
+
+    TYPE = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        """Instantiate a new :obj:`~pyjob.metrics.Metric`
+
+        Parameters
+        ----------
+        name : str
+           The metric name
+        documentation : str
+           The help text of the metric
+        labelnames : tuple, optional
+           The names of the labels
+        registry : :obj:`~pyjob.metrics.Registry`, optional
+           The registry to add the metric to [default: :data:`REGISTRY`]
+
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+        (REGISTRY if registry is None else registry).register(self)
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}(name={self.name})"
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Labels {self.labelnames} required for {self.name}")
+        return tuple((k, labels[k]) for k in self.labelnames)
+
+    def clear(self):
+        """Remove all values"""
+        with self._lock:
+            self._values.clear()
+
+    def samples(self):  # pragma: no cover
+        """Abstract method returning a list of (suffix, labels, value) samples"""
+        raise NotImplementedError
+
+    def exposition(self):
+        """The metric in the OpenMetrics text format"""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.TYPE}",
+        ]
+        for suffix, labels, value in self.samples():
+            lines.append(
+                f"{self.name}{suffix}{_format_labels(labels)} {_format_value(value)}"
+            )
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing counter"""
+
+    TYPE = "counter"
+
+    def inc(self, amount=1, **labels):
+        """Increment the counter
+
+        Parameters
+        ----------
+        amount : float, optional
+           The increment
+        **labels : dict
+           The label values
+
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels):
+        """The current value for the label values"""
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            return [("_total", key, value) for key, value in self._values.items()]
+
+
+class Histogram(Metric):
+    """Histogram of observations with cumulative buckets"""
+
+    TYPE = "histogram"
+
+    def __init__(self, *args, buckets=DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        """Record an observation
+
+        Parameters
+        ----------
+        value : float
+           The observed value
+        **labels : dict
+           The label values
+
+        """
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            if key not in self._values:
+                self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            values = self._values[key]
+            values[index] += 1
+            values[-1] += value
+
+    def get(self, **labels):
+        """The number of observations and their sum for the label values"""
+        values = self._values.get(self._key(labels))
+        if values is None:
+            return 0, 0.0
+        return sum(values[:-1]), values[-1]
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            items = [(key, list(values)) for key, values in self._values.items()]
+        for key, values in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), values[:-1]):
+                cumulative += count
+                samples.append(
+                    ("_bucket", key + (("le", _format_value(bound)),), cumulative)
+                )
+            samples.append(("_count", key, cumulative))
+            samples.append(("_sum", key, values[-1]))
+        return samples
+
+
+class SharedHistogram(Histogram):
+    """Unlabelled :obj:`~pyjob.metrics.Histogram` updated from worker processes
+
+    The storage is allocated in shared memory by :meth:`allocate`, which needs to
+    be called in the parent before the worker processes are started.
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._shared = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def allocate(self):
+        """Allocate the shared storage
+
+        Returns
+        -------
+        :obj:`~pyjob.metrics.SharedHistogram`
+           This instance
+
+        """
+        if self._shared is None:
+            import multiprocessing
+
+            self._shared = multiprocessing.Array("d", len(self.buckets) + 2)
+        return self
+
+    def observe(self, value, **labels):
+        if self._shared is None:
+            return super().observe(value, **labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._shared.get_lock():
+            self._shared[index] += 1
+            self._shared[-1] += value
+
+    def get(self, **labels):
+        if self._shared is None:
+            return super().get(**labels)
+        with self._shared.get_lock():
+            values = self._shared[:]
+        return int(sum(values[:-1])), values[-1]
+
+    def clear(self):
+        super().clear()
+        if self._shared is not None:
+            with self._shared.get_lock():
+                self._shared[:] = [0.0] * len(self._shared)
+
+    def samples(self):
+        if self._shared is not None:
+            with self._shared.get_lock():
+                values = self._shared[:]
+            if any(values):
+                with self._lock:
+                    self._values[()] = values
+        return super().samples()
+
+
+class Registry(object):
+    """Collection of :obj:`~pyjob.metrics.Metric` instances"""
+
+    def __init__(self):
+        """Instantiate a new :obj:`~pyjob.metrics.Registry`"""
+        self._metrics = {}
+
+    def __iter__(self):
+        return iter(self._metrics.values())
+
+    def register(self, metric):
+        """Add a metric
+
+        Raises
+        ------
+        :exc:`ValueError`
+           Duplicate metric name
+
+        """
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric name: {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def clear(self):
+        """Remove the values of all metrics"""
+        for metric in self:
+            metric.clear()
+
+    def exposition(self):
+        """All metrics in the OpenMetrics text format"""
+        return "\n".join([metric.exposition() for metric in self] + ["# EOF", ""])
+
+
+REGISTRY = Registry()
+
+CEXEC_DURATION = Histogram(
+    "pyjob_cexec_duration_seconds", "Duration of cexec calls", ("command",)
+)
+CEXEC_FAILURES = Counter("pyjob_cexec_failures", "Failed cexec calls", ("command",))
+SUBMISSION_DURATION = Histogram(
+    "pyjob_submission_duration_seconds", "Duration of Task.run", ("platform",)
+)
+SUBMISSIONS = Counter("pyjob_submissions", "Submitted tasks", ("platform",))
+POLL_DURATION = Histogram(
+    "pyjob_poll_duration_seconds", "Duration of task status polls", ("platform",)
+)
+TASK_DURATION = Histogram(
+    "pyjob_task_duration_seconds",
+    "Time from submission to completion observed by Task.wait",
+    ("platform",),
+)
+SCRIPTS_FINISHED = Counter(
+    "pyjob_scripts_finished",
+    "Scripts finished by outcome, observed by Task.wait",
+    ("platform", "outcome"),
+)
+LOCAL_SCRIPT_DURATION = SharedHistogram(
+    "pyjob_local_script_duration_seconds", "Run time of LocalTask scripts"
+)
+
+
+def write_textfile(path, registry=REGISTRY):
+    """Write all metrics atomically for the node exporter textfile collector
+
+    Parameters
+    ----------
+    path : str
+       The output file, should have the ``.prom`` extension
+    registry : :obj:`~pyjob.metrics.Registry`, optional
+
+    """
+    from pyjob.config import atomic_write
+
+    atomic_write(path, registry.exposition())
+
+
+def start_http_server(port, addr="", registry=REGISTRY):
+    """Serve all metrics over HTTP from a daemon thread
+
+    Parameters
+    ----------
+    port : int
+       The port to listen on, ``0`` to pick a free port
+    addr : str, optional
+       The address to bind to
+    registry : :obj:`~pyjob.metrics.Registry`, optional
+
+    Returns
+    -------
+    :obj:`~http.server.HTTPServer`
+       The running server, stop it with ``shutdown()``
+
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = registry.exposition().encode()
+            self.send_response(200)
+            self.send_header(
+                "Content-Type",
+                "application/openmetrics-text; version=1.0.0; charset=utf-8",
+            )
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((addr, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
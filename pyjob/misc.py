@@ -4,13 +4,14 @@ import tempfile
 import warnings
 from functools import wraps
 
-from chardet.universaldetector import UniversalDetector
 from pyjob.exception import PyJobError
 
 
 def decode(byte_s):
     """Decode a string by guessing the encoding
 
+    UTF-8 is tried first, the encoding is only guessed if that fails.
+
     Parameters
     ----------
     byte_s : bytes
@@ -27,6 +28,12 @@ def decode(byte_s):
        Unable to infer string encoding
 
     """
+    try:
+        return byte_s.decode("utf-8")
+    except UnicodeDecodeError:
+        pass
+    from chardet.universaldetector import UniversalDetector
+
     detector = UniversalDetector()
     for line in byte_s.splitlines():
         detector.feed(line)
@@ -1,3 +1,4 @@
+import json
 import logging
 import re
 import uuid
@@ -5,6 +6,7 @@ import uuid
 from pyjob.cexec import cexec
 from pyjob.exception import PyJobError, PyJobExecutableNotFoundError
 from pyjob.script import Script
+from pyjob.stopwatch import section
 from pyjob.task import ClusterTask
 
 logger = logging.getLogger(__name__)
@@ -12,12 +14,56 @@ logger = logging.getLogger(__name__)
 RE_LINE_SPLIT_1 = re.compile(r":\\s+")
 RE_LINE_SPLIT_2 = re.compile(r"\\s+=\\s+")
 
+PBS_FINISHED_STATES = frozenset(["C", "F"])
+
+
+def parse_qstat_json(stdout):
+    """Parse the output of ``qstat -f -F json``
+
+    Parameters
+    ----------
+    stdout : str
+       The standard output of ``qstat -f -F json``
+
+    Returns
+    -------
+    dict
+       The job information, empty if the job has finished
+
+    Raises
+    ------
+    :exc:`ValueError`
+       The output is not valid ``qstat`` JSON
+
+    """
+    if not stdout:
+        raise ValueError("No qstat output to parse")
+    try:
+        jobs = json.loads(stdout)["Jobs"]
+    except (KeyError, TypeError) as e:
+        raise ValueError("Invalid qstat JSON output") from e
+    for job_id, attributes in jobs.items():
+        if attributes.get("job_state") in PBS_FINISHED_STATES:
+            continue
+        data = {"Job Id": job_id}
+        for key, value in attributes.items():
+            # Match the dotted keys of the plain-text output, e.g. Resource_List.ncpus
+            if isinstance(value, dict):
+                for subkey, subvalue in value.items():
+                    data[f"{key}.{subkey}"] = str(subvalue)
+            else:
+                data[key] = str(value)
+        return data
+    return {}
+
 
 class PortableBatchSystemTask(ClusterTask):
     """PortableBatchSystem executable :obj:`~pyjob.task.Task`"""
 
     JOB_ARRAY_INDEX = "$PBS_ARRAYID"
     SCRIPT_DIRECTIVE = "#PBS"
+    KILL_COMMAND = ["qdel"]
+    STATE_CATEGORIES = {"H": "pending", "Q": "pending", "W": "pending"}
 
     @property
     def info(self):
@@ -25,6 +71,11 @@ class PortableBatchSystemTask(ClusterTask):
         if self.pid is None:
             return {}
         try:
+            data = self._query_structured_info(
+                ["qstat", "-f", "-F", "json", str(self.pid)], parse_qstat_json
+            )
+            if data is not None:
+                return data
             stdout = cexec(["qstat", "-f", str(self.pid)], permit_nonzero=True)
         except PyJobExecutableNotFoundError:
             return {}
@@ -65,6 +116,7 @@ class PortableBatchSystemTask(ClusterTask):
             self.runscript.path,
         )
 
+    @section("PortableBatchSystemTask._create_runscript")
     def _create_runscript(self):
         """Utility method to create runscript"""
         runscript = Script(
@@ -90,13 +142,25 @@ class PortableBatchSystemTask(ClusterTask):
         if self.shell:
             cmd = f"-S {self.shell}"
             runscript.append(self.__class__.SCRIPT_DIRECTIVE + " " + cmd)
-        if self.nprocesses:
+        if self.nprocesses and self.fanout_mode:
+            # Bundles are executed by a single process across the cores of one node
+            cmd = f"-l nodes=1:ppn={self.nprocesses}"
+            runscript.append(self.__class__.SCRIPT_DIRECTIVE + " " + cmd)
+        elif self.nprocesses:
             cmd = f"-n {self.nprocesses}"
             runscript.append(self.__class__.SCRIPT_DIRECTIVE + " " + cmd)
         if self.extra:
             cmd = " ".join(map(str, self.extra))
             runscript.append(self.__class__.SCRIPT_DIRECTIVE + " " + cmd)
-        if len(self.script) > 1:
+        if self.pilot_mode or self.fanout_mode:
+            logf = runscript.path.replace(".script", ".log")
+            nelements, lines = self.get_bundled_execution(runscript.path)
+            cmd = f"-t 1-{nelements}"
+            runscript.append(self.__class__.SCRIPT_DIRECTIVE + " " + cmd)
+            runscript.append(self.__class__.SCRIPT_DIRECTIVE + f" -o {logf}")
+            runscript.append(self.__class__.SCRIPT_DIRECTIVE + f" -e {logf}")
+            runscript.extend(lines)
+        elif len(self.script) > 1:
             logf = runscript.path.replace(".script", ".log")
             jobsf = runscript.path.replace(".script", ".jobs")
             with open(jobsf, "w") as f_out:
@@ -0,0 +1,177 @@
+import argparse
+import logging
+import os
+import socket
+import subprocess
+
+# Shell return codes of scripts that cannot be executed or cannot be found
+NOT_EXECUTABLE, NOT_FOUND = 126, 127
+
+logger = logging.getLogger(__name__)
+
+
+class FileWorkQueue(object):
+    """Work queue on a shared file system for pilot jobs
+
+    Every script is represented by a file in the ``pending`` directory. Workers claim
+    a script by renaming its file into the ``running`` directory, which is atomic
+    and thus needs no locking, and record its return code in the ``done`` directory.
+
+    Examples
+    --------
+
+    >>> from pyjob.pilot import FileWorkQueue
+    >>> queue = FileWorkQueue('/shared/pyjob.queue')
+    >>> queue.put(['/shared/job_1.sh', '/shared/job_2.sh'])
+    >>> for item, script in queue.claim():
+    ...     queue.complete(item, 0)
+
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+
+    def __init__(self, directory):
+        """Instantiate a new :obj:`~pyjob.pilot.FileWorkQueue`
+
+        Parameters
+        ----------
+        directory : str
+           The queue directory, needs to be accessible from all workers
+
+        """
+        self.directory = os.path.abspath(directory)
+        self._scripts = None
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}(directory={self.directory})"
+
+    @property
+    def jobs(self):
+        """The file listing all scripts on a per-line basis"""
+        return os.path.join(self.directory, "jobs")
+
+    @property
+    def scripts(self):
+        """The scripts in this queue"""
+        if self._scripts is None:
+            with open(self.jobs, "r") as f:
+                self._scripts = f.read().splitlines()
+        return self._scripts
+
+    def _path(self, state, item=""):
+        return os.path.join(self.directory, state, item)
+
+    def put(self, scripts):
+        """Fill the queue
+
+        Parameters
+        ----------
+        scripts : list, tuple
+           The script paths
+
+        """
+        for state in (self.PENDING, self.RUNNING, self.DONE):
+            os.makedirs(self._path(state), exist_ok=True)
+        with open(self.jobs, "w") as f:
+            f.write("\n".join(scripts))
+        for i in range(len(scripts)):
+            open(self._path(self.PENDING, f"{i:08d}"), "w").close()
+        self._scripts = list(scripts)
+
+    def claim(self):
+        """Claim pending scripts one at a time
+
+        Yields
+        ------
+        tuple
+           The queue item and the script path
+
+        """
+        for item in sorted(os.listdir(self._path(self.PENDING))):
+            try:
+                os.rename(
+                    self._path(self.PENDING, item), self._path(self.RUNNING, item)
+                )
+            except FileNotFoundError:
+                # Claimed by another worker
+                continue
+            yield item, self.scripts[int(item)]
+
+    def complete(self, item, returncode):
+        """Mark a claimed queue item as done
+
+        Parameters
+        ----------
+        item : str
+           The queue item
+        returncode : int
+           The return code of the script
+
+        """
+        with open(self._path(self.DONE, item), "w") as f:
+            f.write(str(returncode))
+        os.remove(self._path(self.RUNNING, item))
+
+    @property
+    def npending(self):
+        """Number of scripts not yet claimed"""
+        return len(os.listdir(self._path(self.PENDING)))
+
+    @property
+    def returncodes(self):
+        """The return codes of all completed scripts"""
+        returncodes = {}
+        for item in os.listdir(self._path(self.DONE)):
+            with open(self._path(self.DONE, item), "r") as f:
+                returncodes[self.scripts[int(item)]] = int(f.read())
+        return returncodes
+
+
+def run_worker(directory):
+    """Execute scripts from a :obj:`~pyjob.pilot.FileWorkQueue` until it is drained
+
+    Parameters
+    ----------
+    directory : str
+       The queue directory
+
+    Returns
+    -------
+    int
+       The number of scripts executed by this worker
+
+    """
+    queue = FileWorkQueue(directory)
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    count = 0
+    for item, script in queue.claim():
+        logger.debug("Worker %s running %s", worker, script)
+        log = os.path.splitext(script)[0] + ".log"
+        with open(log, "w") as f:
+            try:
+                returncode = subprocess.call(
+                    [script], stdout=f, stderr=subprocess.STDOUT
+                )
+            except OSError as e:
+                # Completed regardless, so that the queue can still be drained
+                logger.error("Worker %s cannot execute %s: %s", worker, script, e)
+                f.write(f"{e}\n")
+                returncode = NOT_EXECUTABLE if os.path.exists(script) else NOT_FOUND
+        queue.complete(item, returncode)
+        count += 1
+    logger.debug("Worker %s finished after %d scripts", worker, count)
+    return count
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="pyjob.pilot", description="pyjob pilot worker")
+    p.add_argument("directory", help="the work queue directory")
+    args = p.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    run_worker(args.directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,54 @@
 import multiprocessing.pool
 import sys
 
-from pyjob import config
+from pyjob.config import get_settings
+from pyjob.exception import PyJobError
+
+#: Modules imported once by the forkserver, so that its workers start fast and small
+FORKSERVER_PRELOAD = ["pyjob.cexec", "pyjob.local", "pyjob.pool"]
+
+
+def get_context(start_method=None):
+    """Get the :mod:`multiprocessing` context of a start method
+
+    The forkserver is started on first use, with only :data:`FORKSERVER_PRELOAD`
+    imported instead of the modules of the calling program.
+
+    Parameters
+    ----------
+    start_method : str, optional
+       One of ``fork``, ``forkserver`` or ``spawn`` [default: platform default]
+
+    Returns
+    -------
+    :obj:`multiprocessing.context.BaseContext`
+
+    Raises
+    ------
+    :exc:`~pyjob.exception.PyJobError`
+       The start method is not available on this platform
+
+    """
+    try:
+        context = multiprocessing.get_context(start_method)
+    except ValueError as e:
+        raise PyJobError(f"Unsupported start method: {start_method}") from e
+    if context.get_start_method() == "forkserver":
+        warm_forkserver()
+    return context
+
+
+def warm_forkserver():
+    """Start the forkserver ahead of its first use
+
+    This has to be called before any large modules are loaded to benefit from
+    a small forkserver, and is a no-op once the forkserver is running.
+
+    """
+    import multiprocessing.forkserver
+
+    multiprocessing.forkserver.set_forkserver_preload(FORKSERVER_PRELOAD)
+    multiprocessing.forkserver.ensure_running()
 
 
 class Pool(multiprocessing.pool.Pool):
@@ -11,11 +58,15 @@ class Pool(multiprocessing.pool.Pool):
     --------
 
     >>> from pyjob import Pool
-    >>> with Pool(processes=2) as pool:
+    >>> with Pool(processes=2, start_method='forkserver') as pool:
     ...     pool.map(<func>, <iterable>)
 
     """
 
     def __init__(self, *args, **kwargs):
-        processes = kwargs.pop("processes") or config.get("processes") or None
+        settings = get_settings()
+        processes = kwargs.pop("processes") or settings.get("processes") or None
+        start_method = kwargs.pop("start_method", None) or settings.get("start_method")
+        if start_method is not None:
+            kwargs.setdefault("context", get_context(start_method))
         super(Pool, self).__init__(processes=processes, *args, **kwargs)
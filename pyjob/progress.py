@@ -0,0 +1,150 @@
+import json
+import sys
+import time
+
+from pyjob.config import atomic_write
+
+
+class Progress(object):
+    """Snapshot of the progress of a :obj:`~pyjob.task.Task`
+
+    Examples
+    --------
+
+    >>> from pyjob.progress import Progress
+    >>> progress = Progress(total=10, done=4, running=2, started=time.monotonic() - 8)
+    >>> progress.throughput
+    0.5
+    >>> progress.eta
+    12.0
+
+    """
+
+    def __init__(self, total, pending=0, running=0, done=0, failed=0, started=None):
+        """Instantiate a new :obj:`~pyjob.progress.Progress`
+
+        Parameters
+        ----------
+        total : int
+           The total number of scripts
+        pending : int, optional
+           The number of scripts waiting for execution
+        running : int, optional
+           The number of scripts in execution
+        done : int, optional
+           The number of successfully completed scripts
+        failed : int, optional
+           The number of failed scripts
+        started : float, optional
+           The :func:`time.monotonic` time at which execution started
+
+        """
+        self.total = total
+        self.pending = pending
+        self.running = running
+        self.done = done
+        self.failed = failed
+        self.started = started
+        self.timestamp = time.monotonic()
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__qualname__}(total={self.total} pending={self.pending} "
+            f"running={self.running} done={self.done} failed={self.failed})"
+        )
+
+    def __str__(self):
+        eta = self.eta
+        return (
+            f"{self.finished}/{self.total} finished ({self.percent:.1f}%), "
+            f"{self.running} running, {self.pending} pending, {self.failed} failed, "
+            f"{self.throughput:.2f} scripts/s, "
+            f"ETA {'unknown' if eta is None else f'{eta:.0f}s'}"
+        )
+
+    @property
+    def elapsed(self):
+        """Time since the start of execution in seconds"""
+        if self.started is None:
+            return 0.0
+        return self.timestamp - self.started
+
+    @property
+    def finished(self):
+        """Number of completed scripts, successful or not"""
+        return self.done + self.failed
+
+    @property
+    def percent(self):
+        """Percentage of completed scripts"""
+        if self.total < 1:
+            return 100.0
+        return 100.0 * self.finished / self.total
+
+    @property
+    def throughput(self):
+        """Number of completed scripts per second"""
+        if self.elapsed <= 0:
+            return 0.0
+        return self.finished / self.elapsed
+
+    @property
+    def eta(self):
+        """Estimated time to completion in seconds, ``None`` if unknown"""
+        remaining = self.total - self.finished
+        if remaining <= 0:
+            return 0.0
+        if self.throughput <= 0:
+            return None
+        return remaining / self.throughput
+
+    def as_dict(self):
+        """The progress as :obj:`dict`"""
+        return {
+            "total": self.total,
+            "pending": self.pending,
+            "running": self.running,
+            "done": self.done,
+            "failed": self.failed,
+            "elapsed": self.elapsed,
+            "throughput": self.throughput,
+            "eta": self.eta,
+        }
+
+
+class ProgressMonitor(object):
+    """Built-in ``monitor_f`` for :meth:`~pyjob.task.Task.wait` reporting progress
+
+    Examples
+    --------
+
+    >>> from pyjob.progress import ProgressMonitor
+    >>> task.wait(monitor_f=ProgressMonitor(task, path='progress.json'))
+
+    """
+
+    def __init__(self, task, stream=sys.stderr, path=None):
+        """Instantiate a new :obj:`~pyjob.progress.ProgressMonitor`
+
+        Parameters
+        ----------
+        task : :obj:`~pyjob.task.Task`
+           The task to monitor
+        stream : file, optional
+           The stream to print progress to, ``None`` to disable printing
+        path : str, optional
+           A JSON file to export the latest progress to
+
+        """
+        self.task = task
+        self.stream = stream
+        self.path = path
+        self.__name__ = self.__class__.__qualname__
+
+    def __call__(self):
+        progress = self.task.progress
+        if self.stream is not None:
+            print(f"{self.task}: {progress}", file=self.stream, flush=True)
+        if self.path is not None:
+            atomic_write(self.path, json.dumps(progress.as_dict()))
+        return progress
@@ -4,7 +4,7 @@ import sys
 
 from pyjob.cexec import is_exe
 from pyjob.exception import PyJobError
-from pyjob.pool import Pool
+from pyjob.stopwatch import section
 
 
 @enum.unique
@@ -101,6 +101,7 @@ class ScriptCollector(object):
         """
         self._save_script(scripts)
 
+    @section("ScriptCollector.dump")
     def dump(self):
         """Write all scripts to disk if not already done"""
         for script in self._container:
@@ -330,6 +331,8 @@ class LocalScriptCreator(object):
 
     @property
     def collector(self):
+        from pyjob.pool import Pool
+
         script_collector = ScriptCollector(None)
         with Pool(processes=self.processes) as pool:
             script_collector.add(pool.map(self, self.iterable))
@@ -2,16 +2,65 @@ import logging
 import re
 import uuid
 from enum import Enum
+from xml.etree import ElementTree
 
 from pyjob.cexec import cexec
 from pyjob.exception import PyJobError, PyJobExecutableNotFoundError
 from pyjob.script import Script
+from pyjob.stopwatch import section
 from pyjob.task import ClusterTask
 
 logger = logging.getLogger(__name__)
 
 RE_LINE_SPLIT = re.compile(r":\s+")
 RE_PID_MATCH = re.compile(r"Your job.*has been submitted")
+XML_CHUNK_SIZE = 65536
+
+# Parallel environment of fan-out bundles, conventionally allocating slots on one host
+FANOUT_ENVIRONMENT = "smp"
+
+
+def parse_qstat_xml(stdout):
+    """Parse the output of ``qstat -xml -j``
+
+    The document is consumed incrementally and processed elements are discarded,
+    which keeps memory usage flat for large array jobs.
+
+    Parameters
+    ----------
+    stdout : str
+       The standard output of ``qstat -xml -j``
+
+    Returns
+    -------
+    dict
+       The job information, empty if the job does not exist
+
+    Raises
+    ------
+    :exc:`ValueError`
+       The output is not valid ``qstat`` XML
+
+    """
+    if not stdout or not stdout.lstrip().startswith("<"):
+        raise ValueError("No qstat XML output to parse")
+    parser = ElementTree.XMLPullParser(events=("start", "end"))
+    data = {}
+    try:
+        for i in range(0, len(stdout), XML_CHUNK_SIZE):
+            parser.feed(stdout[i : i + XML_CHUNK_SIZE])
+            for event, elem in parser.read_events():
+                if event == "start":
+                    if elem.tag == "unknown_jobs":
+                        return {}
+                elif elem.tag.startswith("JB_") and len(elem) == 0:
+                    data.setdefault(elem.tag[3:], (elem.text or "").strip())
+                elif elem.tag == "element":
+                    elem.clear()
+        parser.close()
+    except ElementTree.ParseError as e:
+        raise ValueError("Invalid qstat XML output") from e
+    return data
 
 
 class SGEConfigParameter(Enum):
@@ -24,6 +73,7 @@ class SunGridEngineTask(ClusterTask):
 
     JOB_ARRAY_INDEX = "$SGE_TASK_ID"
     SCRIPT_DIRECTIVE = "#$"
+    KILL_COMMAND = ["qdel"]
     _sge_avail_configs_by_env = {}
 
     @property
@@ -32,6 +82,11 @@ class SunGridEngineTask(ClusterTask):
         if self.pid is None:
             return {}
         try:
+            data = self._query_structured_info(
+                ["qstat", "-xml", "-j", str(self.pid)], parse_qstat_xml
+            )
+            if data is not None:
+                return data
             stdout = cexec(["qstat", "-j", str(self.pid)], permit_nonzero=True)
         except PyJobExecutableNotFoundError:
             return {}
@@ -86,7 +141,7 @@ class SunGridEngineTask(ClusterTask):
             if len(line) > 1:
                 break
             else:
-                config.append(line[0].encode("utf-8"))
+                config.append(line[0])
 
         cls._sge_avail_configs_by_env[param] = set(config)
         return cls._sge_avail_configs_by_env[param]
@@ -136,6 +191,7 @@ class SunGridEngineTask(ClusterTask):
             self.runscript.path,
         )
 
+    @section("SunGridEngineTask._create_runscript")
     def _create_runscript(self):
         """Utility method to create runscript"""
         runscript = Script(
@@ -163,7 +219,13 @@ class SunGridEngineTask(ClusterTask):
         if self.shell:
             cmd = f"-S {self.shell}"
             runscript.append(self.__class__.SCRIPT_DIRECTIVE + " " + cmd)
-        if self.nprocesses and self.environment:
+        if self.nprocesses and self.fanout_mode:
+            # Bundles are executed by a single process across the cores of one node,
+            # which needs a parallel environment allocating all slots on one host
+            environment = self.settings.get("environment") or FANOUT_ENVIRONMENT
+            cmd = f"-pe {environment} {self.nprocesses}"
+            runscript.append(self.__class__.SCRIPT_DIRECTIVE + " " + cmd)
+        elif self.nprocesses and self.environment:
             cmd = f"-pe {self.environment} {self.nprocesses}"
             runscript.append(self.__class__.SCRIPT_DIRECTIVE + " " + cmd)
         if self.directory:
@@ -172,7 +234,14 @@ class SunGridEngineTask(ClusterTask):
         if self.extra:
             cmd = " ".join(map(str, self.extra))
             runscript.append(self.__class__.SCRIPT_DIRECTIVE + " " + cmd)
-        if len(self.script) > 1:
+        if self.pilot_mode or self.fanout_mode:
+            logf = runscript.path.replace(".script", ".log")
+            nelements, lines = self.get_bundled_execution(runscript.path)
+            cmd = f"-t 1-{nelements}"
+            runscript.append(self.__class__.SCRIPT_DIRECTIVE + " " + cmd)
+            runscript.append(self.__class__.SCRIPT_DIRECTIVE + f" -o {logf}")
+            runscript.extend(lines)
+        elif len(self.script) > 1:
             logf = runscript.path.replace(".script", ".log")
             jobsf = runscript.path.replace(".script", ".jobs")
             with open(jobsf, "w") as f_out:
@@ -0,0 +1,421 @@
+import collections
+import concurrent.futures
+import itertools
+import logging
+import multiprocessing
+import os
+import subprocess
+import threading
+import time
+import uuid
+
+from pyjob.script import Script
+from pyjob.stopwatch import section
+from pyjob.task import ClusterTask
+
+logger = logging.getLogger(__name__)
+
+#: Job element states, named after their Slurm equivalents
+PENDING, RUNNING, COMPLETED, FAILED, CANCELLED = (
+    "PENDING",
+    "RUNNING",
+    "COMPLETED",
+    "FAILED",
+    "CANCELLED",
+)
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+class SimulatedJob(object):
+    """An array job in the :obj:`~pyjob.sim.SimulatedScheduler`"""
+
+    def __init__(
+        self,
+        job_id,
+        runscript,
+        nelements,
+        max_array_size,
+        dependency,
+        queue_delay,
+        directory,
+        log,
+    ):
+        self.job_id = job_id
+        self.runscript = runscript
+        self.max_array_size = max_array_size or nelements
+        self.dependency = [int(d) for d in dependency]
+        self.eligible_at = time.monotonic() + queue_delay
+        self.directory = directory
+        self.log = log
+        self.pending = collections.deque(range(1, nelements + 1))
+        self.processes = {}
+        self.states = collections.Counter({PENDING: nelements})
+        self.cancelled = False
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}(job_id={self.job_id})"
+
+    @property
+    def finished(self):
+        """All elements have reached a final state"""
+        return self.states[PENDING] == 0 and self.states[RUNNING] == 0
+
+    @property
+    def succeeded(self):
+        """All elements have completed successfully"""
+        return self.finished and self.states[FAILED] + self.states[CANCELLED] == 0
+
+
+class SimulatedScheduler(object):
+    """Local emulation of a batch scheduler for load testing
+
+    Array jobs are throttled to their ``max_array_size``, held until their
+    dependencies have completed successfully and their queue delay has passed, and
+    executed element by element on a pool of worker threads. Each element runs the
+    job's runscript with ``PYJOB_SIM_ARRAY_TASK_ID`` set to its index.
+
+    """
+
+    def __init__(self, workers=None):
+        """Instantiate a new :obj:`~pyjob.sim.SimulatedScheduler`
+
+        Parameters
+        ----------
+        workers : int, optional
+           The number of concurrent job elements [default: number of CPUs]
+
+        """
+        self.workers = workers or multiprocessing.cpu_count()
+        self._condition = threading.Condition()
+        self._jobs = {}
+        self._queue = []
+        self._nrunning = 0
+        self._ids = itertools.count(1)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="pyjob-sim"
+        )
+        self._dispatcher = threading.Thread(
+            target=self._dispatch, name="pyjob-sim-dispatcher", daemon=True
+        )
+        self._dispatcher.start()
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}(workers={self.workers})"
+
+    def submit(
+        self,
+        runscript,
+        nelements=1,
+        max_array_size=None,
+        dependency=(),
+        queue_delay=0.0,
+        directory=None,
+        log=None,
+    ):
+        """Submit an array job
+
+        Parameters
+        ----------
+        runscript : str
+           The executable run for every element
+        nelements : int, optional
+           The number of array elements
+        max_array_size : int, optional
+           The maximum number of concurrently running elements
+        dependency : list, tuple, optional
+           The job identifiers that need to complete successfully first
+        queue_delay : float, optional
+           The minimum time in seconds the job spends pending
+        directory : str, optional
+           The working directory of the elements
+        log : str, optional
+           The file collecting the output of all elements
+
+        Returns
+        -------
+        int
+           The job identifier
+
+        """
+        with self._condition:
+            job = SimulatedJob(
+                next(self._ids),
+                runscript,
+                nelements,
+                max_array_size,
+                dependency,
+                queue_delay,
+                directory,
+                log or os.devnull,
+            )
+            self._jobs[job.job_id] = job
+            self._queue.append(job)
+            self._condition.notify_all()
+        logger.debug(
+            "Submitted simulated job %d with %d elements", job.job_id, nelements
+        )
+        return job.job_id
+
+    def states(self, job_id):
+        """The number of elements per state
+
+        Parameters
+        ----------
+        job_id : int
+           The job identifier
+
+        Returns
+        -------
+        dict
+           The element counts, empty for unknown jobs
+
+        """
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return {}
+            return {state: count for state, count in job.states.items() if count}
+
+    def cancel(self, job_id):
+        """Cancel the pending and running elements of a job
+
+        Parameters
+        ----------
+        job_id : int
+           The job identifier
+
+        """
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return
+            job.cancelled = True
+            job.states[CANCELLED] += len(job.pending)
+            job.states[PENDING] = 0
+            job.pending.clear()
+            for process in job.processes.values():
+                process.terminate()
+            self._condition.notify_all()
+
+    def _dependency_state(self, job):
+        """``None`` while dependencies are unfinished, else whether all succeeded"""
+        for job_id in job.dependency:
+            dependency = self._jobs.get(job_id)
+            if dependency is None:
+                continue
+            if not dependency.finished:
+                return None
+            if not dependency.succeeded:
+                return False
+        return True
+
+    def _dispatch(self):
+        """Start eligible elements whenever a worker is free"""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                timeout = None
+                for job in list(self._queue):
+                    if self._nrunning >= self.workers:
+                        # Woken up again by the next finishing element
+                        break
+                    if not job.pending:
+                        self._queue.remove(job)
+                        continue
+                    if job.eligible_at > now:
+                        delay = job.eligible_at - now
+                        timeout = delay if timeout is None else min(timeout, delay)
+                        continue
+                    dependency_state = self._dependency_state(job)
+                    if dependency_state is None:
+                        continue
+                    if dependency_state is False:
+                        # Equivalent to Slurm's --kill-on-invalid-dep
+                        job.states[CANCELLED] += len(job.pending)
+                        job.states[PENDING] = 0
+                        job.pending.clear()
+                        self._queue.remove(job)
+                        self._condition.notify_all()
+                        continue
+                    while (
+                        job.pending
+                        and job.states[RUNNING] < job.max_array_size
+                        and self._nrunning < self.workers
+                    ):
+                        index = job.pending.popleft()
+                        job.states[PENDING] -= 1
+                        job.states[RUNNING] += 1
+                        self._nrunning += 1
+                        self._executor.submit(self._execute, job, index)
+                self._condition.wait(timeout)
+
+    def _execute(self, job, index):
+        """Run a single job element"""
+        env = dict(
+            os.environ,
+            PYJOB_SIM_JOB_ID=str(job.job_id),
+            PYJOB_SIM_ARRAY_TASK_ID=str(index),
+        )
+        returncode = -1
+        try:
+            with open(job.log, "a") as f:
+                with self._condition:
+                    # Cancellation may have happened since the dispatch
+                    if not job.cancelled:
+                        job.processes[index] = subprocess.Popen(
+                            [job.runscript],
+                            cwd=job.directory,
+                            env=env,
+                            stdout=f,
+                            stderr=subprocess.STDOUT,
+                        )
+                if index in job.processes:
+                    returncode = job.processes[index].wait()
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.debug("Simulated job %d element %d failed: %s", job.job_id, index, e)
+        with self._condition:
+            job.processes.pop(index, None)
+            job.states[RUNNING] -= 1
+            if job.cancelled:
+                job.states[CANCELLED] += 1
+            elif returncode == 0:
+                job.states[COMPLETED] += 1
+            else:
+                job.states[FAILED] += 1
+            self._nrunning -= 1
+            self._condition.notify_all()
+
+
+def get_scheduler():
+    """The process-wide :obj:`~pyjob.sim.SimulatedScheduler`"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = SimulatedScheduler()
+        return _scheduler
+
+
+class SimulatedTask(ClusterTask):
+    """Simulated :obj:`~pyjob.task.ClusterTask` executed by a local scheduler
+
+    Examples
+    --------
+
+    >>> from pyjob import TaskFactory
+    >>> with TaskFactory('sim', scripts, max_array_size=10, queue_delay=5) as task:
+    ...     task.run()
+
+    """
+
+    JOB_ARRAY_INDEX = "$PYJOB_SIM_ARRAY_TASK_ID"
+    SCRIPT_DIRECTIVE = "#SIM"
+    STATE_CATEGORIES = {
+        PENDING: "pending",
+        RUNNING: "running",
+        COMPLETED: "done",
+        FAILED: "failed",
+        CANCELLED: "failed",
+    }
+
+    def __init__(self, *args, **kwargs):
+        """Instantiate a new :obj:`~pyjob.sim.SimulatedTask`
+
+        Parameters
+        ----------
+        queue_delay : float, optional
+           The minimum time in seconds the job spends pending
+        scheduler : :obj:`~pyjob.sim.SimulatedScheduler`, optional
+           The scheduler to submit to [default: :func:`~pyjob.sim.get_scheduler`]
+
+        """
+        super().__init__(*args, **kwargs)
+        self.queue_delay = kwargs.get("queue_delay", 0.0)
+        self.scheduler = kwargs.get("scheduler") or get_scheduler()
+        self._nelements = 1
+
+    @property
+    def info(self):
+        """:obj:`~pyjob.sim.SimulatedTask` information"""
+        if self.pid is None:
+            return {}
+        states = self.scheduler.states(self.pid)
+        active = {k: v for k, v in states.items() if k in (PENDING, RUNNING)}
+        if not active:
+            return {}
+        return {
+            "job_number": self.pid,
+            "status": max(active, key=active.get),
+            "states": states,
+        }
+
+    def _progress_counts(self):
+        """Count pending, running, done and failed scripts from the element states"""
+        if self.pid is None or self.pilot_mode or self.fanout_mode:
+            return super()._progress_counts()
+        counts = collections.Counter()
+        for state, count in self.scheduler.states(self.pid).items():
+            counts[self.STATE_CATEGORIES[state]] += count
+        return dict(counts)
+
+    def kill(self):
+        """Immediately terminate the :obj:`~pyjob.sim.SimulatedTask`"""
+        if self.pid is None:
+            return
+        self.scheduler.cancel(self.pid)
+        logger.debug("Terminated task: %d", self.pid)
+
+    def _check_requirements(self):
+        """Check if the requirements for task execution are met"""
+
+    def _run(self):
+        """Method to initialise :obj:`~pyjob.sim.SimulatedTask` execution"""
+        self.runscript = self._create_runscript()
+        self.runscript.write()
+        self.pid = self.scheduler.submit(
+            self.runscript.path,
+            nelements=self._nelements,
+            max_array_size=self.max_array_size,
+            dependency=self.dependency,
+            queue_delay=self.queue_delay,
+            directory=self.directory,
+            log=self.runscript.path.replace(".script", ".log"),
+        )
+        logger.debug(
+            "%s [%d] submission script is %s",
+            self.__class__.__qualname__,
+            self.pid,
+            self.runscript.path,
+        )
+
+    @section("SimulatedTask._create_runscript")
+    def _create_runscript(self):
+        """Utility method to create runscript"""
+        runscript = Script(
+            directory=self.directory,
+            prefix="sim_",
+            suffix=".script",
+            stem=str(uuid.uuid1().int),
+        )
+        runscript.append(self.__class__.SCRIPT_DIRECTIVE + f" --job-name={self.name}")
+        if self.dependency:
+            cmd = f'--depend=afterok:{":".join(map(str, self.dependency))}'
+            runscript.append(self.__class__.SCRIPT_DIRECTIVE + " " + cmd)
+        if self.pilot_mode or self.fanout_mode:
+            self._nelements, lines = self.get_bundled_execution(runscript.path)
+            cmd = f"--array=1-{self._nelements}"
+            runscript.append(self.__class__.SCRIPT_DIRECTIVE + " " + cmd)
+            runscript.extend(lines)
+        elif len(self.script) > 1:
+            jobsf = runscript.path.replace(".script", ".jobs")
+            with open(jobsf, "w") as f_out:
+                f_out.write("\n".join(self.script))
+            self._nelements = len(self.script)
+            cmd = f"--array=1-{self._nelements}%{self.max_array_size}"
+            runscript.append(self.__class__.SCRIPT_DIRECTIVE + " " + cmd)
+            runscript.extend(self.get_array_bash_extension(jobsf, 0))
+        else:
+            self._nelements = 1
+            runscript.append(f"{self.script[0]} > {self.log[0]} 2>&1")
+        return runscript
@@ -1,19 +1,124 @@
+import json
 import logging
 import uuid
+from collections import Counter
 
 from pyjob.cexec import cexec
 from pyjob.exception import PyJobError, PyJobExecutableNotFoundError
 from pyjob.script import Script
+from pyjob.stopwatch import section
 from pyjob.task import ClusterTask
 
 logger = logging.getLogger(__name__)
 
+SLURM_FINISHED_STATES = frozenset(
+    [
+        "BOOT_FAIL",
+        "CANCELLED",
+        "COMPLETED",
+        "DEADLINE",
+        "FAILED",
+        "NODE_FAIL",
+        "OUT_OF_MEMORY",
+        "PREEMPTED",
+        "TIMEOUT",
+    ]
+)
+
+# Marker for unset numbers in Slurm output, e.g. the array index of a collapsed record
+SLURM_NO_VAL = 0xFFFFFFFE
+
+
+def count_array_tasks(job):
+    """Count the array elements represented by a ``squeue --json`` job record
+
+    Pending elements of an array job are collapsed into a single record, which
+    lists their indices in ``array_task_string``, e.g. ``"5-1000:5,1002%10"``.
+
+    Parameters
+    ----------
+    job : dict
+       A job record of ``squeue --json``
+
+    Returns
+    -------
+    int
+       The number of array elements, 1 for an element or a job without array
+
+    """
+    task_id = job.get("array_task_id")
+    # Slurm >= 23.02 wraps numbers into {"set": ..., "infinite": ..., "number": ...}
+    if isinstance(task_id, dict):
+        task_id = task_id.get("number") if task_id.get("set") else None
+    if task_id is not None and task_id < SLURM_NO_VAL:
+        return 1
+    task_string = job.get("array_task_string")
+    if not task_string:
+        return 1
+    count = 0
+    # The throttle only limits the number of simultaneously running elements
+    for part in task_string.split("%")[0].split(","):
+        indices, _, step = part.partition(":")
+        first, _, last = indices.partition("-")
+        if last:
+            count += (int(last) - int(first)) // int(step or 1) + 1
+        else:
+            count += 1
+    return count
+
+
+def parse_squeue_json(stdout):
+    """Parse the output of ``squeue --json``
+
+    Parameters
+    ----------
+    stdout : str
+       The standard output of ``squeue --json``
+
+    Returns
+    -------
+    dict
+       The job information, empty if all jobs have finished
+
+    Raises
+    ------
+    :exc:`ValueError`
+       The output is not valid ``squeue`` JSON
+
+    """
+    if not stdout:
+        raise ValueError("No squeue output to parse")
+    try:
+        jobs = json.loads(stdout)["jobs"]
+    except (KeyError, TypeError) as e:
+        raise ValueError("Invalid squeue JSON output") from e
+    states = Counter()
+    for job in jobs:
+        state = job.get("job_state", "UNKNOWN")
+        # Slurm >= 23.02 reports a list of state flags
+        if isinstance(state, list):
+            state = state[0] if state else "UNKNOWN"
+        states[state] += count_array_tasks(job)
+    active = {k: v for k, v in states.items() if k not in SLURM_FINISHED_STATES}
+    if not active:
+        return {}
+    return {"status": max(active, key=active.get), "states": dict(states)}
+
 
 class SlurmTask(ClusterTask):
     """Slurm executable :obj:`~pyjob.task.Task`"""
 
     JOB_ARRAY_INDEX = "$SLURM_ARRAY_TASK_ID"
     SCRIPT_DIRECTIVE = "#SBATCH"
+    KILL_COMMAND = ["scancel"]
+    STATE_CATEGORIES = {
+        "PENDING": "pending",
+        "REQUEUED": "pending",
+        "RUNNING": "running",
+        "COMPLETING": "running",
+        "COMPLETED": "done",
+        **{state: "failed" for state in SLURM_FINISHED_STATES - {"COMPLETED"}},
+    }
 
     @property
     def info(self):
@@ -21,6 +126,13 @@ class SlurmTask(ClusterTask):
         if self.pid is None:
             return {}
         try:
+            data = self._query_structured_info(
+                ["squeue", "--json", "-j", str(self.pid)], parse_squeue_json
+            )
+            if data:
+                data["job_number"] = self.pid
+            if data is not None:
+                return data
             cexec(["squeue", "-j", str(self.pid)])
         except (PyJobExecutableNotFoundError, Exception):
             return {}
@@ -51,6 +163,7 @@ class SlurmTask(ClusterTask):
             self.runscript.path,
         )
 
+    @section("SlurmTask._create_runscript")
     def _create_runscript(self):
         """Utility method to create runscript"""
         runscript = Script(
@@ -67,7 +180,11 @@ class SlurmTask(ClusterTask):
         if self.queue:
             cmd = f"-p {self.queue}"
             runscript.append(self.__class__.SCRIPT_DIRECTIVE + " " + cmd)
-        if self.nprocesses:
+        if self.nprocesses and self.fanout_mode:
+            # Bundles are executed by a single process across the cores of one node
+            cmd = f"-N 1 --ntasks=1 --cpus-per-task={self.nprocesses}"
+            runscript.append(self.__class__.SCRIPT_DIRECTIVE + " " + cmd)
+        elif self.nprocesses:
             cmd = f"-n {self.nprocesses}"
             runscript.append(self.__class__.SCRIPT_DIRECTIVE + " " + cmd)
         if self.directory:
@@ -79,7 +196,14 @@ class SlurmTask(ClusterTask):
         if self.extra:
             cmd = " ".join(map(str, self.extra))
             runscript.append(self.__class__.SCRIPT_DIRECTIVE + " " + cmd)
-        if len(self.script) > 1:
+        if self.pilot_mode or self.fanout_mode:
+            logf = runscript.path.replace(".script", ".log")
+            nelements, lines = self.get_bundled_execution(runscript.path)
+            cmd = f"--array=1-{nelements}"
+            runscript.append(self.__class__.SCRIPT_DIRECTIVE + " " + cmd)
+            runscript.append(self.__class__.SCRIPT_DIRECTIVE + f" -o {logf}")
+            runscript.extend(lines)
+        elif len(self.script) > 1:
             logf = runscript.path.replace(".script", ".log")
             jobsf = runscript.path.replace(".script", ".jobs")
             with open(jobsf, "w") as f_out:
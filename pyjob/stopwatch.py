@@ -1,9 +1,74 @@
+import array
+import contextlib
 import datetime
 import logging
+import math
+import threading
 import time
 
 logger = logging.getLogger(__name__)
 
+NS_PER_SECOND = 1e9
+
+
+def percentile(values, q):
+    """Percentile of sorted values with linear interpolation
+
+    Parameters
+    ----------
+    values : list, tuple, :obj:`array.array`
+       The values in ascending order
+    q : float
+       The percentile between 0 and 100
+
+    Returns
+    -------
+    float
+
+    """
+    if len(values) < 1:
+        return 0.0
+    k = (len(values) - 1) * q / 100.0
+    f = math.floor(k)
+    c = min(f + 1, len(values) - 1)
+    return values[f] + (values[c] - values[f]) * (k - f)
+
+
+def summarize(durations):
+    """Summary statistics of durations in nanoseconds
+
+    Parameters
+    ----------
+    durations : list, tuple, :obj:`array.array`
+       The durations in nanoseconds
+
+    Returns
+    -------
+    dict
+       The count and the mean, standard deviation, minimum, median, 90th
+       percentile, 99th percentile and maximum in seconds
+
+    """
+    n = len(durations)
+    if n < 1:
+        logger.critical("No laps taken!")
+        return dict.fromkeys(
+            ("n", "mean", "stddev", "min", "p50", "p90", "p99", "max"), 0
+        )
+    ordered = sorted(durations)
+    mean = sum(ordered) / n
+    variance = sum((d - mean) ** 2 for d in ordered) / n
+    return {
+        "n": n,
+        "mean": mean / NS_PER_SECOND,
+        "stddev": math.sqrt(variance) / NS_PER_SECOND,
+        "min": ordered[0] / NS_PER_SECOND,
+        "p50": percentile(ordered, 50) / NS_PER_SECOND,
+        "p90": percentile(ordered, 90) / NS_PER_SECOND,
+        "p99": percentile(ordered, 99) / NS_PER_SECOND,
+        "max": ordered[-1] / NS_PER_SECOND,
+    }
+
 
 class Time(object):
     """Generic time class"""
@@ -43,30 +108,55 @@ class Lap(Time):
 
 
 class Interval(Time):
-    """Interval time"""
+    """Interval time
+
+    Lap times are stored as cumulative offsets from the interval start in a
+    compact :obj:`array.array`, so taking a lap is a constant-time operation.
+
+    """
 
     def __init__(self, index):
         """Instantiate a new :obj:`~pyjob.stopwatch.Interval`"""
         super().__init__(index)
 
-        self._laps = []
+        self._start_ns = 0
+        self._end_ns = 0
+        self._offsets = array.array("q")
         self._locked = False
         self._running = False
 
-        self._ilap = 0
-
     def __getitem__(self, id):
-        """Slice the intervals"""
-        return self._laps[id]
+        """Slice the laps"""
+        if isinstance(id, slice):
+            return [self._get_lap(i) for i in range(*id.indices(self.nlaps))]
+        if id < 0:
+            id += self.nlaps
+        if not 0 <= id < self.nlaps:
+            raise IndexError("lap index out of range")
+        return self._get_lap(id)
+
+    def _get_lap(self, i):
+        lap = Lap(i + 1)
+        start = self._offsets[i - 1] if i > 0 else 0
+        lap._start_time = (self._start_ns + start) / NS_PER_SECOND
+        lap._end_time = (self._start_ns + self._offsets[i]) / NS_PER_SECOND
+        return lap
 
     @property
     def average(self):
-        """The average lap time in ms"""
-        if len(self._laps) < 1:
+        """The average lap time in seconds"""
+        if self.nlaps < 1:
             logger.critical("No laps taken!")
             return 0.0
-        lap_times = [lap.time for lap in self._laps]
-        return sum(lap_times) / float(len(lap_times))
+        return self._offsets[-1] / self.nlaps / NS_PER_SECOND
+
+    @property
+    def durations(self):
+        """The lap times in nanoseconds"""
+        durations = array.array("q", self._offsets)
+        for i in range(len(durations) - 1, 0, -1):
+            durations[i] -= durations[i - 1]
+        return durations
 
     @property
     def lap(self):
@@ -78,31 +168,30 @@ class Interval(Time):
             logger.critical("Cannot add a lap, interval not running!")
             return
 
-        self._ilap += 1
-        lap = Lap(self._ilap)
-        lap._start_time = self._start_time + sum([l.time for l in self._laps])
-        lap._end_time = time.time()
-        self._laps += [lap]
-
-        return lap
+        self._offsets.append(time.perf_counter_ns() - self._start_ns)
+        return self._get_lap(self.nlaps - 1)
 
     @property
     def laps(self):
         """The laps"""
-        return self._laps
+        return self[:]
 
     @property
     def nlaps(self):
         """Number of laps"""
-        return len(self._laps)
+        return len(self._offsets)
 
     @property
     def time(self):
-        """Total runtime"""
+        """Total runtime in seconds"""
         if self._running:
-            return int(round(time.time() - self._start_time))
+            return (time.perf_counter_ns() - self._start_ns) / NS_PER_SECOND
         else:
-            return int(round(self._end_time - self._start_time))
+            return (self._end_ns - self._start_ns) / NS_PER_SECOND
+
+    def summary(self):
+        """Summary statistics of the lap times, see :func:`~pyjob.stopwatch.summarize`"""
+        return summarize(self.durations)
 
     def start(self):
         """Start the interval"""
@@ -112,14 +201,14 @@ class Interval(Time):
             logger.warning("Interval is locked ...")
         else:
             logger.debug("Starting new interval ...")
-            self._start_time = time.time()
+            self._start_ns = time.perf_counter_ns()
             self._running = True
 
     def stop(self):
         """Stop the interval"""
         if self._running:
             logger.debug("Stopping interval ...")
-            self._end_time = time.time()
+            self._end_ns = time.perf_counter_ns()
             self._running = False
             self._locked = True
         else:
@@ -189,6 +278,20 @@ class StopWatch(Time):
         """Time in seconds"""
         return sum([interval.time for interval in self._intervals])
 
+    def summary(self):
+        """Summary statistics of the lap times of all intervals
+
+        Returns
+        -------
+        dict
+           See :func:`~pyjob.stopwatch.summarize`
+
+        """
+        durations = array.array("q")
+        for interval in self._intervals:
+            durations.extend(interval.durations)
+        return summarize(durations)
+
     def reset(self):
         """Reset the timer"""
         self._intervals = []
@@ -199,12 +302,12 @@ class StopWatch(Time):
         """Start the interval"""
         if len(self._intervals) > 0 and self._intervals[-1]._running:
             logger.warning("Stopwatch already running!")
-        else:
-            logger.debug("Starting stopwatch ...")
-            self._iinterval += 1
-            interval = Interval(self._iinterval)
-            interval.start()
-            self._intervals += [interval]
+            return self._intervals[-1]
+        logger.debug("Starting stopwatch ...")
+        self._iinterval += 1
+        interval = Interval(self._iinterval)
+        interval.start()
+        self._intervals += [interval]
         return interval
 
     def stop(self):
@@ -215,3 +318,243 @@ class StopWatch(Time):
         else:
             logger.warning("Stopwatch not running!")
         return self._intervals[-1]
+
+
+class Section(contextlib.ContextDecorator):
+    """Named timing section of a :obj:`~pyjob.stopwatch.Profiler`
+
+    Sections are usable as context manager or decorator and may be nested or
+    entered concurrently from several threads.
+
+    """
+
+    def __init__(self, profiler, name):
+        """Instantiate a new :obj:`~pyjob.stopwatch.Section`
+
+        Parameters
+        ----------
+        profiler : :obj:`~pyjob.stopwatch.Profiler`
+           The profiler to record the time in
+        name : str
+           The section name
+
+        """
+        self.profiler = profiler
+        self.name = name
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}(name={self.name})"
+
+    def __enter__(self):
+        if self.profiler.enabled:
+            self.profiler._stack.append((self, time.perf_counter_ns()))
+        return self
+
+    def __exit__(self, *exc):
+        stack = self.profiler._stack
+        if stack and stack[-1][0] is self:
+            start = stack[-1][1]
+            self.profiler._record(
+                tuple(section.name for section, _ in stack),
+                time.perf_counter_ns() - start,
+            )
+            stack.pop()
+
+
+class Profiler(object):
+    """Aggregated timings of named, nestable sections
+
+    Every distinct stack of section names accumulates its call count and total,
+    minimum and maximum time in nanoseconds. Timings of other processes are
+    combined with :meth:`merge`, e.g. after :meth:`save` in each worker.
+
+    Examples
+    --------
+
+    >>> from pyjob.stopwatch import PROFILER, section
+    >>> PROFILER.enabled = True
+    >>> @section('outer')
+    ... def outer():
+    ...     with section('inner'):
+    ...         pass
+    >>> outer()
+    >>> print(PROFILER.folded())
+
+    """
+
+    def __init__(self, enabled=False):
+        """Instantiate a new :obj:`~pyjob.stopwatch.Profiler`
+
+        Parameters
+        ----------
+        enabled : bool, optional
+           Record the time spent in sections
+
+        """
+        self.enabled = enabled
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}(enabled={self.enabled} stacks={len(self._stats)})"
+
+    @property
+    def _stack(self):
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+    def _record(self, stack, elapsed):
+        with self._lock:
+            stats = self._stats.get(stack)
+            if stats is None:
+                self._stats[stack] = [1, elapsed, elapsed, elapsed]
+            else:
+                stats[0] += 1
+                stats[1] += elapsed
+                stats[2] = min(stats[2], elapsed)
+                stats[3] = max(stats[3], elapsed)
+
+    def section(self, name):
+        """Create a named timing section
+
+        Parameters
+        ----------
+        name : str
+           The section name
+
+        Returns
+        -------
+        :obj:`~pyjob.stopwatch.Section`
+
+        """
+        return Section(self, name)
+
+    def reset(self):
+        """Discard all timings"""
+        with self._lock:
+            self._stats = {}
+
+    def stats(self):
+        """Snapshot of the timings per stack of section names
+
+        Returns
+        -------
+        dict
+           The call count, total, minimum and maximum time in nanoseconds
+           keyed by the ``;``-separated stack
+
+        """
+        with self._lock:
+            return {
+                ";".join(stack): list(stats) for stack, stats in self._stats.items()
+            }
+
+    def merge(self, stats):
+        """Add the timings of another profiler
+
+        Parameters
+        ----------
+        stats : dict
+           The timings as returned by :meth:`stats`
+
+        """
+        with self._lock:
+            for key, (count, total, minimum, maximum) in stats.items():
+                stack = tuple(key.split(";"))
+                current = self._stats.get(stack)
+                if current is None:
+                    self._stats[stack] = [count, total, minimum, maximum]
+                else:
+                    current[0] += count
+                    current[1] += total
+                    current[2] = min(current[2], minimum)
+                    current[3] = max(current[3], maximum)
+
+    def save(self, path):
+        """Write the timings to a JSON file
+
+        Parameters
+        ----------
+        path : str
+           The output file, e.g. one per process
+
+        """
+        import json
+
+        from pyjob.config import atomic_write
+
+        atomic_write(path, json.dumps(self.stats()))
+
+    def load(self, *paths):
+        """Merge the timings from JSON files written by :meth:`save`"""
+        import json
+
+        for path in paths:
+            with open(path, "r") as f:
+                self.merge(json.load(f))
+
+    def profile(self):
+        """Flat profile with the inclusive timings per section name
+
+        Returns
+        -------
+        list
+           A :obj:`dict` with the name, call count and total, mean, minimum and
+           maximum time in seconds per section, ordered by decreasing total time
+
+        """
+        flat = {}
+        for stack, (count, total, minimum, maximum) in self.stats().items():
+            name = stack.rsplit(";", 1)[-1]
+            if name not in flat:
+                flat[name] = [0, 0, minimum, maximum]
+            stats = flat[name]
+            stats[0] += count
+            stats[1] += total
+            stats[2] = min(stats[2], minimum)
+            stats[3] = max(stats[3], maximum)
+        profile = [
+            {
+                "name": name,
+                "count": count,
+                "total": total / NS_PER_SECOND,
+                "mean": total / count / NS_PER_SECOND,
+                "min": minimum / NS_PER_SECOND,
+                "max": maximum / NS_PER_SECOND,
+            }
+            for name, (count, total, minimum, maximum) in flat.items()
+        ]
+        return sorted(profile, key=lambda entry: entry["total"], reverse=True)
+
+    def folded(self):
+        """Folded stacks with exclusive times in microseconds for flame graphs
+
+        Returns
+        -------
+        str
+           One ``outer;inner <time>`` line per stack, as read by ``flamegraph.pl``
+
+        """
+        stats = self.stats()
+        exclusive = {stack: values[1] for stack, values in stats.items()}
+        for stack, values in stats.items():
+            parent = stack.rpartition(";")[0]
+            if parent in exclusive:
+                exclusive[parent] -= values[1]
+        return "\n".join(
+            f"{stack} {max(elapsed, 0) // 1000}"
+            for stack, elapsed in sorted(exclusive.items())
+        )
+
+
+#: The default :obj:`~pyjob.stopwatch.Profiler` used by the PyJob instrumentation
+PROFILER = Profiler()
+
+
+def section(name):
+    """Create a named timing section of the default :obj:`~pyjob.stopwatch.Profiler`"""
+    return PROFILER.section(name)
@@ -0,0 +1,148 @@
+import concurrent.futures
+import copy
+import logging
+from collections import OrderedDict
+
+from pyjob.script import ScriptCollector
+from pyjob.task import ClusterTask
+
+logger = logging.getLogger(__name__)
+
+#: The :obj:`~pyjob.task.ClusterTask` attributes that need to be identical for tasks
+#: to be combined into a single array job
+SUBMISSION_ATTRIBUTES = (
+    "bundle_size",
+    "dependency",
+    "directory",
+    "environment",
+    "extra",
+    "fanout",
+    "name",
+    "nprocesses",
+    "pilots",
+    "priority",
+    "queue",
+    "runtime",
+    "shell",
+)
+
+
+def submission_key(task):
+    """Key to group :obj:`~pyjob.task.ClusterTask` instances with identical settings
+
+    Parameters
+    ----------
+    task : :obj:`~pyjob.task.Task`
+       The task to compute the key for
+
+    Returns
+    -------
+    tuple
+       A hashable key, or ``None`` if the task cannot be combined with others
+
+    """
+    if not isinstance(task, ClusterTask) or task.locked:
+        return None
+    values = []
+    for attr in SUBMISSION_ATTRIBUTES:
+        value = getattr(task, attr, None)
+        if isinstance(value, list):
+            value = tuple(value)
+        values.append(value)
+    return (task.__class__,) + tuple(values)
+
+
+def combine(tasks):
+    """Combine compatible :obj:`~pyjob.task.ClusterTask` instances into one
+
+    Parameters
+    ----------
+    tasks : list
+       Two or more :obj:`~pyjob.task.ClusterTask` instances with the same
+       :func:`~pyjob.submit.submission_key`
+
+    Returns
+    -------
+    :obj:`~pyjob.task.ClusterTask`
+       A new task holding the scripts of all `tasks`
+
+    """
+    combined = copy.copy(tasks[0])
+    combined.script_collector = ScriptCollector(
+        [script for task in tasks for script in task.script_collector]
+    )
+    combined.max_array_size = sum(task.max_array_size for task in tasks)
+    combined.locked = False
+    combined.pid = None
+    combined.runscript = None
+    return combined
+
+
+def _submit(tasks):
+    """Submit a group of compatible tasks with a single scheduler call"""
+    if len(tasks) == 1:
+        tasks[0].run()
+        return
+    combined = combine(tasks)
+    combined.run()
+    for task in tasks:
+        task.pid = combined.pid
+        task.runscript = combined.runscript
+        task.lock()
+    logger.debug("Submitted %d tasks as %s", len(tasks), combined)
+    # Detach the helper from the job, otherwise its deletion waits for completion
+    combined.pid = None
+    combined.runscript = None
+
+
+def submit_many(tasks, max_in_flight=8, combine_tasks=True):
+    """Submit many :obj:`~pyjob.task.Task` instances efficiently
+
+    :obj:`~pyjob.task.ClusterTask` instances of the same platform and with identical
+    scheduler settings are submitted as one array job, which replaces many calls to
+    ``sbatch``, ``qsub`` or ``bsub`` with one. The remaining submissions run
+    concurrently.
+
+    Examples
+    --------
+
+    >>> from pyjob import TaskFactory
+    >>> from pyjob.submit import submit_many
+    >>> tasks = [TaskFactory('slurm', script) for script in scripts]
+    >>> submit_many(tasks, max_in_flight=4)
+
+    Parameters
+    ----------
+    tasks : list, tuple
+       The :obj:`~pyjob.task.Task` instances to submit
+    max_in_flight : int, optional
+       The maximum number of concurrent submissions
+    combine_tasks : bool, optional
+       Combine compatible tasks into a single array job
+
+    Returns
+    -------
+    list
+       The submitted `tasks`
+
+    Raises
+    ------
+    :exc:`ValueError`
+       Invalid number of concurrent submissions
+
+    Warning
+    -------
+    Combined tasks share the job identifier of their array job, so
+    killing one of them cancels all tasks it was combined with.
+
+    """
+    if max_in_flight < 1:
+        raise ValueError("At least one concurrent submission required")
+    groups = OrderedDict()
+    for i, task in enumerate(tasks):
+        key = submission_key(task) if combine_tasks else None
+        groups.setdefault(key if key is not None else i, []).append(task)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        for future in [executor.submit(_submit, group) for group in groups.values()]:
+            future.result()
+    return list(tasks)
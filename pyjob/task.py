@@ -1,9 +1,15 @@
 import abc
+import concurrent.futures
 import logging
 import os
+import shutil
+import subprocess
+import sys
 import time
+from collections import Counter
 
-from pyjob import cexec, config
+from pyjob import cexec, metrics
+from pyjob.config import get_settings
 from pyjob.exception import (
     PyJobError,
     PyJobExecutableNotFoundError,
@@ -13,6 +19,9 @@ from pyjob.script import ScriptCollector
 
 logger = logging.getLogger(__name__)
 
+#: The maximum number of job identifiers passed to a single scheduler kill command
+KILL_CHUNK_SIZE = 500
+
 
 class Task(abc.ABC):
     """Abstract base class for executable tasks"""
@@ -28,15 +37,16 @@ class Task(abc.ABC):
         """
         self.pid = None
         self.locked = False
+        self.started = None
+        self._completion_recorded = False
         if isinstance(script, ScriptCollector):
             self.script_collector = script
         else:
             self.script_collector = ScriptCollector(script)
 
-        self.directory = os.path.abspath(
-            kwargs.get("directory") or config.get("directory") or "."
-        )
-        self.nprocesses = kwargs.get("processes") or config.get("processes") or 1
+        self.settings = get_settings().override(**kwargs)
+        self.directory = os.path.abspath(self.settings.get("directory") or ".")
+        self.nprocesses = self.settings.get("processes") or 1
 
     def __del__(self):
         """Exit function at instance deletion"""
@@ -96,6 +106,35 @@ class Task(abc.ABC):
         """Boolean to indicate :obj:`~pyjob.task.Task` completion"""
         return self.locked and not bool(self.info)
 
+    @property
+    def progress(self):
+        """The :obj:`~pyjob.progress.Progress` of this :obj:`~pyjob.task.Task`"""
+        from pyjob.progress import Progress
+
+        counts = self._progress_counts()
+        return Progress(total=self.njobs, started=self.started, **counts)
+
+    def _progress_counts(self):
+        """Count pending, running, done and failed scripts
+
+        Returns
+        -------
+        dict
+           The script counts by category
+
+        """
+        total = len(self.script)
+        if not self.locked:
+            return {"pending": total}
+        if self.info:
+            return {"running": total}
+        return {"done": total}
+
+    @property
+    def njobs(self):
+        """The number of jobs executed by this :obj:`~pyjob.task.Task`"""
+        return len(self.script_collector)
+
     @property
     def log(self):
         """The log file path"""
@@ -157,12 +196,19 @@ class Task(abc.ABC):
         """
         if self.locked:
             raise PyJobTaskLockedError("This task is locked!")
-        if len(self.script_collector) < 1:
+        if self.njobs < 1:
             raise PyJobError(
                 "One or more executable scripts required prior to execution"
             )
         self.script_collector.dump()
+        self.started = time.monotonic()
         self._run()
+        if metrics.ENABLED:
+            platform = self.__class__.__qualname__
+            metrics.SUBMISSIONS.inc(platform=platform)
+            metrics.SUBMISSION_DURATION.observe(
+                time.monotonic() - self.started, platform=platform
+            )
         logger.debug(
             "Started execution of %s [%d]", self.__class__.__qualname__, self.pid
         )
@@ -200,7 +246,7 @@ class Task(abc.ABC):
             msg = "Checking for %s %d success with function %s"
             logger.debug(msg, self.__class__.__qualname__, self.pid, success_f.__name__)
 
-        while not self.completed:
+        while not self._poll():
             if check_success:
                 for log in self.log:
                     if is_successful_run(log):
@@ -214,32 +260,69 @@ class Task(abc.ABC):
             callback()
             time.sleep(interval)
 
+        # Waiting again, e.g. from close(), must not count the same task twice
+        if metrics.ENABLED and not self._completion_recorded:
+            self._record_completion()
+        self._completion_recorded = True
+
+    def _poll(self):
+        """Check for completion, timing the status query if metrics are enabled"""
+        if not metrics.ENABLED:
+            return self.completed
+        start = time.perf_counter()
+        completed = self.completed
+        metrics.POLL_DURATION.observe(
+            time.perf_counter() - start, platform=self.__class__.__qualname__
+        )
+        return completed
+
+    def _record_completion(self):
+        """Record the duration and script outcomes of a completed task"""
+        platform = self.__class__.__qualname__
+        if self.started is not None:
+            metrics.TASK_DURATION.observe(
+                time.monotonic() - self.started, platform=platform
+            )
+        counts = self._progress_counts()
+        for outcome in ("done", "failed"):
+            metrics.SCRIPTS_FINISHED.inc(
+                counts.get(outcome, 0), platform=platform, outcome=outcome
+            )
+
 
 class ClusterTask(Task):
     """Abstract base class for executable cluster tasks"""
 
+    #: The scheduler command to cancel one or more jobs, e.g. ``["scancel"]``
+    KILL_COMMAND = None
+    #: Mapping of scheduler job states to ``pending``, ``running``, ``done`` or
+    #: ``failed``, unknown states are considered ``running``
+    STATE_CATEGORIES = {}
+
     def __init__(self, *args, **kwargs):
         """Instantiate a new :obj:`~pyjob.task.ClusterTask`"""
         super(ClusterTask, self).__init__(*args, **kwargs)
         self.dependency = kwargs.get("dependency", [])
-        self.max_array_size = (
-            kwargs.get("max_array_size")
-            or config.get("max_array_size")
-            or len(self.script)
-        )
+        settings = self.settings
+        self.max_array_size = settings.get("max_array_size") or len(self.script)
         self.priority = kwargs.get("priority", None)
-        self.queue = kwargs.get("queue") or config.get("queue")
-        self.environment = (
-            kwargs.get("environment") or config.get("environment") or "mpi"
-        )
-        self.runtime = kwargs.get("runtime") or config.get("runtime")
-        self.shell = kwargs.get("shell") or config.get("shell")
-        self.name = kwargs.get("name") or config.get("name") or "pyjob"
+        self.queue = settings.get("queue")
+        self.environment = settings.get("environment") or "mpi"
+        self.runtime = settings.get("runtime")
+        self.shell = settings.get("shell")
+        self.name = settings.get("name") or "pyjob"
         self.extra = kwargs.get("extra", [])
-        self.cleanup = kwargs.get("cleanup") or config.get("cleanup") or False
+        self.cleanup = settings.get("cleanup") or False
+        self.pilots = settings.get("pilots") or 0
+        self.fanout = settings.get("fanout") or False
+        self.bundle_size = settings.get("bundle_size") or self.nprocesses
         self.runscript = None
         self._check_requirements()
 
+    #: Tri-state flag for scheduler support of machine-readable output, shared by
+    #: all instances of a platform: ``None`` (untested), ``True`` or ``False``
+    _structured_output = None
+
     @abc.abstractmethod
     def _create_runscript(self):
         """Utility method to create a :obj:`~pyjob.task.ClusterTask` runscript"""
@@ -266,14 +349,105 @@ class ClusterTask(Task):
                 f"Cannot find executable {exe}. Please ensure environment is set up correctly."
             )
 
+    def _query_structured_info(self, cmd, parser):
+        """Query the scheduler for machine-readable information about this task
+
+        Parameters
+        ----------
+        cmd : list
+           The command requesting structured (XML/JSON) output
+        parser : callable
+           A :obj:`callable` turning the command output into a :obj:`dict`
+
+        Returns
+        -------
+        dict
+           The parsed task information, or ``None`` if the scheduler does not
+           provide structured output and the plain-text output should be used
+
+        Raises
+        ------
+        :exc:`~pyjob.exception.PyJobExecutableNotFoundError`
+           The scheduler executable cannot be found
+
+        Note
+        ----
+        The `parser` needs to raise a :exc:`ValueError` for output it cannot interpret.
+        The first such failure disables structured output for the platform. Once it
+        has worked, a failure only falls back to the plain-text output for this query,
+        since unparsable output does not tell whether the task has finished.
+
+        """
+        cls = self.__class__
+        if cls._structured_output is False:
+            return None
+        # Warnings on stderr would otherwise corrupt the structured output
+        stdout = cexec(cmd, permit_nonzero=True, stderr=subprocess.PIPE)
+        try:
+            data = parser(stdout)
+        except ValueError:
+            if cls._structured_output:
+                logger.debug("Unparsable output of '%s', using text", " ".join(cmd))
+                return None
+            logger.debug("No structured output for %s, using text", cls.__qualname__)
+            cls._structured_output = False
+            return None
+        cls._structured_output = True
+        return data
+
     def _check_requirements(self):
         """Abstract method to check if the user input meets the requirements for the task execution"""
 
+    @classmethod
+    def kill_many(cls, tasks, chunk_size=KILL_CHUNK_SIZE):
+        """Terminate many :obj:`~pyjob.task.ClusterTask` instances with few scheduler calls
+
+        Parameters
+        ----------
+        tasks : list, tuple
+           The :obj:`~pyjob.task.ClusterTask` instances to terminate
+        chunk_size : int, optional
+           The maximum number of job identifiers per scheduler call
+
+        """
+        pids = list(dict.fromkeys(t.pid for t in tasks if t.pid is not None))
+        for i in range(0, len(pids), chunk_size):
+            chunk = pids[i : i + chunk_size]
+            cexec(cls.KILL_COMMAND + [str(pid) for pid in chunk], permit_nonzero=True)
+            logger.debug("Terminated %d %s tasks", len(chunk), cls.__qualname__)
+
+    def wait_for_termination(self, timeout=10, interval=0.5):
+        """Poll the scheduler until this :obj:`~pyjob.task.ClusterTask` has terminated
+
+        Parameters
+        ----------
+        timeout : float, optional
+           The maximum time to wait (in seconds)
+        interval : float, optional
+           The interval to wait between checking (in seconds)
+
+        Returns
+        -------
+        bool
+           The task is confirmed to be terminated
+
+        """
+        deadline = time.monotonic() + timeout
+        while self.info:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+        return True
+
     def close(self):
         """Close this :obj:`~pyjob.sge.ClusterTask` after completion"""
         self.wait()
         if self.cleanup and self.runscript is not None:
             self.runscript.cleanup()
+            for suffix in (".queue", ".fanout"):
+                bundledir = self.runscript.path.replace(".script", suffix)
+                if os.path.isdir(bundledir):
+                    shutil.rmtree(bundledir)
 
     def get_array_bash_extension(self, jobsf, offset):
         """Get the array job bash extension for the ``runscript``
@@ -314,3 +488,187 @@ class ClusterTask(Task):
             'log=$(echo $script | sed "s/\\.${script##*.}/\\.log/")',
             "$script > $log 2>&1",
         ]
+
+    @property
+    def pilot_mode(self):
+        """Execute the scripts through long-lived pilot jobs instead of an array job"""
+        return self.pilots > 0 and len(self.script) > 1
+
+    @property
+    def fanout_mode(self):
+        """Execute bundles of scripts across the allocated cores instead of one each"""
+        return bool(self.fanout) and not self.pilot_mode and len(self.script) > 1
+
+    @property
+    def returncodes(self):
+        """The return codes of all completed scripts
+
+        Only available for :attr:`pilot_mode` and :attr:`fanout_mode` executions,
+        otherwise empty.
+
+        """
+        if self.runscript is None:
+            return {}
+        if self.pilot_mode:
+            from pyjob.pilot import FileWorkQueue
+
+            queuedir = self.runscript.path.replace(".script", ".queue")
+            return FileWorkQueue(queuedir).returncodes
+        if self.fanout_mode:
+            from pyjob.fanout import read_results
+
+            return read_results(self.runscript.path.replace(".script", ".fanout"))
+        return {}
+
+    def _progress_counts(self):
+        """Count pending, running, done and failed scripts
+
+        Per-script return codes are used for bundled executions, the job states
+        reported by the scheduler for array jobs.
+
+        Returns
+        -------
+        dict
+           The script counts by category
+
+        """
+        total = len(self.script)
+        if not self.locked:
+            return {"pending": total}
+        info = self.info
+        returncodes = self.returncodes
+        done = sum(1 for returncode in returncodes.values() if returncode == 0)
+        failed = len(returncodes) - done
+        remaining = total - done - failed
+        if not info:
+            # Scripts of finished bundled executions without a return code never ran
+            if returncodes:
+                return {"done": done, "failed": failed + remaining}
+            return {"done": total}
+        categories = Counter()
+        for state, count in info.get("states", {}).items():
+            categories[self.STATE_CATEGORIES.get(state, "running")] += count
+        if categories and not returncodes:
+            pending, running = categories["pending"], categories["running"]
+            failed = categories["failed"]
+            done = max(total - pending - running - failed, 0)
+            return {
+                "pending": pending,
+                "running": running,
+                "done": done,
+                "failed": failed,
+            }
+        status = info.get("status") or info.get("job_state")
+        if self.STATE_CATEGORIES.get(status) == "pending":
+            return {"pending": remaining, "done": done, "failed": failed}
+        return {"running": remaining, "done": done, "failed": failed}
+
+    def get_bundled_execution(self, runscript_path):
+        """Get the array size and ``runscript`` lines for bundled script execution
+
+        Parameters
+        ----------
+        runscript_path : str
+           The path to the ``runscript``
+
+        Returns
+        -------
+        tuple
+           The number of array elements and a list of lines to be written to
+           the ``runscript``
+
+        """
+        if self.pilot_mode:
+            queuedir = runscript_path.replace(".script", ".queue")
+            # Scripts may be added or tasks combined after instantiation
+            npilots = min(self.pilots, len(self.script))
+            return npilots, self.get_pilot_bash_extension(queuedir)
+        fanoutdir = runscript_path.replace(".script", ".fanout")
+        return self.get_fanout_bash_extension(fanoutdir)
+
+    def get_pilot_bash_extension(self, queuedir):
+        """Get the pilot job bash extension for the ``runscript``
+
+        The scripts are placed in a :obj:`~pyjob.pilot.FileWorkQueue`, from which
+        every pilot job executes scripts until the queue is drained.
+
+        Parameters
+        ----------
+        queuedir : str
+           The directory for the work queue, needs to be on a shared file system
+
+        Returns
+        -------
+        list
+           A list of lines to be written to the ``runscript``
+
+        """
+        from pyjob.pilot import FileWorkQueue
+
+        FileWorkQueue(queuedir).put(self.script)
+        return [f"{sys.executable} -m pyjob.pilot {queuedir}"]
+
+    def get_fanout_bash_extension(self, fanoutdir):
+        """Get the node-local fan-out bash extension for the ``runscript``
+
+        The scripts are split into bundles of :attr:`bundle_size`, every array
+        element executes one bundle across :attr:`nprocesses` cores.
+
+        Parameters
+        ----------
+        fanoutdir : str
+           The directory for the bundles, needs to be on a shared file system
+
+        Returns
+        -------
+        tuple
+           The number of bundles and a list of lines to be written to the
+           ``runscript``
+
+        """
+        from pyjob.fanout import write_bundles
+
+        nbundles = write_bundles(fanoutdir, self.script, self.bundle_size)
+        job_array_index = self.__class__.JOB_ARRAY_INDEX
+        return nbundles, [
+            f"{sys.executable} -m pyjob.fanout {fanoutdir} {job_array_index} "
+            f"-t {self.nprocesses}"
+        ]
+
+
+def kill_many(tasks, max_in_flight=8):
+    """Terminate many :obj:`~pyjob.task.Task` instances concurrently
+
+    :obj:`~pyjob.task.ClusterTask` instances are cancelled in bulk with one scheduler
+    call per platform and chunk of job identifiers, all other tasks are killed
+    individually.
+
+    Parameters
+    ----------
+    tasks : list, tuple
+       The :obj:`~pyjob.task.Task` instances to terminate
+    max_in_flight : int, optional
+       The maximum number of concurrent kill operations
+
+    Raises
+    ------
+    :exc:`ValueError`
+       Invalid number of concurrent kill operations
+
+    """
+    if max_in_flight < 1:
+        raise ValueError("At least one concurrent kill operation required")
+    by_platform = {}
+    others = []
+    for task in tasks:
+        if isinstance(task, ClusterTask) and task.KILL_COMMAND:
+            by_platform.setdefault(task.__class__, []).append(task)
+        else:
+            others.append(task)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        futures = [
+            executor.submit(cls.kill_many, ts) for cls, ts in by_platform.items()
+        ]
+        futures += [executor.submit(task.kill) for task in others]
+        for future in futures:
+            future.result()
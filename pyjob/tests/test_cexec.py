@@ -1,9 +1,15 @@
 import os
+import signal
 import sys
+import time
 
 import pytest
-from pyjob.cexec import cexec
-from pyjob.exception import PyJobExecutableNotFoundError, PyJobExecutionError
+from pyjob.cexec import KILL_GRACE_PERIOD, cexec, execute, spawn
+from pyjob.exception import (
+    PyJobExecutableNotFoundError,
+    PyJobExecutionError,
+    PyJobTimeoutError,
+)
 
 
 class TestCexec(object):
@@ -65,3 +71,77 @@ class TestCexec(object):
     def test_8(self):
         with pytest.raises(PyJobExecutableNotFoundError):
             cexec(["fjezfsdkj"])
+
+    def test_9(self):
+        start = time.monotonic()
+        with pytest.raises(PyJobTimeoutError):
+            cexec([sys.executable, "-c", "import time; time.sleep(30)"], timeout=0.5)
+        assert time.monotonic() - start < 5
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="Unavailable on Windows")
+class TestSpawn(object):
+    def test_1(self, tmp_path):
+        script = tmp_path / "test.sh"
+        script.write_text("#!/bin/sh\necho hello\necho error >&2\nexit 3\n")
+        script.chmod(0o755)
+        log = str(tmp_path / "test.log")
+        assert spawn(str(script), log) == 3
+        with open(log) as f:
+            assert f.read().split() == ["hello", "error"]
+
+    def test_2(self, tmp_path):
+        script = tmp_path / "test.sh"
+        script.write_text("#!/bin/sh\nkill -9 $$\n")
+        script.chmod(0o755)
+        assert spawn(str(script), str(tmp_path / "test.log")) == -9
+
+    def test_3(self, tmp_path):
+        script = tmp_path / "test.sh"
+        script.write_text("#!/bin/sh\nexit 2\n")
+        script.chmod(0o755)
+        returncode, rusage, timed_out = execute(str(script), str(tmp_path / "test.log"))
+        assert returncode == 2 and not timed_out
+        assert rusage.ru_utime >= 0 and rusage.ru_maxrss > 0
+
+    def test_4(self, tmp_path, monkeypatch):
+        script = tmp_path / "test.sh"
+        script.write_text("#!/bin/sh\nsleep 30 &\necho $! > child.pid\nwait\n")
+        script.chmod(0o755)
+        monkeypatch.chdir(tmp_path)
+        start = time.monotonic()
+        returncode, _, timed_out = execute(
+            str(script), str(tmp_path / "test.log"), timeout=0.5
+        )
+        assert time.monotonic() - start < 5
+        assert timed_out and returncode == -signal.SIGTERM
+        child = (tmp_path / "child.pid").read_text().strip()
+        time.sleep(0.1)
+        # The orphaned child is either reaped already or a zombie
+        if os.path.exists(f"/proc/{child}/stat"):
+            with open(f"/proc/{child}/stat") as f:
+                assert f.read().split()[2] == "Z"
+
+    def test_5(self, tmp_path):
+        script = tmp_path / "test.sh"
+        script.write_text("#!/bin/sh\ntrap '' TERM\nsleep 30\n")
+        script.chmod(0o755)
+        start = time.monotonic()
+        returncode, _, timed_out = execute(
+            str(script), str(tmp_path / "test.log"), timeout=0.2
+        )
+        assert timed_out and returncode == -signal.SIGKILL
+        assert time.monotonic() - start < KILL_GRACE_PERIOD + 2
+
+    def test_6(self, tmp_path):
+        script = tmp_path / "test.sh"
+        script.write_text("#!/bin/sh\npwd\n")
+        script.chmod(0o755)
+        pids = []
+        log = str(tmp_path / "test.log")
+        returncode, _, _ = execute(
+            str(script), log, on_spawn=pids.append, cwd=str(tmp_path)
+        )
+        assert returncode == 0 and len(pids) == 1
+        with open(log) as f:
+            assert f.read().strip() == str(tmp_path)
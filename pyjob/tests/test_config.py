@@ -1,8 +1,19 @@
+import json
 import os
 import sys
+from unittest import mock
 
+import pyjob
 import pytest
-from pyjob.config import PyJobConfig
+from pyjob.config import (
+    CACHE_SUFFIX,
+    PyJobConfig,
+    Settings,
+    atomic_write,
+    file_signature,
+    get_settings,
+    read_environment,
+)
 from pyjob.exception import DictLockedError
 
 if sys.version_info.major < 3:
@@ -38,6 +49,7 @@ class TestPyJobConfigWrite(object):
         config_r = PyJobConfig.read_yaml(config_w.file)
         assert config_r == config_w
         os.unlink(config_w.file)
+        os.unlink(config_w.file + CACHE_SUFFIX)
 
 
 class TestPyJobConfigRead(object):
@@ -78,3 +90,102 @@ cutoff: 1.0
         config["platform"] = "local"
         assert config["platform"] == "local"
         os.unlink(fname)
+
+
+class TestPyJobConfigCache(object):
+    @staticmethod
+    def get_config(tmp_path):
+        config = PyJobConfig.from_default()
+        config.file = str(tmp_path / "pyjob.yml")
+        return config
+
+    def test_1(self, tmp_path):
+        config = TestPyJobConfigCache.get_config(tmp_path)
+        assert config == {}
+        assert os.path.isfile(config.file)
+        assert os.path.isfile(config.file + CACHE_SUFFIX)
+
+    def test_2(self, tmp_path):
+        config = TestPyJobConfigCache.get_config(tmp_path)
+        config.setdefault("platform", "sge")
+        other = TestPyJobConfigCache.get_config(tmp_path)
+        assert other["platform"] == "sge"
+        with open(config.file, "w") as f:
+            f.write("platform: slurm\nprocesses: 4\n")
+        assert config["platform"] == "slurm"
+        assert config["processes"] == 4
+
+    def test_3(self, tmp_path):
+        config = TestPyJobConfigCache.get_config(tmp_path)
+        PyJobConfig.ensure_file(config.file)
+        signature = file_signature(config.file)
+        with mock.patch.object(PyJobConfig, "read_yaml") as read_yaml_mock:
+            with open(config.file + CACHE_SUFFIX, "w") as f:
+                json.dump({"signature": signature, "data": {"platform": "pbs"}}, f)
+            assert config.get("platform") == "pbs"
+            assert not read_yaml_mock.called
+
+    def test_4(self, tmp_path):
+        config = TestPyJobConfigCache.get_config(tmp_path)
+        assert config == {}
+        with mock.patch("pyjob.config.atomic_write") as atomic_write_mock:
+            with config.batch():
+                config.setdefault("platform", "sge")
+                config.setdefault("processes", 2)
+                assert not atomic_write_mock.called
+        # The configuration and its cache are written once
+        assert atomic_write_mock.call_count == 2
+        assert config == {"platform": "sge", "processes": 2}
+
+    def test_5(self, tmp_path):
+        fname = str(tmp_path / "test.txt")
+        atomic_write(fname, "foo")
+        atomic_write(fname, "bar")
+        with open(fname) as f:
+            assert f.read() == "bar"
+        assert os.listdir(str(tmp_path)) == ["test.txt"]
+
+
+class TestSettings(object):
+    def test_1(self):
+        settings = Settings({"processes": 2})
+        assert settings["processes"] == 2
+        with pytest.raises(DictLockedError):
+            settings.processes = 4
+        with pytest.raises(TypeError):
+            settings["processes"] = 4
+
+    def test_2(self):
+        settings = Settings({"processes": 2, "queue": "a"})
+        assert settings.override(processes=None, queue="a") is settings
+        other = settings.override(processes=4)
+        assert other == {"processes": 4, "queue": "a"}
+        assert settings == {"processes": 2, "queue": "a"}
+
+    def test_3(self):
+        environ = {"PYJOB_PROCESSES": "4", "PYJOB_QUEUE": "all.q", "PYJOB_": "x"}
+        assert read_environment(environ) == {"processes": 4, "queue": "all.q"}
+
+    def test_4(self, tmp_path, monkeypatch):
+        system = tmp_path / "system.yml"
+        system.write_text("processes: 1\nqueue: system.q\nshell: /bin/sh\n")
+        project = tmp_path / "pyjob.yml"
+        project.write_text("processes: 2\nqueue: project.q\n")
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(
+            sys.modules["pyjob.config"], "SYSTEM_CONFIG_FILE", str(system)
+        )
+        monkeypatch.setattr(pyjob, "config", {"processes": 3, "name": "user"})
+        monkeypatch.setenv("PYJOB_PROCESSES", "8")
+        try:
+            settings = get_settings(reload=True)
+            assert settings == {
+                "processes": 8,
+                "queue": "project.q",
+                "shell": "/bin/sh",
+                "name": "user",
+            }
+            assert get_settings() is settings
+        finally:
+            monkeypatch.undo()
+            get_settings(reload=True)
@@ -3,8 +3,15 @@ import os
 from unittest import mock
 
 import pytest
+from pyjob import factory
 from pyjob.exception import PyJobUnknownTaskPlatform
-from pyjob.factory import TASK_PLATFORMS, TaskFactory
+from pyjob.factory import (
+    TASK_PLATFORMS,
+    TaskFactory,
+    available_platforms,
+    get_platform,
+    register_platform,
+)
 
 
 @mock.patch("pyjob.lsf.LoadSharingFacilityTask._check_requirements")
@@ -36,3 +43,25 @@ class TestFactory(object):
         for _, v in TASK_PLATFORMS.items():
             module, class_ = v
             assert getattr(importlib.import_module(module), class_)
+
+
+class TestRegistry(object):
+    def test_1(self):
+        assert set(TASK_PLATFORMS) <= set(available_platforms())
+
+    def test_2(self):
+        from pyjob.local import LocalTask
+
+        assert get_platform("LOCAL") is LocalTask
+        assert get_platform("local") is get_platform("local")
+
+    def test_3(self, monkeypatch):
+        monkeypatch.setattr(factory, "TASK_PLATFORMS", dict(TASK_PLATFORMS))
+        monkeypatch.setattr(factory, "_platform_classes", {})
+        register_platform("Dummy", "pyjob.local", "LocalTask")
+        assert "dummy" in available_platforms()
+        assert get_platform("dummy").__name__ == "LocalTask"
+
+    def test_4(self):
+        with pytest.raises(PyJobUnknownTaskPlatform):
+            get_platform(pytest.helpers.randomstr(10))
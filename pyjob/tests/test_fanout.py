@@ -0,0 +1,99 @@
+import os
+import sys
+from unittest import mock
+
+import pytest
+from pyjob.fanout import bundle_path, read_results, run_bundle, write_bundles
+from pyjob.lsf import LoadSharingFacilityTask
+from pyjob.pbs import PortableBatchSystemTask
+from pyjob.sge import SunGridEngineTask
+from pyjob.slurm import SlurmTask
+
+
+class TestBundles(object):
+    def test_1(self, tmp_path):
+        directory = str(tmp_path / "fanout")
+        assert write_bundles(directory, ["a", "b", "c", "d", "e"], 2) == 3
+        with open(bundle_path(directory, 3)) as f:
+            assert f.read() == "e"
+        assert read_results(directory) == {}
+
+    def test_2(self, tmp_path):
+        assert read_results(str(tmp_path / "missing")) == {}
+
+
+@pytest.mark.skipif(pytest.on_windows, reason="Unavailable on Windows")
+class TestRunBundle(object):
+    def test_1(self, tmp_path):
+        scripts = [pytest.helpers.get_py_script(i, 10) for i in range(3)]
+        for script in scripts:
+            script.directory = str(tmp_path)
+            script.write()
+        directory = str(tmp_path / "fanout")
+        write_bundles(directory, [s.path for s in scripts], 2)
+        assert run_bundle(directory, 1, 2) == {s.path: 0 for s in scripts[:2]}
+        assert run_bundle(directory, 2, 2) == {scripts[2].path: 0}
+        assert read_results(directory) == {s.path: 0 for s in scripts}
+        with open(scripts[0].log) as f:
+            assert f.read().strip() == "10th fib is: 34"
+
+    def test_2(self, tmp_path):
+        script = tmp_path / "script.sh"
+        script.write_text("#!/bin/sh\nexit 0\n")
+        missing = str(tmp_path / "missing.sh")
+        directory = str(tmp_path / "fanout")
+        write_bundles(directory, [str(script), missing], 2)
+        assert run_bundle(directory, 1, 2) == {str(script): 126, missing: 127}
+        assert read_results(directory) == {str(script): 126, missing: 127}
+
+
+@pytest.mark.skipif(pytest.on_windows, reason="Unavailable on Windows")
+@mock.patch("pyjob.sge.SunGridEngineTask._check_requirements")
+class TestFanoutRunscript(object):
+    def test_1(self, check_requirements_mock, tmp_path):
+        scripts = [pytest.helpers.get_py_script(i, 1) for i in range(5)]
+        task = SunGridEngineTask(
+            scripts, fanout=True, processes=2, directory=str(tmp_path)
+        )
+        assert task.fanout_mode and task.bundle_size == 2
+        runscript = task._create_runscript()
+        logf = runscript.path.replace(".script", ".log")
+        fanoutdir = runscript.path.replace(".script", ".fanout")
+        assert runscript.content[-3:] == [
+            "#$ -t 1-3",
+            "#$ -o " + logf,
+            f"{sys.executable} -m pyjob.fanout {fanoutdir} $SGE_TASK_ID -t 2",
+        ]
+        assert os.path.isfile(bundle_path(fanoutdir, 3))
+
+    def test_2(self, check_requirements_mock, tmp_path):
+        scripts = [pytest.helpers.get_py_script(i, 1) for i in range(5)]
+        task = SunGridEngineTask(
+            scripts, fanout=True, processes=4, directory=str(tmp_path)
+        )
+        assert "#$ -pe smp 4" in task._create_runscript().content
+
+    def test_3(self, check_requirements_mock):
+        task = SunGridEngineTask(None, fanout=True, pilots=2)
+        assert not task.fanout_mode
+        assert task.returncodes == {}
+
+
+@pytest.mark.skipif(pytest.on_windows, reason="Unavailable on Windows")
+class TestFanoutResources(object):
+    @pytest.mark.parametrize(
+        "platform, directive",
+        [
+            (SlurmTask, "#SBATCH -N 1 --ntasks=1 --cpus-per-task=4"),
+            (LoadSharingFacilityTask, '#BSUB -n 4 -R "span[hosts=1]"'),
+            (PortableBatchSystemTask, "#PBS -l nodes=1:ppn=4"),
+        ],
+    )
+    def test_1(self, tmp_path, platform, directive):
+        scripts = [pytest.helpers.get_py_script(i, 1) for i in range(5)]
+        with mock.patch.object(platform, "_check_requirements"):
+            task = platform(scripts, fanout=True, processes=4, directory=str(tmp_path))
+            content = task._create_runscript().content
+            assert directive in content
+            task.fanout = False
+            assert directive not in task._create_runscript().content
@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+
+def run_python(code, home):
+    env = dict(os.environ, HOME=str(home), PYTHONPATH=PACKAGE_ROOT)
+    return subprocess.check_output([sys.executable, "-c", code], env=env).decode()
+
+
+class TestImport(object):
+    def test_1(self, tmp_path):
+        code = (
+            "import sys, pyjob; "
+            "print(','.join(m for m in ('yaml', 'chardet', 'multiprocessing.pool', "
+            "'pyjob.script', 'pyjob.factory') if m in sys.modules))"
+        )
+        assert run_python(code, tmp_path).strip() == ""
+        assert not os.path.exists(os.path.join(str(tmp_path), ".pyjob"))
+
+    def test_2(self, tmp_path):
+        code = "import pyjob; print(pyjob.config.get('platform'))"
+        assert run_python(code, tmp_path).strip() == "None"
+        assert os.path.isfile(os.path.join(str(tmp_path), ".pyjob", "pyjob.yml"))
+
+    def test_3(self, tmp_path):
+        code = (
+            "import pyjob; "
+            "print(pyjob.TaskFactory.__name__, pyjob.read_script.__name__, "
+            "pyjob.Script.__name__, pyjob.StopWatch.__name__)"
+        )
+        assert run_python(code, tmp_path).split() == [
+            "TaskFactory",
+            "read",
+            "Script",
+            "StopWatch",
+        ]
+
+    def test_4(self, tmp_path):
+        code = (
+            "import time; t = time.perf_counter(); import pyjob; "
+            "print(time.perf_counter() - t)"
+        )
+        # Generous upper bound, guards against eager imports creeping back in
+        assert float(run_python(code, tmp_path)) < 0.5
+
+    def test_5(self):
+        import pyjob
+
+        with pytest.raises(AttributeError):
+            pyjob.foobar
@@ -1,10 +1,20 @@
+import functools
+import multiprocessing
 import os
+import pickle
+import signal
 import sys
 import time
 
 import pytest
-from pyjob.exception import PyJobError, PyJobTaskLockedError
-from pyjob.local import CPU_COUNT, LocalTask
+from pyjob.exception import (
+    PyJobError,
+    PyJobExecutableNotFoundError,
+    PyJobExecutionError,
+    PyJobTaskLockedError,
+    PyJobTimeoutError,
+)
+from pyjob.local import CPU_COUNT, LocalTask, SharedJobArray
 
 
 @pytest.mark.skipif(pytest.on_windows, reason="Deadlock on Windows")
@@ -140,3 +150,289 @@ class TestLocalPerformance(object):
         all_found = all(os.path.isfile(f) for f in task.log)
         pytest.helpers.unlink(task.script + task.log)
         assert all_found
+
+
+@pytest.mark.skipif(pytest.on_windows, reason="Deadlock on Windows")
+class TestLocalTaskLaunch(object):
+    def test_1(self):
+        scripts = [pytest.helpers.get_py_script(i, 10) for i in range(2)]
+        task = LocalTask(scripts)
+        task.script_collector.dump()
+        os.chmod(task.script[1], 0o644)
+        with pytest.raises(PyJobExecutableNotFoundError):
+            task._run()
+        task.lock()
+        task._killed = True
+        pytest.helpers.unlink(task.script)
+
+    def test_2(self, tmp_path):
+        script = tmp_path / "fail.sh"
+        script.write_text("#!/bin/sh\necho $PWD\nexit 3\n")
+        script.chmod(0o755)
+        with LocalTask([str(script)], permit_nonzero=True, chdir=True) as task:
+            task.run()
+            task.wait(interval=0.1)
+        assert task.progress.done == 1
+        assert (tmp_path / "fail.log").read_text().strip() == str(tmp_path)
+
+    def test_3(self, tmp_path):
+        paths = []
+        for i, code in enumerate([0, 3, 0, 0]):
+            script = tmp_path / f"script{i}.sh"
+            script.write_text(f"#!/bin/sh\nexit {code}\n")
+            script.chmod(0o755)
+            paths.append(str(script))
+        with LocalTask(paths, processes=1) as task:
+            task.run()
+            task.wait(interval=0.05)
+        results = task.results
+        assert [result.returncode for result in results] == [0, 3, 0, 0]
+        assert [result.job for result in results] == paths
+        assert isinstance(results[1].error, PyJobExecutionError)
+        assert all(result.rusage is not None for result in results)
+        assert all(result.end >= result.start for result in results)
+        assert task.progress.done == 3 and task.progress.failed == 1
+
+
+def _raise_value_error():
+    raise ValueError("boom")
+
+
+@pytest.mark.skipif(pytest.on_windows, reason="Deadlock on Windows")
+class TestLocalTaskCallables(object):
+    def test_1(self, tmp_path):
+        calls = [functools.partial(pow, 2, i) for i in range(6)]
+        with LocalTask(calls, processes=2, directory=str(tmp_path)) as task:
+            task.run()
+            task.wait(interval=0.05)
+        assert [result.value for result in task.results] == [1, 2, 4, 8, 16, 32]
+        assert [result.index for result in task.results] == list(range(6))
+        assert all(result.success for result in task.results)
+        assert task.progress.done == 6
+        assert list(tmp_path.iterdir()) == []
+
+    def test_2(self):
+        calls = [
+            functools.partial(int, "1"),
+            _raise_value_error,
+            functools.partial(int, "3"),
+        ]
+        with LocalTask(calls) as task:
+            task.run()
+            task.wait(interval=0.05)
+        results = task.results
+        assert [result.value for result in results] == [1, None, 3]
+        assert isinstance(results[1].error, ValueError)
+        assert results[1].job is _raise_value_error
+        assert task.progress.done == 2 and task.progress.failed == 1
+
+    def test_3(self):
+        script = pytest.helpers.get_py_script(0, 1)
+        script.write()
+        with LocalTask([script.path, functools.partial(abs, -4)]) as task:
+            task.run()
+            task.wait(interval=0.05)
+        assert [result.value for result in task.results] == [None, 4]
+        assert task.results[0].returncode == 0 and task.results[0].job == script.path
+        assert task.progress.done == 2
+        pytest.helpers.unlink([script.path, script.path.replace(".py", ".log")])
+
+    def test_4(self):
+        task = LocalTask(lambda: 1)
+        with pytest.raises(PyJobError, match="Cannot pickle job"):
+            task.run()
+        task.kill()
+
+
+def _crash_once(marker):
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os.kill(os.getpid(), signal.SIGKILL)
+    return "survived"
+
+
+@pytest.mark.skipif(pytest.on_windows, reason="Deadlock on Windows")
+class TestLocalTaskSupervision(object):
+    def test_1(self, tmp_path):
+        marker = str(tmp_path / "crashed")
+        calls = [functools.partial(abs, -1), functools.partial(_crash_once, marker)]
+        calls += [functools.partial(abs, -i) for i in range(2, 6)]
+        with LocalTask(calls, processes=2) as task:
+            task.run()
+            task.wait(interval=0.05)
+        results = task.results
+        assert [result.value for result in results] == [1, "survived", 2, 3, 4, 5]
+        assert all(proc.exitcode == 0 for proc in task.processes)
+        assert task.progress.done == 6
+
+    def test_2(self):
+        calls = [functools.partial(os._exit, 1), functools.partial(abs, -2)]
+        with LocalTask(calls, retries=2) as task:
+            task.run()
+            task.wait(interval=0.05)
+        results = task.results
+        assert isinstance(results[0].error, PyJobExecutionError)
+        assert results[0].job is calls[0]
+        assert results[1].value == 2
+        assert task.progress.done == 1 and task.progress.failed == 1
+
+
+@pytest.mark.skipif(pytest.on_windows, reason="Deadlock on Windows")
+class TestLocalTaskTimeout(object):
+    def _scripts(self, tmp_path, seconds):
+        paths = []
+        for i, duration in enumerate(seconds):
+            script = tmp_path / f"script{i}.sh"
+            script.write_text(f"#!/bin/sh\nsleep {duration}\n")
+            script.chmod(0o755)
+            paths.append(str(script))
+        return paths
+
+    def test_1(self, tmp_path):
+        paths = self._scripts(tmp_path, [0, 30, 0])
+        start = time.monotonic()
+        with LocalTask(paths, processes=1, timeout=0.5) as task:
+            task.run()
+            task.wait(interval=0.05)
+        assert time.monotonic() - start < 10
+        results = task.results
+        assert [result.timed_out for result in results] == [False, True, False]
+        assert isinstance(results[1].error, PyJobTimeoutError)
+        assert results[1].returncode == -signal.SIGTERM
+        assert task.progress.done == 2 and task.progress.failed == 1
+
+    def test_2(self, tmp_path):
+        paths = self._scripts(tmp_path, [30, 0, 0])
+        start = time.monotonic()
+        with LocalTask(paths, processes=1, runtime=0.01) as task:
+            task.run()
+            task.wait(interval=0.05)
+        assert time.monotonic() - start < 10
+        results = task.results
+        assert all(result.timed_out for result in results)
+        assert results[0].returncode == -signal.SIGTERM
+        assert results[1].returncode is None
+        assert task.progress.failed == 3
+
+
+@pytest.mark.skipif(pytest.on_windows, reason="Deadlock on Windows")
+class TestLocalTaskKill(object):
+    def test_1(self, tmp_path):
+        script = tmp_path / "script.sh"
+        script.write_text("#!/bin/sh\nsleep 60 &\nwait\n")
+        script.chmod(0o755)
+        paths = [str(script)] * 1000
+        task = LocalTask(paths, processes=2)
+        task.run()
+        time.sleep(0.5)
+        start = time.monotonic()
+        task.kill()
+        assert time.monotonic() - start < 3
+        assert not any(proc.is_alive() for proc in task.processes)
+        assert task.completed
+        assert task.progress.failed == 1000
+        assert all(result.returncode == -signal.SIGTERM for result in task.results)
+
+    def test_2(self):
+        calls = [functools.partial(time.sleep, 60)] * 4
+        task = LocalTask(calls, processes=2)
+        task.run()
+        start = time.monotonic()
+        task.kill()
+        assert time.monotonic() - start < 3
+        assert not any(proc.is_alive() for proc in task.processes)
+
+
+class TestSharedJobArray(object):
+    def test_1(self):
+        call = pickle.dumps(functools.partial(abs, -1))
+        jobs = SharedJobArray(["/tmp/a.sh", "/tmp/\u00e9.sh"], [call])
+        assert len(jobs) == 3
+        assert jobs[0] == "/tmp/a.sh" and jobs[1] == "/tmp/\u00e9.sh"
+        assert jobs[2] == call
+        assert [jobs.claim() for _ in range(4)] == [0, 1, 2, None]
+
+    def test_2(self):
+        jobs = SharedJobArray([], [])
+        assert len(jobs) == 0 and jobs.claim() is None
+        jobs = SharedJobArray(["/tmp/a.sh", "/tmp/b.sh"], [])
+        assert jobs.claim() == 0
+        jobs.discard()
+        assert jobs.claim() is None
+
+
+@pytest.mark.skipif(pytest.on_windows, reason="Deadlock on Windows")
+class TestLocalTaskStartMethod(object):
+    @pytest.mark.parametrize("start_method", ["fork", "forkserver", "spawn"])
+    def test_1(self, tmp_path, start_method):
+        script = tmp_path / "script.sh"
+        script.write_text("#!/bin/sh\nexit 0\n")
+        script.chmod(0o755)
+        jobs = [str(script), functools.partial(pow, 2, 3)]
+        with LocalTask(jobs, processes=2, start_method=start_method) as task:
+            task.run()
+            task.wait(interval=0.05)
+        assert task.context.get_start_method() == start_method
+        assert [result.returncode for result in task.results] == [0, None]
+        assert task.results[1].value == 8
+
+    def test_2(self):
+        with pytest.raises(PyJobError):
+            LocalTask(functools.partial(abs, 1), start_method="unknown")
+
+
+@pytest.mark.skipif(pytest.on_windows, reason="Deadlock on Windows")
+class TestLocalTaskThreads(object):
+    def test_1(self, tmp_path):
+        paths = []
+        for i in range(2):
+            directory = tmp_path / f"job{i}"
+            directory.mkdir()
+            script = directory / "script.sh"
+            script.write_text(f"#!/bin/sh\npwd\nexit {i}\n")
+            script.chmod(0o755)
+            paths.append(str(script))
+        jobs = paths + [functools.partial(pow, 2, 3)]
+        with LocalTask(jobs, processes=2, chdir=True, executor="thread") as task:
+            task.run()
+            task.wait(interval=0.05)
+        assert not any(
+            isinstance(proc, multiprocessing.Process) for proc in task.processes
+        )
+        results = task.results
+        assert [result.returncode for result in results] == [0, 1, None]
+        assert results[2].value == 8
+        assert isinstance(results[1].error, PyJobExecutionError)
+        for path in paths:
+            with open(os.path.splitext(path)[0] + ".log") as f:
+                assert f.read().strip() == os.path.dirname(path)
+        assert task.progress.done == 2 and task.progress.failed == 1
+
+    def test_2(self, tmp_path):
+        script = tmp_path / "script.sh"
+        script.write_text("#!/bin/sh\nsleep 30\n")
+        script.chmod(0o755)
+        with LocalTask(
+            [str(script)], processes=1, timeout=0.5, executor="thread"
+        ) as task:
+            task.run()
+            task.wait(interval=0.05)
+        assert task.results[0].timed_out
+        assert task.results[0].returncode == -signal.SIGTERM
+
+    def test_3(self, tmp_path):
+        script = tmp_path / "script.sh"
+        script.write_text("#!/bin/sh\nsleep 60 &\nwait\n")
+        script.chmod(0o755)
+        task = LocalTask([str(script)] * 100, processes=4, executor="thread")
+        task.run()
+        time.sleep(0.5)
+        start = time.monotonic()
+        task.kill()
+        assert time.monotonic() - start < 3
+        assert not any(proc.is_alive() for proc in task.processes)
+        assert task.progress.failed == 100
+
+    def test_4(self):
+        with pytest.raises(PyJobError):
+            LocalTask(functools.partial(abs, 1), executor="unknown")
@@ -2,7 +2,7 @@ import os
 from unittest import mock
 
 import pytest
-from pyjob.lsf import LoadSharingFacilityTask
+from pyjob.lsf import LoadSharingFacilityTask, parse_bjobs_json
 
 
 @pytest.mark.skipif(pytest.on_windows, reason="Unavailable on Windows")
@@ -232,3 +232,42 @@ class TestCreateRunscript(object):
             "#BSUB -o " + paths[0].replace(".py", ".log"),
             paths[0],
         ]
+
+
+class TestParseBjobsJson(object):
+    def test_1(self):
+        stdout = '{"RECORDS": [{"JOBID": "7", "STAT": "RUN"}, {"JOBID": "7", "STAT": "DONE"}]}'
+        assert parse_bjobs_json(stdout) == {
+            "status": "RUN",
+            "states": {"RUN": 1, "DONE": 1},
+        }
+
+    def test_2(self):
+        stdout = '{"RECORDS": [{"JOBID": "7", "ERROR": "Job <7> is not found"}]}'
+        assert parse_bjobs_json(stdout) == {}
+
+    def test_3(self):
+        with pytest.raises(ValueError):
+            parse_bjobs_json("bjobs: illegal option -- json")
+
+
+@mock.patch("pyjob.lsf.LoadSharingFacilityTask._check_requirements")
+@mock.patch("pyjob.lsf.LoadSharingFacilityTask._structured_output", False)
+class TestInfo(object):
+    @pytest.mark.parametrize(
+        "stdout, running",
+        [
+            ("Job <7>, Status <RUN>, Queue <normal>", True),
+            ("Job <7>, Status <DONE>\n Done successfully.", False),
+            ("Job <7>, Status <EXIT>\n Exited with exit code 1.", False),
+            ("Job <7[1]>, Status <EXIT>\nJob <7[2]>, Status <RUN>", True),
+            ("Exited by signal 9.", False),
+        ],
+    )
+    @mock.patch("pyjob.lsf.cexec")
+    def test_1(self, cexec_mock, check_requirements_mock, stdout, running):
+        cexec_mock.return_value = stdout
+        task = LoadSharingFacilityTask(None)
+        task.pid = 7
+        assert bool(task.info) is running
+        task.pid = None
@@ -0,0 +1,101 @@
+import urllib.request
+
+import pytest
+from pyjob import metrics
+from pyjob.cexec import cexec
+from pyjob.exception import PyJobExecutionError
+from pyjob.local import CPU_COUNT, LocalTask
+
+
+@pytest.fixture
+def enabled():
+    metrics.REGISTRY.clear()
+    metrics.enable()
+    yield
+    metrics.disable()
+    metrics.REGISTRY.clear()
+
+
+class TestMetrics(object):
+    def test_1(self):
+        registry = metrics.Registry()
+        counter = metrics.Counter("test_total", "A test", ("a",), registry=registry)
+        counter.inc(a="x")
+        counter.inc(2, a="x")
+        assert counter.get(a="x") == 3
+        assert 'test_total_total{a="x"} 3.0' in registry.exposition()
+        assert registry.exposition().endswith("# EOF\n")
+
+    def test_2(self):
+        registry = metrics.Registry()
+        histogram = metrics.Histogram(
+            "test_seconds", "A test", buckets=(1, 10), registry=registry
+        )
+        for value in (0.5, 5, 50):
+            histogram.observe(value)
+        assert histogram.get() == (3, 55.5)
+        text = registry.exposition()
+        assert 'test_seconds_bucket{le="1.0"} 1.0' in text
+        assert 'test_seconds_bucket{le="10.0"} 2.0' in text
+        assert 'test_seconds_bucket{le="+Inf"} 3.0' in text
+        assert "test_seconds_count 3.0" in text
+
+    def test_3(self):
+        registry = metrics.Registry()
+        metrics.Counter("test", "A test", registry=registry)
+        with pytest.raises(ValueError):
+            metrics.Counter("test", "A test", registry=registry)
+
+    def test_4(self):
+        registry = metrics.Registry()
+        counter = metrics.Counter("test", "A test", ("a",), registry=registry)
+        with pytest.raises(ValueError):
+            counter.inc(b="x")
+
+    def test_5(self, tmp_path):
+        registry = metrics.Registry()
+        metrics.Counter("test", "A test", registry=registry).inc()
+        path = str(tmp_path / "pyjob.prom")
+        metrics.write_textfile(path, registry=registry)
+        with open(path) as f:
+            assert f.read() == registry.exposition()
+
+    def test_6(self):
+        registry = metrics.Registry()
+        metrics.Counter("test", "A test", registry=registry).inc()
+        server = metrics.start_http_server(0, addr="127.0.0.1", registry=registry)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url) as response:
+                assert b"test_total 1.0" in response.read()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestInstrumentation(object):
+    def test_1(self):
+        metrics.REGISTRY.clear()
+        cexec(["python", "-c", "pass"])
+        assert metrics.CEXEC_DURATION.get(command="python") == (0, 0.0)
+
+    def test_2(self, enabled):
+        cexec(["python", "-c", "pass"])
+        with pytest.raises(PyJobExecutionError):
+            cexec(["python", "-c", "import sys; sys.exit(1)"])
+        assert metrics.CEXEC_DURATION.get(command="python")[0] == 2
+        assert metrics.CEXEC_FAILURES.get(command="python") == 1
+
+    @pytest.mark.skipif(pytest.on_windows, reason="Deadlock on Windows")
+    def test_3(self, enabled):
+        scripts = [pytest.helpers.get_py_script(i, 10) for i in range(4)]
+        with LocalTask(scripts, processes=min(CPU_COUNT, 2)) as task:
+            task.run()
+            task.wait(interval=0.1)
+            task.wait(interval=0.1)
+        pytest.helpers.unlink(task.script + task.log)
+        assert metrics.SUBMISSIONS.get(platform="LocalTask") == 1
+        assert metrics.TASK_DURATION.get(platform="LocalTask")[0] == 1
+        assert metrics.POLL_DURATION.get(platform="LocalTask")[0] >= 1
+        assert metrics.SCRIPTS_FINISHED.get(platform="LocalTask", outcome="done") == 4
+        assert metrics.LOCAL_SCRIPT_DURATION.get()[0] == 4
@@ -2,7 +2,7 @@ import os
 from unittest import mock
 
 import pytest
-from pyjob.pbs import PortableBatchSystemTask
+from pyjob.pbs import PortableBatchSystemTask, parse_qstat_json
 
 
 @pytest.mark.skipif(pytest.on_windows, reason="Unavailable on Windows")
@@ -238,3 +238,23 @@ class TestCreateRunscript(object):
             "#PBS -e " + paths[0].replace(".py", ".log"),
             paths[0],
         ]
+
+
+class TestParseQstatJson(object):
+    def test_1(self):
+        stdout = (
+            '{"Jobs": {"7.server": {"job_state": "R", '
+            '"Resource_List": {"ncpus": 1}}}}'
+        )
+        assert parse_qstat_json(stdout) == {
+            "Job Id": "7.server",
+            "job_state": "R",
+            "Resource_List.ncpus": "1",
+        }
+
+    def test_2(self):
+        assert parse_qstat_json('{"Jobs": {"7.server": {"job_state": "F"}}}') == {}
+
+    def test_3(self):
+        with pytest.raises(ValueError):
+            parse_qstat_json("qstat: Unknown Job Id 7.server")
@@ -0,0 +1,91 @@
+import sys
+from unittest import mock
+
+import pytest
+from pyjob.pilot import FileWorkQueue, run_worker
+from pyjob.slurm import SlurmTask
+from pyjob.submit import combine
+
+
+class TestFileWorkQueue(object):
+    def test_1(self, tmp_path):
+        queue = FileWorkQueue(str(tmp_path / "queue"))
+        queue.put(["a.sh", "b.sh", "c.sh"])
+        assert queue.npending == 3
+        claimed = []
+        for item, script in queue.claim():
+            claimed.append(script)
+            queue.complete(item, 0 if script != "b.sh" else 1)
+        assert claimed == ["a.sh", "b.sh", "c.sh"]
+        assert queue.npending == 0
+        assert queue.returncodes == {"a.sh": 0, "b.sh": 1, "c.sh": 0}
+
+    def test_2(self, tmp_path):
+        queue = FileWorkQueue(str(tmp_path / "queue"))
+        queue.put(["a.sh", "b.sh"])
+        worker_1 = FileWorkQueue(queue.directory).claim()
+        worker_2 = FileWorkQueue(queue.directory).claim()
+        assert next(worker_1)[1] == "a.sh"
+        assert next(worker_2)[1] == "b.sh"
+        with pytest.raises(StopIteration):
+            next(worker_1)
+
+
+@pytest.mark.skipif(pytest.on_windows, reason="Unavailable on Windows")
+class TestRunWorker(object):
+    def test_1(self, tmp_path):
+        scripts = [pytest.helpers.get_py_script(i, 10) for i in range(3)]
+        for script in scripts:
+            script.directory = str(tmp_path)
+            script.write()
+        queue = FileWorkQueue(str(tmp_path / "queue"))
+        queue.put([script.path for script in scripts])
+        assert run_worker(queue.directory) == 3
+        assert run_worker(queue.directory) == 0
+        assert set(queue.returncodes.values()) == {0}
+        for script in scripts:
+            with open(script.log) as f:
+                assert f.read().strip() == "10th fib is: 34"
+
+    def test_2(self, tmp_path):
+        script = tmp_path / "script.sh"
+        script.write_text("#!/bin/sh\nexit 0\n")
+        queue = FileWorkQueue(str(tmp_path / "queue"))
+        queue.put([str(script), str(tmp_path / "missing.sh")])
+        assert run_worker(queue.directory) == 2
+        assert sorted(queue.returncodes.values()) == [126, 127]
+        assert queue.npending == 0
+
+
+@pytest.mark.skipif(pytest.on_windows, reason="Unavailable on Windows")
+@mock.patch("pyjob.slurm.SlurmTask._check_requirements")
+class TestPilotRunscript(object):
+    def test_1(self, check_requirements_mock, tmp_path):
+        scripts = [pytest.helpers.get_py_script(i, 1) for i in range(5)]
+        task = SlurmTask(scripts, pilots=2, directory=str(tmp_path))
+        runscript = task._create_runscript()
+        logf = runscript.path.replace(".script", ".log")
+        queuedir = runscript.path.replace(".script", ".queue")
+        assert runscript.content[-3:] == [
+            "#SBATCH --array=1-2",
+            "#SBATCH -o " + logf,
+            f"{sys.executable} -m pyjob.pilot {queuedir}",
+        ]
+        assert FileWorkQueue(queuedir).scripts == task.script
+
+    def test_2(self, check_requirements_mock):
+        assert not SlurmTask([pytest.helpers.get_py_script(0, 1)], pilots=2).pilot_mode
+        assert not SlurmTask(None, pilots=2).pilot_mode
+
+    def test_3(self, check_requirements_mock, tmp_path):
+        task = SlurmTask(None, pilots=4, directory=str(tmp_path))
+        task.add_script([pytest.helpers.get_py_script(i, 1) for i in range(2)])
+        assert task.pilot_mode
+        assert "#SBATCH --array=1-2" in task._create_runscript().content
+
+    def test_4(self, check_requirements_mock, tmp_path):
+        scripts = [pytest.helpers.get_py_script(i, 1) for i in range(8)]
+        tasks = [SlurmTask(s, pilots=4, directory=str(tmp_path)) for s in scripts]
+        task = combine(tasks)
+        assert task.pilot_mode
+        assert "#SBATCH --array=1-4" in task._create_runscript().content
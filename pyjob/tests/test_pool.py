@@ -15,3 +15,8 @@ class TestPool(object):
         with Pool(processes=CPU_COUNT) as pool:
             result = pool.map(pytest.helpers.fibonacci, [1, 5, 10])
         assert result == [0, 3, 34]
+
+    def test_3(self):
+        with Pool(processes=1, start_method="spawn") as pool:
+            result = pool.map(abs, [-1, -2])
+        assert result == [1, 2]
@@ -0,0 +1,72 @@
+import io
+import json
+import time
+from unittest import mock
+
+import pytest
+from pyjob.local import CPU_COUNT, LocalTask
+from pyjob.progress import Progress, ProgressMonitor
+from pyjob.slurm import SlurmTask
+
+
+class TestProgress(object):
+    def test_1(self):
+        progress = Progress(total=10, done=3, failed=1, running=2, pending=4)
+        progress.started = progress.timestamp - 8
+        assert progress.finished == 4
+        assert progress.percent == 40.0
+        assert progress.throughput == 0.5
+        assert progress.eta == 12.0
+        assert progress.as_dict()["eta"] == 12.0
+
+    def test_2(self):
+        progress = Progress(total=10, pending=10)
+        assert progress.throughput == 0.0
+        assert progress.eta is None
+        assert "ETA unknown" in str(progress)
+
+    def test_3(self):
+        progress = Progress(total=0)
+        assert progress.percent == 100.0
+        assert progress.eta == 0.0
+
+
+class TestProgressMonitor(object):
+    def test_1(self, tmp_path):
+        task = mock.Mock(progress=Progress(total=2, done=1, running=1))
+        stream = io.StringIO()
+        path = str(tmp_path / "progress.json")
+        monitor = ProgressMonitor(task, stream=stream, path=path)
+        monitor()
+        assert "1/2 finished (50.0%)" in stream.getvalue()
+        with open(path) as f:
+            assert json.load(f)["done"] == 1
+
+
+@mock.patch("pyjob.slurm.SlurmTask._check_requirements")
+class TestClusterTaskProgress(object):
+    def test_1(self, check_requirements_mock):
+        scripts = [pytest.helpers.get_py_script(i, 1) for i in range(10)]
+        task = SlurmTask(scripts)
+        assert task.progress.pending == 10
+        task.locked = True
+        info = {"status": "PENDING", "states": {"PENDING": 4, "RUNNING": 3}}
+        with mock.patch.object(SlurmTask, "info", new_callable=mock.PropertyMock) as m:
+            m.return_value = info
+            progress = task.progress
+            assert (progress.pending, progress.running, progress.done) == (4, 3, 3)
+            m.return_value = {}
+            assert task.progress.done == 10
+
+
+@pytest.mark.skipif(pytest.on_windows, reason="Deadlock on Windows")
+class TestLocalTaskProgress(object):
+    def test_1(self):
+        scripts = [pytest.helpers.get_py_script(i, 100) for i in range(4)]
+        with LocalTask(scripts, processes=min(CPU_COUNT, 2)) as task:
+            assert task.progress.pending == 4
+            task.run()
+        progress = task.progress
+        pytest.helpers.unlink(task.script + task.log)
+        assert (progress.done, progress.failed, progress.pending) == (4, 0, 0)
+        assert progress.throughput > 0
@@ -3,7 +3,7 @@ from unittest import mock
 
 import pytest
 from pyjob.exception import PyJobError
-from pyjob.sge import SGEConfigParameter, SunGridEngineTask
+from pyjob.sge import SGEConfigParameter, SunGridEngineTask, parse_qstat_xml
 
 
 class MockSunGridEngineTask(SunGridEngineTask):
@@ -323,3 +323,25 @@ class TestCreateRunscript(object):
         task = MockSunGridEngineTask(
             paths, extra=["-l mem=100", "-r yes"], environment="mpi", queue="medium.q"
         )
+
+
+class TestParseQstatXml(object):
+    def test_1(self):
+        stdout = (
+            "<?xml version='1.0'?><detailed_job_info><djob_info><element>"
+            "<JB_job_number>7</JB_job_number><JB_job_name>pyjob</JB_job_name>"
+            "</element></djob_info></detailed_job_info>"
+        )
+        assert parse_qstat_xml(stdout) == {"job_number": "7", "job_name": "pyjob"}
+
+    def test_2(self):
+        stdout = (
+            "<?xml version='1.0'?><detailed_job_info><djob_info/><unknown_jobs>"
+            "<element><ST_name>7</ST_name></element></unknown_jobs>"
+            "</detailed_job_info>"
+        )
+        assert parse_qstat_xml(stdout) == {}
+
+    def test_3(self):
+        with pytest.raises(ValueError):
+            parse_qstat_xml("error: unknown option -xml")
@@ -0,0 +1,109 @@
+import os
+import time
+
+import pytest
+from pyjob.factory import TaskFactory
+from pyjob.sim import (
+    CANCELLED,
+    COMPLETED,
+    FAILED,
+    PENDING,
+    SimulatedScheduler,
+    SimulatedTask,
+)
+
+
+def get_scripts(n, tmp_path, body="exit 0"):
+    scripts = []
+    for i in range(n):
+        path = str(tmp_path / f"script_{i}.sh")
+        with open(path, "w") as f:
+            f.write(f"#!/bin/sh\n{body}\n")
+        os.chmod(path, 0o755)
+        scripts.append(path)
+    return scripts
+
+
+def wait_until(condition, timeout=30):
+    start = time.monotonic()
+    while not condition():
+        assert time.monotonic() - start < timeout
+        time.sleep(0.01)
+
+
+@pytest.mark.skipif(pytest.on_windows, reason="Unavailable on Windows")
+class TestSimulatedScheduler(object):
+    def test_1(self, tmp_path):
+        scheduler = SimulatedScheduler(workers=4)
+        script = get_scripts(1, tmp_path, body='echo "$PYJOB_SIM_ARRAY_TASK_ID"')[0]
+        log = str(tmp_path / "sim.log")
+        job_id = scheduler.submit(script, nelements=5, directory=str(tmp_path), log=log)
+        wait_until(lambda: scheduler.states(job_id) == {COMPLETED: 5})
+        with open(log) as f:
+            assert sorted(f.read().split()) == ["1", "2", "3", "4", "5"]
+
+    def test_2(self, tmp_path):
+        scheduler = SimulatedScheduler(workers=4)
+        script = get_scripts(1, tmp_path, body="sleep 0.2")[0]
+        job_id = scheduler.submit(script, nelements=4, max_array_size=1)
+        time.sleep(0.1)
+        assert scheduler.states(job_id)["RUNNING"] == 1
+        scheduler.cancel(job_id)
+        wait_until(lambda: scheduler.states(job_id) == {CANCELLED: 4})
+
+    def test_3(self, tmp_path):
+        scheduler = SimulatedScheduler(workers=2)
+        ok, fail = get_scripts(2, tmp_path)
+        with open(fail, "w") as f:
+            f.write("#!/bin/sh\nexit 1\n")
+        first = scheduler.submit(fail, queue_delay=0.2)
+        second = scheduler.submit(ok, dependency=[first])
+        assert scheduler.states(first) == {PENDING: 1}
+        wait_until(lambda: scheduler.states(second) == {CANCELLED: 1})
+        assert scheduler.states(first) == {FAILED: 1}
+        assert scheduler.states(12345) == {}
+
+
+@pytest.mark.skipif(pytest.on_windows, reason="Unavailable on Windows")
+class TestSimulatedTask(object):
+    def test_1(self, tmp_path):
+        scripts = get_scripts(20, tmp_path)
+        scheduler = SimulatedScheduler(workers=4)
+        with TaskFactory(
+            "sim", scripts, directory=str(tmp_path), scheduler=scheduler
+        ) as task:
+            assert isinstance(task, SimulatedTask)
+            task.run()
+            assert "#SIM --array=1-20%20" in str(task.runscript)
+            task.wait(interval=0.05)
+        assert task.progress.done == 20
+        assert all(os.path.isfile(log) for log in task.log)
+
+    def test_2(self, tmp_path):
+        scripts = get_scripts(2, tmp_path)
+        scheduler = SimulatedScheduler(workers=2)
+        first = SimulatedTask(
+            scripts[:1], directory=str(tmp_path), scheduler=scheduler, queue_delay=0.2
+        )
+        first.run()
+        second = SimulatedTask(
+            scripts[1:],
+            directory=str(tmp_path),
+            scheduler=scheduler,
+            dependency=[first.pid],
+        )
+        second.run()
+        assert second.info["status"] == PENDING
+        assert second.progress.pending == 1
+        second.wait(interval=0.05)
+        assert first.info == {}
+        assert os.path.isfile(second.log[0])
+
+    def test_3(self, tmp_path):
+        scripts = get_scripts(4, tmp_path, body="sleep 5")
+        scheduler = SimulatedScheduler(workers=2)
+        task = SimulatedTask(scripts, directory=str(tmp_path), scheduler=scheduler)
+        task.run()
+        task.kill()
+        wait_until(lambda: not task.info)
+        assert task.progress.failed == 4
@@ -1,8 +1,10 @@
+import json
 import os
+import subprocess
 from unittest import mock
 
 import pytest
-from pyjob.slurm import SlurmTask
+from pyjob.slurm import SlurmTask, parse_squeue_json
 
 
 @pytest.mark.skipif(pytest.on_windows, reason="Unavailable on Windows")
@@ -189,3 +191,108 @@ class TestCreateRunscript(object):
             "#SBATCH -o " + paths[0].replace(".py", ".log"),
             paths[0],
         ]
+
+
+class TestParseSqueueJson(object):
+    def test_1(self):
+        stdout = '{"jobs": [{"job_id": 2, "job_state": "RUNNING"}]}'
+        assert parse_squeue_json(stdout) == {
+            "status": "RUNNING",
+            "states": {"RUNNING": 1},
+        }
+
+    def test_2(self):
+        stdout = (
+            '{"jobs": [{"job_id": 2, "job_state": ["COMPLETED"]}, '
+            '{"job_id": 3, "job_state": ["PENDING"]}, '
+            '{"job_id": 4, "job_state": ["PENDING"]}]}'
+        )
+        assert parse_squeue_json(stdout) == {
+            "status": "PENDING",
+            "states": {"COMPLETED": 1, "PENDING": 2},
+        }
+
+    def test_3(self):
+        stdout = '{"jobs": [{"job_id": 2, "job_state": "COMPLETED"}]}'
+        assert parse_squeue_json(stdout) == {}
+        with pytest.raises(ValueError):
+            parse_squeue_json("squeue: unrecognized option '--json'")
+
+
+@mock.patch("pyjob.slurm.SlurmTask._check_requirements")
+@mock.patch("pyjob.slurm.SlurmTask._structured_output", None)
+class TestInfo(object):
+    @mock.patch("pyjob.task.cexec")
+    def test_1(self, cexec_mock, check_requirements_mock):
+        cexec_mock.return_value = '{"jobs": [{"job_id": 1, "job_state": "RUNNING"}]}'
+        task = SlurmTask(None)
+        task.pid = 1
+        assert task.info == {
+            "job_number": 1,
+            "status": "RUNNING",
+            "states": {"RUNNING": 1},
+        }
+        assert SlurmTask._structured_output
+        task.pid = None
+
+    @mock.patch("pyjob.slurm.cexec")
+    @mock.patch("pyjob.task.cexec")
+    def test_2(self, task_cexec_mock, cexec_mock, check_requirements_mock):
+        task_cexec_mock.return_value = "squeue: unrecognized option '--json'"
+        task = SlurmTask(None)
+        task.pid = 1
+        assert task.info == {"job_number": 1, "status": "Running"}
+        assert SlurmTask._structured_output is False
+        assert task.info == {"job_number": 1, "status": "Running"}
+        assert task_cexec_mock.call_count == 1
+        assert cexec_mock.call_count == 2
+        task.pid = None
+
+    @mock.patch("pyjob.task.cexec")
+    def test_3(self, cexec_mock, check_requirements_mock):
+        cexec_mock.return_value = json.dumps(
+            {
+                "jobs": [
+                    {
+                        "job_id": 1,
+                        "job_state": ["PENDING"],
+                        "array_task_id": {"set": False, "number": 0},
+                        "array_task_string": "5-1000:5,1002%10",
+                    },
+                    {
+                        "job_id": 2,
+                        "job_state": ["RUNNING"],
+                        "array_task_id": {"set": True, "number": 4},
+                        "array_task_string": "",
+                    },
+                    {"job_id": 3, "job_state": "RUNNING", "array_task_id": 3},
+                ]
+            }
+        )
+        task = SlurmTask([pytest.helpers.get_py_script(i, 1) for i in range(300)])
+        task.pid = 1
+        task.locked = True
+        assert task.info["states"] == {"PENDING": 201, "RUNNING": 2}
+        assert task._progress_counts() == {
+            "pending": 201,
+            "running": 2,
+            "done": 97,
+            "failed": 0,
+        }
+        task.pid = None
+
+    @mock.patch("pyjob.slurm.cexec")
+    @mock.patch("pyjob.task.cexec")
+    def test_4(self, task_cexec_mock, cexec_mock, check_requirements_mock):
+        task_cexec_mock.side_effect = [
+            '{"jobs": [{"job_id": 1, "job_state": "RUNNING"}]}',
+            "slurm_load_jobs error: Socket timed out",
+        ]
+        task = SlurmTask(None)
+        task.pid = 1
+        assert task.info["status"] == "RUNNING"
+        assert task.info == {"job_number": 1, "status": "Running"}
+        assert SlurmTask._structured_output
+        for call in task_cexec_mock.call_args_list:
+            assert call[1]["stderr"] == subprocess.PIPE
+        task.pid = None
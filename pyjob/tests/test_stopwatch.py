@@ -1,7 +1,9 @@
+import threading
 import time
 import unittest
 
-from pyjob.stopwatch import StopWatch
+from pyjob.cexec import cexec
+from pyjob.stopwatch import PROFILER, Profiler, StopWatch, percentile
 
 
 class TestStopWatch(object):
@@ -175,3 +177,109 @@ class TestStopWatch(object):
             time.sleep(1)
         assert round(sw.time) == 4.0
         assert [round(interval.time) for interval in sw.intervals] == [3.0, 1.0]
+
+    def test_lap_5(self):
+        sw = StopWatch()
+        sw.start()
+        for _ in range(10000):
+            sw.lap
+        sw.stop()
+        interval = sw[0]
+        assert interval.nlaps == 10000
+        assert sum(interval.durations) == interval._offsets[-1]
+        assert interval[-1].index == 10000
+        assert interval[0]._end_time == interval[1]._start_time
+        assert len(interval[10:20]) == 10
+        assert sw.time >= interval[-1]._end_time - interval[0]._start_time
+
+    def test_summary_1(self):
+        sw = StopWatch()
+        sw.start()
+        sw[0]._offsets.extend([1000, 3000, 6000, 10000])
+        summary = sw.summary()
+        assert summary["n"] == 4
+        assert summary["mean"] == 2.5e-6
+        assert summary["min"] == 1e-6
+        assert summary["max"] == 4e-6
+        assert summary["p50"] == 2.5e-6
+        assert abs(summary["stddev"] - 1.118034e-6) < 1e-12
+        assert sw[0].average == 2.5e-6
+
+    def test_summary_2(self):
+        assert StopWatch().summary()["n"] == 0
+
+
+class TestPercentile(object):
+    def test_1(self):
+        assert percentile([1, 2, 3, 4, 5], 50) == 3
+        assert percentile([1, 2, 3, 4, 5], 90) == 4.6
+        assert percentile([1, 2, 3, 4, 5], 100) == 5
+        assert percentile([], 50) == 0.0
+
+
+class TestProfiler(object):
+    def test_1(self):
+        profiler = Profiler(enabled=True)
+
+        @profiler.section("outer")
+        def outer():
+            with profiler.section("inner"):
+                pass
+            with profiler.section("inner"):
+                pass
+
+        outer()
+        outer()
+        stats = profiler.stats()
+        assert stats["outer"][0] == 2
+        assert stats["outer;inner"][0] == 4
+        profile = {entry["name"]: entry for entry in profiler.profile()}
+        assert profile["inner"]["count"] == 4
+        assert profile["outer"]["total"] >= profile["inner"]["total"]
+        assert profile["inner"]["min"] <= profile["inner"]["max"]
+        assert [line.split()[0] for line in profiler.folded().splitlines()] == [
+            "outer",
+            "outer;inner",
+        ]
+
+    def test_2(self):
+        profiler = Profiler()
+        with profiler.section("test"):
+            pass
+        assert profiler.stats() == {}
+
+    def test_3(self):
+        profiler = Profiler(enabled=True)
+        section = profiler.section("thread")
+
+        def work():
+            for _ in range(100):
+                with section:
+                    pass
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert profiler.stats()["thread"][0] == 400
+
+    def test_4(self, tmp_path):
+        profiler = Profiler()
+        profiler.merge({"a": [1, 10, 10, 10], "a;b": [2, 6, 2, 4]})
+        path = str(tmp_path / "profile.json")
+        profiler.save(path)
+        profiler.load(path)
+        assert profiler.stats() == {"a": [2, 20, 10, 10], "a;b": [4, 12, 2, 4]}
+        profiler.reset()
+        assert profiler.stats() == {}
+
+    def test_5(self):
+        PROFILER.reset()
+        PROFILER.enabled = True
+        try:
+            cexec(["python", "-c", "pass"])
+        finally:
+            PROFILER.enabled = False
+        assert PROFILER.stats()["cexec"][0] == 1
+        PROFILER.reset()
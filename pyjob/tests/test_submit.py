@@ -0,0 +1,47 @@
+from unittest import mock
+
+import pytest
+from pyjob.slurm import SlurmTask
+from pyjob.submit import combine, submission_key, submit_many
+
+
+@pytest.mark.skipif(pytest.on_windows, reason="Unavailable on Windows")
+@mock.patch("pyjob.slurm.SlurmTask._check_requirements")
+class TestSubmitMany(object):
+    def test_1(self, check_requirements_mock):
+        task_1 = SlurmTask(None, queue="a")
+        task_2 = SlurmTask(None, queue="a")
+        task_3 = SlurmTask(None, queue="b")
+        assert submission_key(task_1) == submission_key(task_2)
+        assert submission_key(task_1) != submission_key(task_3)
+
+    def test_2(self, check_requirements_mock):
+        scripts = [pytest.helpers.get_py_script(i, 1) for i in range(3)]
+        tasks = [SlurmTask(scripts[:2]), SlurmTask(scripts[2:])]
+        combined = combine(tasks)
+        assert combined.script == [s.path for s in scripts]
+        assert combined.max_array_size == 3
+        assert tasks[0].script == [s.path for s in scripts[:2]]
+
+    @mock.patch("pyjob.slurm.cexec")
+    def test_3(self, cexec_mock, check_requirements_mock):
+        cexec_mock.return_value = "Submitted batch job 42"
+        scripts = [pytest.helpers.get_py_script(i, 1) for i in range(4)]
+        tasks = [SlurmTask(script) for script in scripts[:3]]
+        tasks.append(SlurmTask(scripts[3], queue="other"))
+        submit_many(tasks, max_in_flight=2)
+        assert cexec_mock.call_count == 2
+        assert all(task.locked and task.pid == 42 for task in tasks)
+        runscripts = {task.runscript.path for task in tasks}
+        for task in tasks:
+            task.pid = None
+        pytest.helpers.unlink(
+            [s.path for s in scripts]
+            + list(runscripts)
+            + [p.replace(".script", ".jobs") for p in runscripts]
+        )
+        assert len(runscripts) == 2
+
+    def test_4(self, check_requirements_mock):
+        with pytest.raises(ValueError):
+            submit_many([], max_in_flight=0)
@@ -1,9 +1,10 @@
 import os
+from unittest import mock
 
 import pytest
 from pyjob.exception import PyJobError, PyJobTaskLockedError
 from pyjob.script import ScriptCollector
-from pyjob.task import ClusterTask, Task
+from pyjob.task import ClusterTask, Task, kill_many
 
 
 class MockTask(Task):
@@ -24,6 +25,7 @@ class MockTask(Task):
 class MockClusterTask(ClusterTask, MockTask):
     JOB_ARRAY_INDEX = "$TEST"
     SCRIPT_DIRECTIVE = "#TEST"
+    KILL_COMMAND = ["kill_test"]
 
     def _create_runscript(self):
         pass
@@ -217,3 +219,31 @@ class TestClusterTask(object):
     def test_ensure_exec_available_2(self):
         task = MockClusterTask(None)
         task._ensure_exec_available("ls")
+
+    @mock.patch("pyjob.task.cexec")
+    def test_kill_many_1(self, cexec_mock):
+        tasks = [MockClusterTask(None) for _ in range(5)]
+        for i, task in enumerate(tasks):
+            task.pid = i % 4 or None
+        MockClusterTask.kill_many(tasks, chunk_size=2)
+        assert cexec_mock.call_args_list == [
+            mock.call(["kill_test", "1", "2"], permit_nonzero=True),
+            mock.call(["kill_test", "3"], permit_nonzero=True),
+        ]
+
+    @mock.patch("pyjob.task.cexec")
+    def test_kill_many_2(self, cexec_mock):
+        cluster_tasks = [MockClusterTask(None) for _ in range(3)]
+        for i, task in enumerate(cluster_tasks):
+            task.pid = i
+        local_task = MockTask(None)
+        with mock.patch.object(local_task, "kill") as kill_mock:
+            kill_many(cluster_tasks + [local_task], max_in_flight=2)
+        assert cexec_mock.call_count == 1
+        assert kill_mock.call_count == 1
+        with pytest.raises(ValueError):
+            kill_many(cluster_tasks, max_in_flight=0)
+
+    def test_wait_for_termination_1(self):
+        task = MockClusterTask(None)
+        assert task.wait_for_termination(timeout=0)
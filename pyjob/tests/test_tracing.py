@@ -0,0 +1,74 @@
+import json
+
+import pytest
+from pyjob import tracing
+from pyjob.cexec import cexec
+from pyjob.exception import PyJobExecutionError
+
+
+class TestTracing(object):
+    def test_1(self):
+        traces = []
+        hook = tracing.add_hook(pre=traces.append, post=traces.append)
+        try:
+            stdout = cexec(["python", "-c", "print('hello')"])
+        finally:
+            tracing.remove_hook(hook)
+        assert stdout == "hello"
+        assert len(traces) == 2 and traces[0] is traces[1]
+        trace = traces[0]
+        assert trace.name == "python"
+        assert trace.returncode == 0
+        assert trace.output_size == 5
+        assert trace.duration > 0
+        assert tracing.HOOKS == ()
+
+    def test_2(self):
+        traces = []
+        hook = tracing.add_hook(post=traces.append)
+        try:
+            with pytest.raises(PyJobExecutionError):
+                cexec(["python", "-c", "import sys; sys.exit(3)"])
+        finally:
+            tracing.remove_hook(hook)
+        assert traces[0].returncode == 3
+        assert isinstance(traces[0].error, PyJobExecutionError)
+
+    def test_3(self):
+        def broken(trace):
+            raise RuntimeError
+
+        hook = tracing.add_hook(pre=broken, post=broken)
+        try:
+            assert cexec(["python", "-c", "print(1)"]) == "1"
+        finally:
+            tracing.remove_hook(hook)
+
+
+class TestFileSpanExporter(object):
+    def test_1(self, tmp_path):
+        path = str(tmp_path / "spans.jsonl")
+        hook = tracing.export_spans(path)
+        try:
+            cexec(["python", "-c", "pass"])
+            cexec(["python", "-c", "import sys; sys.exit(1)"], permit_nonzero=True)
+        finally:
+            tracing.remove_hook(hook)
+        with open(path) as f:
+            requests = [json.loads(line) for line in f]
+        assert len(requests) == 2
+        resource_spans = [r["resourceSpans"][0] for r in requests]
+        resource = resource_spans[0]["resource"]
+        assert resource["attributes"] == [
+            {"key": "service.name", "value": {"stringValue": "pyjob"}}
+        ]
+        scope_spans = [rs["scopeSpans"][0] for rs in resource_spans]
+        assert scope_spans[0]["scope"] == {"name": "pyjob"}
+        spans = [span for ss in scope_spans for span in ss["spans"]]
+        assert len(spans) == 2
+        assert spans[0]["traceId"] == spans[1]["traceId"]
+        assert spans[0]["name"] == "python"
+        assert int(spans[0]["endTimeUnixNano"]) >= int(spans[0]["startTimeUnixNano"])
+        attributes = {a["key"]: a["value"] for a in spans[1]["attributes"]}
+        assert attributes["process.exit_code"] == {"intValue": "1"}
+        assert spans[1]["status"]["code"] == 1
@@ -0,0 +1,265 @@
+"""Tracing hooks around commands executed by :func:`~pyjob.cexec.cexec`
+
+Every hook has optional ``pre`` and ``post`` callbacks, which receive a
+:obj:`~pyjob.tracing.CommandTrace` before and after the execution of a command.
+This covers all scheduler interactions, e.g. ``sbatch``, ``squeue`` or ``qstat``.
+
+Examples
+--------
+
+>>> from pyjob import tracing
+>>> hook = tracing.add_hook(post=lambda trace: print(trace.name, trace.duration))
+>>> tracing.remove_hook(hook)
+>>> hook = tracing.export_spans('pyjob.spans.jsonl')
+
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+#: The registered :obj:`~pyjob.tracing.Hook` instances, replaced on every change
+HOOKS = ()
+
+#: The instrumentation scope name of exported spans
+SCOPE_NAME = "pyjob"
+
+_lock = threading.Lock()
+
+
+class CommandTrace(object):
+    """Record of a single command execution"""
+
+    def __init__(self, cmd):
+        """Instantiate a new :obj:`~pyjob.tracing.CommandTrace`
+
+        Parameters
+        ----------
+        cmd : list
+           The command to execute
+
+        """
+        self.cmd = list(cmd)
+        self.start_time_ns = time.time_ns()
+        self._start = time.perf_counter_ns()
+        self.end_time_ns = None
+        self.duration_ns = None
+        self.returncode = None
+        self.output_size = 0
+        self.error = None
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__qualname__}(name={self.name} "
+            f"returncode={self.returncode} duration={self.duration})"
+        )
+
+    @property
+    def name(self):
+        """The command name, or ``script`` for executables given by path"""
+        return "script" if os.path.dirname(self.cmd[0]) else self.cmd[0]
+
+    @property
+    def duration(self):
+        """The duration in seconds, ``None`` while executing"""
+        if self.duration_ns is None:
+            return None
+        return self.duration_ns / 1e9
+
+    def finish(self):
+        """Record the end of the execution"""
+        self.duration_ns = time.perf_counter_ns() - self._start
+        self.end_time_ns = self.start_time_ns + self.duration_ns
+
+
+class Hook(object):
+    """Pair of callbacks invoked around command execution"""
+
+    def __init__(self, pre=None, post=None):
+        """Instantiate a new :obj:`~pyjob.tracing.Hook`
+
+        Parameters
+        ----------
+        pre : callable, optional
+           Invoked with the :obj:`~pyjob.tracing.CommandTrace` before execution
+        post : callable, optional
+           Invoked with the :obj:`~pyjob.tracing.CommandTrace` after execution
+
+        """
+        self.pre = pre
+        self.post = post
+
+
+def add_hook(pre=None, post=None):
+    """Register tracing callbacks
+
+    Parameters
+    ----------
+    pre : callable, optional
+       Invoked with the :obj:`~pyjob.tracing.CommandTrace` before execution
+    post : callable, optional
+       Invoked with the :obj:`~pyjob.tracing.CommandTrace` after execution
+
+    Returns
+    -------
+    :obj:`~pyjob.tracing.Hook`
+       The handle to remove the callbacks with
+
+    """
+    global HOOKS
+    hook = Hook(pre=pre, post=post)
+    with _lock:
+        HOOKS = HOOKS + (hook,)
+    return hook
+
+
+def remove_hook(hook):
+    """Unregister tracing callbacks
+
+    Parameters
+    ----------
+    hook : :obj:`~pyjob.tracing.Hook`
+       The handle returned by :func:`~pyjob.tracing.add_hook`
+
+    """
+    global HOOKS
+    with _lock:
+        HOOKS = tuple(h for h in HOOKS if h is not hook)
+
+
+def _invoke(callbacks, trace):
+    for callback in callbacks:
+        try:
+            callback(trace)
+        except Exception:
+            logger.exception("Tracing callback %s failed", callback)
+
+
+def before(trace):
+    """Invoke all ``pre`` callbacks"""
+    _invoke([hook.pre for hook in HOOKS if hook.pre is not None], trace)
+
+
+def after(trace):
+    """Invoke all ``post`` callbacks"""
+    _invoke([hook.post for hook in HOOKS if hook.post is not None], trace)
+
+
+class FileSpanExporter(object):
+    """Write command traces as OpenTelemetry spans to a local file
+
+    Each line holds one ``ExportTraceServiceRequest`` with a single span in the
+    OTLP JSON encoding, as written by the OpenTelemetry collector file exporter,
+    using the semantic conventions for process attributes. All spans of an
+    exporter share a trace.
+
+    """
+
+    def __init__(self, path, service_name="pyjob"):
+        """Instantiate a new :obj:`~pyjob.tracing.FileSpanExporter`
+
+        Parameters
+        ----------
+        path : str
+           The file to append the spans to
+        service_name : str, optional
+           The name of the traced service
+
+        """
+        self.path = path
+        self.service_name = service_name
+        self.trace_id = os.urandom(16).hex()
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}(path={self.path})"
+
+    def __call__(self, trace):
+        self.export(trace)
+
+    @staticmethod
+    def _attribute(key, value):
+        if isinstance(value, int):
+            return {"key": key, "value": {"intValue": str(value)}}
+        return {"key": key, "value": {"stringValue": str(value)}}
+
+    def span(self, trace):
+        """Convert a :obj:`~pyjob.tracing.CommandTrace` into a span
+
+        Parameters
+        ----------
+        trace : :obj:`~pyjob.tracing.CommandTrace`
+
+        Returns
+        -------
+        dict
+           The span in the OTLP JSON encoding
+
+        """
+        attributes = [
+            self._attribute("process.command", trace.cmd[0]),
+            self._attribute("process.command_line", " ".join(trace.cmd)),
+            self._attribute("pyjob.output.size", trace.output_size),
+        ]
+        if trace.returncode is not None:
+            attributes.append(self._attribute("process.exit_code", trace.returncode))
+        status = (
+            {"code": 2, "message": str(trace.error)} if trace.error else {"code": 1}
+        )
+        return {
+            "traceId": self.trace_id,
+            "spanId": os.urandom(8).hex(),
+            "name": trace.name,
+            "kind": 3,
+            "startTimeUnixNano": str(trace.start_time_ns),
+            "endTimeUnixNano": str(trace.end_time_ns),
+            "attributes": attributes,
+            "status": status,
+        }
+
+    def request(self, spans):
+        """Wrap spans into an ``ExportTraceServiceRequest``
+
+        Parameters
+        ----------
+        spans : list
+           The spans in the OTLP JSON encoding
+
+        Returns
+        -------
+        dict
+           The request in the OTLP JSON encoding
+
+        """
+        resource = {"attributes": [self._attribute("service.name", self.service_name)]}
+        scope_spans = {"scope": {"name": SCOPE_NAME}, "spans": spans}
+        return {"resourceSpans": [{"resource": resource, "scopeSpans": [scope_spans]}]}
+
+    def export(self, trace):
+        """Append a :obj:`~pyjob.tracing.CommandTrace` as span to the file"""
+        line = json.dumps(self.request([self.span(trace)])) + "\n"
+        # A single append per span keeps lines intact across worker processes
+        with open(self.path, "a") as f:
+            f.write(line)
+
+
+def export_spans(path, service_name="pyjob"):
+    """Export all command traces to a local file
+
+    Parameters
+    ----------
+    path : str
+       The file to append the spans to
+    service_name : str, optional
+       The name of the traced service
+
+    Returns
+    -------
+    :obj:`~pyjob.tracing.Hook`
+       The handle to stop the export with :func:`~pyjob.tracing.remove_hook`
+
+    """
+    return add_hook(post=FileSpanExporter(path, service_name=service_name))